@@ -81,6 +81,8 @@ export type Database = {
       }
       stories: {
         Row: {
+          audio_quality: string | null
+          audio_playlist_url: string | null
           audio_status: string | null
           audio_url: string | null
           author_id: string
@@ -100,6 +102,8 @@ export type Database = {
           view_count: number | null
         }
         Insert: {
+          audio_quality?: string | null
+          audio_playlist_url?: string | null
           audio_status?: string | null
           audio_url?: string | null
           author_id: string
@@ -119,6 +123,8 @@ export type Database = {
           view_count?: number | null
         }
         Update: {
+          audio_quality?: string | null
+          audio_playlist_url?: string | null
           audio_status?: string | null
           audio_url?: string | null
           author_id?: string
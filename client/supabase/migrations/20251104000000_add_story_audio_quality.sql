@@ -0,0 +1,4 @@
+-- Record the TTS quality tier (draft/standard/high) the story audio was rendered at
+ALTER TABLE public.stories
+  ADD COLUMN IF NOT EXISTS audio_quality TEXT
+  CHECK (audio_quality IN ('draft', 'standard', 'high'));
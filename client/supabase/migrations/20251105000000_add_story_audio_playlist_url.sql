@@ -0,0 +1,3 @@
+-- HLS playlist of the story audio, playable while the full file is still rendering
+ALTER TABLE public.stories
+  ADD COLUMN IF NOT EXISTS audio_playlist_url TEXT;
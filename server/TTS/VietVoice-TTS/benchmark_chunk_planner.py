@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Compare the bucketed chunk planner with the legacy greedy chunking
+
+For the same text and voice, reports the number of chunks, the distinct chunk
+lengths (shapes), the padding a batched run needs to reach the bucket lengths,
+the longest estimated chunk duration and the planning time of both strategies.
+"""
+import argparse
+import os
+import sys
+import time
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from vietvoicetts import ModelConfig, TTSEngine
+from vietvoicetts.core.chunk_planner import ChunkPlan, bucket_sizes
+
+
+SENTENCES = [
+    "Hôm nay trời đẹp quá, chúng ta cùng nhau đi dạo trong công viên nhé.",
+    "Con mèo nhỏ nằm ngủ say sưa bên cửa sổ đầy nắng.",
+    "Những câu chuyện cổ tích luôn mang lại cho trẻ em nhiều bài học quý giá, từ lòng tốt, sự dũng cảm cho đến tình bạn.",
+    "Buổi chiều, gió thổi nhẹ qua cánh đồng lúa chín vàng.",
+    "Ừ.",
+]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Chunk planner benchmark")
+    parser.add_argument("--text-file", help="UTF-8 text to plan (defaults to generated sentences)")
+    parser.add_argument("--sentences", type=int, default=2000, help="Generated sentences when no file is given")
+    parser.add_argument("--buckets", type=int, default=4, help="Bucket count of the planner")
+    parser.add_argument("--gender", default="female", help="Built-in voice gender")
+    args = parser.parse_args()
+
+    if args.text_file:
+        with open(args.text_file, encoding="utf-8") as f:
+            text = f.read()
+    else:
+        text = " ".join(SENTENCES[i % len(SENTENCES)] for i in range(args.sentences))
+
+    engine = TTSEngine(ModelConfig(chunk_buckets=args.buckets))
+    config = engine.config
+    ref_audio, ref_text = engine.model_session_manager.select_sample(gender=args.gender)
+    prefix = engine._reference_prefix(ref_audio, ref_text)
+    cleaned = engine.text_processor.clean_text(text)
+
+    available = config.max_chunk_duration - prefix.duration - 1.0
+    max_length = int(prefix.speaking_rate * available * config.speed)
+    sizes = bucket_sizes(max_length, max(args.buckets, 1))
+
+    start = time.perf_counter()
+    chunks, lengths = engine._greedy_chunks(cleaned, max_length, prefix.speaking_rate, prefix.duration, available)
+    greedy_seconds = time.perf_counter() - start
+    greedy = ChunkPlan.from_chunks(chunks, lengths, sizes)
+
+    start = time.perf_counter()
+    planned = engine.text_processor.plan_chunks(cleaned, max_length, config.pause_punctuation, args.buckets)
+    planned_seconds = time.perf_counter() - start
+
+    print(f"Text: {len(cleaned)} chars, chunk budget {max_length} (~{available:.1f}s of speech)")
+    for name, plan, seconds in (("greedy", greedy, greedy_seconds), ("planner", planned, planned_seconds)):
+        longest = prefix.duration + max(plan.lengths) / prefix.speaking_rate / config.speed
+        print(f"{name:>8}: {plan.summary()}; longest chunk {longest:.1f}s; planned in {seconds * 1000:.1f} ms")
+
+    engine.cleanup()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Benchmark the single-pass cross-fade concatenation
+
+Compares AudioProcessor.concatenate_with_crossfade_improved against the previous
+implementation, which re-concatenated the whole output for every chunk, on
+synthetic int16 chunks, and checks that both produce identical samples.
+"""
+import argparse
+import os
+import sys
+import time
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from vietvoicetts.core.audio_processor import AudioProcessor
+
+
+def _concatenate_pairwise(generated_waves, cross_fade_duration, sample_rate):
+    """The previous implementation: grow final_wave with np.concatenate per chunk"""
+    flattened_waves = [AudioProcessor.fix_clipped_audio(wave.reshape(-1)) for wave in generated_waves]
+    final_wave = flattened_waves[0]
+    for next_wave in flattened_waves[1:]:
+        cross_fade_samples = min(int(cross_fade_duration * sample_rate), len(final_wave), len(next_wave))
+        if cross_fade_samples <= 0:
+            final_wave = np.concatenate([final_wave, next_wave])
+            continue
+        cross_faded_overlap, next_wave_adjusted = AudioProcessor._crossfade_overlap(
+            final_wave[-cross_fade_samples:], next_wave, cross_fade_samples
+        )
+        final_wave = np.concatenate([
+            final_wave[:-cross_fade_samples], cross_faded_overlap, next_wave_adjusted[cross_fade_samples:]
+        ])
+    return final_wave
+
+
+def _make_chunks(count: int, sample_rate: int, seconds: float, rng: np.random.Generator):
+    chunks = []
+    for _ in range(count):
+        length = int(sample_rate * seconds * rng.uniform(0.5, 1.5))
+        t = np.arange(length) / sample_rate
+        gain = rng.uniform(2000, 20000)
+        wave = gain * np.sin(2 * np.pi * rng.uniform(100, 400) * t) + rng.normal(0, 300, length)
+        chunks.append(np.clip(wave, -32767, 32767).astype(np.int16).reshape(1, 1, -1))
+    return chunks
+
+
+def _best_of(fn, repeats: int) -> float:
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cross-fade concatenation benchmark")
+    parser.add_argument("--chunks", type=int, nargs="+", default=[10, 100, 1000], help="Chunk counts to test")
+    parser.add_argument("--chunk-seconds", type=float, default=4.0, help="Average chunk length")
+    parser.add_argument("--cross-fade", type=float, default=0.1, help="Cross-fade duration in seconds")
+    parser.add_argument("--sample-rate", type=int, default=24000)
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    print(f"{'chunks':>7} {'audio':>9} {'pairwise':>11} {'single-pass':>12} {'speedup':>8}")
+    for count in args.chunks:
+        chunks = _make_chunks(count, args.sample_rate, args.chunk_seconds, rng)
+        expected = _concatenate_pairwise(chunks, args.cross_fade, args.sample_rate)
+        actual = AudioProcessor.concatenate_with_crossfade_improved(chunks, args.cross_fade, args.sample_rate)
+        if not np.array_equal(expected, actual):
+            raise SystemExit(f"Output mismatch at {count} chunks")
+
+        # The pairwise version is quadratic; one run is plenty at large sizes
+        repeats = 1 if count >= 1000 else args.repeats
+        pairwise = _best_of(lambda: _concatenate_pairwise(chunks, args.cross_fade, args.sample_rate), repeats)
+        single = _best_of(
+            lambda: AudioProcessor.concatenate_with_crossfade_improved(chunks, args.cross_fade, args.sample_rate),
+            args.repeats,
+        )
+        minutes = len(actual) / args.sample_rate / 60
+        print(f"{count:>7} {minutes:>7.1f}min {pairwise * 1000:>9.1f}ms {single * 1000:>10.1f}ms {pairwise / single:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Compare sequential and pipelined chunk synthesis
+
+Synthesizes the same multi-chunk text with the stages of each chunk run one
+after another and with preprocess, transformer and decode overlapped across
+chunks, checks that both produce the same audio and prints the wall time and
+the utilisation of every pipeline stage.
+"""
+import argparse
+import os
+import sys
+import time
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from vietvoicetts import ModelConfig, TTSEngine
+
+
+TEXT = " ".join([
+    "Ngày xửa ngày xưa, ở một ngôi làng nhỏ ven sông, có hai anh em sống nương tựa vào nhau.",
+    "Mỗi sáng, người anh ra đồng cày ruộng, còn người em ở nhà chăm sóc mảnh vườn nhỏ.",
+    "Khi mặt trời lặn sau rặng núi xa, cả hai lại cùng nhau ngồi bên bếp lửa kể chuyện.",
+] * 8)
+
+
+def _run(config: ModelConfig, text: str, quality: str):
+    # A fresh engine per mode, so both start from the same session RNG state
+    engine = TTSEngine(config)
+    try:
+        start = time.perf_counter()
+        audio, _ = engine.synthesize(text, gender="female", quality=quality)
+        return audio, time.perf_counter() - start, engine.pipeline_stats
+    finally:
+        engine.cleanup()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pipelined synthesis benchmark")
+    parser.add_argument("--text-file", help="UTF-8 text to synthesize (defaults to a built-in story)")
+    parser.add_argument("--quality", default="draft", help="Quality tier")
+    parser.add_argument("--queue-size", type=int, default=2, help="Chunks that may wait between two stages")
+    parser.add_argument("--session-profile", help="ONNX Runtime tuning profile of both runs")
+    args = parser.parse_args()
+
+    text = TEXT
+    if args.text_file:
+        with open(args.text_file, encoding="utf-8") as f:
+            text = f.read()
+
+    base = dict(session_profile=args.session_profile)
+    sequential, sequential_seconds, _ = _run(ModelConfig(**base), text, args.quality)
+    pipelined, pipelined_seconds, stats = _run(
+        ModelConfig(pipelined=True, pipeline_queue_size=args.queue_size, **base), text, args.quality
+    )
+
+    print(f"Sequential: {sequential_seconds:.2f}s")
+    print(f"Pipelined:  {pipelined_seconds:.2f}s ({sequential_seconds / pipelined_seconds:.2f}x)")
+    print(f"Same audio: {np.array_equal(sequential, pipelined)}")
+    for name, stage in stats.as_dict()["stages"].items():
+        print(f"  {name:>11}: busy {stage['busySeconds']:.2f}s ({stage['utilisation']:.0%}), "
+              f"starved {stage['starvedSeconds']:.2f}s, blocked {stage['blockedSeconds']:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Benchmark the per-chunk saving of the reference prefix cache
+
+Compares preparing chunk inputs with a cold reference cache (reference text
+cleaned, measured and tokenized and reference audio hashed again for every
+chunk) against a warm cache, and reports the preprocess session time per
+chunk for scale.
+"""
+import argparse
+import os
+import sys
+import time
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from vietvoicetts import ModelConfig, TTSEngine
+
+
+SENTENCES = [
+    "Hôm nay trời đẹp quá, chúng ta cùng nhau đi dạo trong công viên nhé.",
+    "Con mèo nhỏ nằm ngủ say sưa bên cửa sổ đầy nắng.",
+    "Những câu chuyện cổ tích luôn mang lại cho trẻ em nhiều bài học quý giá.",
+    "Buổi chiều, gió thổi nhẹ qua cánh đồng lúa chín vàng.",
+]
+
+
+def _time_per_chunk(engine: TTSEngine, ref_audio, ref_text: str, chunks: int, warm: bool) -> float:
+    total = 0.0
+    for i in range(chunks):
+        if not warm:
+            engine.reference_cache.clear()
+            engine.sample_cache.clear()
+        text = SENTENCES[i % len(SENTENCES)]
+        start = time.perf_counter()
+        engine._prepare_inputs(ref_audio, ref_text, text)
+        total += time.perf_counter() - start
+    return total / chunks
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Reference prefix cache benchmark")
+    parser.add_argument("--chunks", type=int, default=50, help="Number of chunks to prepare")
+    parser.add_argument("--gender", default="female", help="Built-in voice gender")
+    args = parser.parse_args()
+
+    engine = TTSEngine(ModelConfig())
+    ref_audio, ref_text = engine.model_session_manager.select_sample(gender=args.gender)
+
+    # Prime decoders and session allocations
+    inputs = engine._prepare_inputs(ref_audio, ref_text, SENTENCES[0])
+    engine._run_preprocess(*inputs[0][:3])
+
+    cold = _time_per_chunk(engine, ref_audio, ref_text, args.chunks, warm=False)
+    warm = _time_per_chunk(engine, ref_audio, ref_text, args.chunks, warm=True)
+
+    start = time.perf_counter()
+    for _ in range(args.chunks):
+        engine._run_preprocess(*inputs[0][:3])
+    preprocess = (time.perf_counter() - start) / args.chunks
+
+    print(f"Chunks:                    {args.chunks}")
+    print(f"Input prep, cold cache:    {cold * 1000:.2f} ms/chunk")
+    print(f"Input prep, warm cache:    {warm * 1000:.2f} ms/chunk")
+    print(f"Saving:                    {(cold - warm) * 1000:.2f} ms/chunk")
+    print(f"Preprocess session run:    {preprocess * 1000:.2f} ms/chunk (unchanged)")
+
+    engine.cleanup()
+
+
+if __name__ == "__main__":
+    main()
@@ -58,6 +58,10 @@ setup(
         "gpu": [
             "onnxruntime-gpu>=1.15.0",
         ],
+        "quantize": [
+            "onnx>=1.14.0",
+            "onnxconverter-common>=1.13.0",
+        ],
     },
     entry_points={
         "console_scripts": [
@@ -0,0 +1,46 @@
+"""
+crossfade_stream must produce exactly what concatenate_with_crossfade_improved does
+"""
+
+import numpy as np
+import pytest
+
+from vietvoicetts.core.audio_processor import AudioProcessor
+
+
+SAMPLE_RATE = 24000
+CROSS_FADE = 0.1
+
+
+def _random_waves(rng, count):
+    waves = []
+    for _ in range(count):
+        length = int(rng.integers(1, SAMPLE_RATE))
+        # Some waves hit full scale, so clipping repair is exercised too
+        peak = 32767 if rng.random() < 0.5 else 20000
+        waves.append(rng.integers(-peak, peak + 1, size=(1, 1, length)).astype(np.int16))
+    return waves
+
+
+def _streamed(waves):
+    segments = list(AudioProcessor.crossfade_stream(iter(waves), CROSS_FADE, SAMPLE_RATE))
+    return np.concatenate(segments) if segments else np.array([])
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_stream_matches_concatenation_for_several_chunks(seed):
+    rng = np.random.default_rng(seed)
+    waves = _random_waves(rng, int(rng.integers(2, 6)))
+
+    expected = AudioProcessor.concatenate_with_crossfade_improved(waves, CROSS_FADE, SAMPLE_RATE)
+
+    np.testing.assert_array_equal(_streamed(waves), expected)
+
+
+@pytest.mark.parametrize("peak", [20000, 32767])
+def test_stream_matches_concatenation_for_a_single_chunk(peak):
+    wave = np.array([0, peak, -peak, 1000], dtype=np.int16).reshape(1, 1, -1)
+
+    expected = AudioProcessor.concatenate_with_crossfade_improved([wave], CROSS_FADE, SAMPLE_RATE)
+
+    np.testing.assert_array_equal(_streamed([wave]), expected)
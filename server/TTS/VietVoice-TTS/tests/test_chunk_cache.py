@@ -0,0 +1,51 @@
+"""
+Tests of the on-disk chunk waveform cache
+"""
+
+import os
+
+import numpy as np
+import pytest
+
+from vietvoicetts.core.chunk_cache import ChunkCache
+
+
+def test_roundtrip(tmp_path):
+    cache = ChunkCache(str(tmp_path), max_bytes=1 << 20)
+    wave = np.arange(100, dtype=np.int16).reshape(1, 1, -1)
+
+    cache.put("ab" * 32, wave)
+
+    np.testing.assert_array_equal(cache.get("ab" * 32), wave)
+    assert cache.get("cd" * 32) is None
+
+
+def test_size_is_tracked_without_rescanning(tmp_path, monkeypatch):
+    wave = np.zeros(1000, dtype=np.int16)
+    cache = ChunkCache(str(tmp_path), max_bytes=2 * (wave.nbytes + 128) + 64)
+    scans = []
+    scan = cache._scan
+    monkeypatch.setattr(cache, "_scan", lambda: scans.append(1) or scan())
+
+    cache.put("aa" * 32, wave)
+    cache.put("bb" * 32, wave)
+    cache.put("aa" * 32, wave)
+    assert len(scans) == 1
+
+    cache.put("cc" * 32, wave)
+    assert len(scans) == 2
+    assert len(list(tmp_path.glob("*/*.npy"))) == 2
+
+
+def test_failed_write_leaves_no_temp_file(tmp_path, monkeypatch):
+    cache = ChunkCache(str(tmp_path), max_bytes=1 << 20)
+
+    def fail_save(*args, **kwargs):
+        raise ValueError("cannot serialize")
+
+    monkeypatch.setattr(np, "save", fail_save)
+    with pytest.raises(ValueError):
+        cache.put("ee" * 32, np.zeros(10, dtype=np.int16))
+
+    assert list(tmp_path.glob("*/*.tmp")) == []
+    assert not os.path.exists(cache._path("ee" * 32))
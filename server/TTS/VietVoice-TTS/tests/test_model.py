@@ -0,0 +1,35 @@
+"""
+Voice selection of ModelSessionManager, without loading any model
+"""
+
+import random
+from unittest import mock
+
+import numpy as np
+
+from vietvoicetts.core.model import ModelSessionManager
+from vietvoicetts.core.model_config import ModelConfig
+
+
+def _manager():
+    with mock.patch.object(ModelConfig, "validate_paths", lambda self: None):
+        manager = ModelSessionManager(ModelConfig())
+    manager.sample_metadata = [
+        {"file_name": f"voice{i}.wav", "text": f"mẫu {i}", "gender": "female", "group": "story",
+         "area": "central", "emotion": "neutral"}
+        for i in range(8)
+    ]
+    manager.get_sample_audio = lambda sample: np.zeros(10, dtype=np.int16)
+    return manager
+
+
+def _picks(manager, rng_factory, count=20):
+    return [manager.select_sample(gender="female", rng=rng_factory())[1] for _ in range(count)]
+
+
+def test_unseeded_requests_vary_between_matching_voices():
+    assert len(set(_picks(_manager(), lambda: None))) > 1
+
+
+def test_seeded_requests_always_pick_the_same_voice():
+    assert len(set(_picks(_manager(), lambda: random.Random(7)))) == 1
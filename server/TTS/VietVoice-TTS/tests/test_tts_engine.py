@@ -0,0 +1,288 @@
+"""
+Behavioural tests of TTSEngine chunk generation, run against small numpy stand-ins for the ONNX sessions
+"""
+
+from types import SimpleNamespace
+from unittest import mock
+
+import numpy as np
+import pytest
+
+from vietvoicetts.core import tts_engine
+from vietvoicetts.core.duration_model import DurationModel, DurationModels
+from vietvoicetts.core.model_config import MAX_NFE_STEP, ModelConfig
+from vietvoicetts.core.tts_engine import TTSEngine
+
+
+HOP_LENGTH = 256
+REFERENCE = (np.sin(np.arange(24000) / 10) * 10000).astype(np.int16).reshape(1, 1, -1)
+VOCAB = " abcdefghijklmnopqrstuvwxyzàáảãạăằắẳẵặâầấẩẫậèéẻẽẹêềếểễệđìíỉĩịòóỏõọôồốổỗộơờớởỡợùúủũụưừứửữựỳỵỷỹý.,!?"
+
+
+def _names(*names):
+    return [SimpleNamespace(name=name) for name in names]
+
+
+class FakePreprocess:
+    """Noise drawn from the chunk's own text, so it does not depend on the order chunks are preprocessed in"""
+
+    def get_inputs(self):
+        return _names("audio", "text_ids", "max_duration")
+
+    def get_outputs(self):
+        return _names("noise", "rope_cos_q", "rope_sin_q", "rope_cos_k", "rope_sin_k",
+                      "cat_mel_text", "cat_mel_text_drop", "ref_signal_len")
+
+    def run(self, output_names, inputs):
+        frames = int(inputs["max_duration"][0])
+        rng = np.random.default_rng(int(inputs["text_ids"].sum()))
+        noise = rng.standard_normal((1, frames, 4)).astype(np.float32)
+        cat_mel_text = rng.standard_normal((1, frames, 4)).astype(np.float32)
+        rope = np.ones((1, frames, 2), dtype=np.float32)
+        ref_signal_len = np.array([inputs["audio"].shape[-1] // HOP_LENGTH + 1], dtype=np.int64)
+        return [noise, rope, rope, rope, rope, cat_mel_text, cat_mel_text * 0.5, ref_signal_len]
+
+
+class FakeTransformer:
+    """One flow step that mixes every frame of a chunk, like attention, and records the batch shapes it sees
+
+    Chunks of a batch stay independent, but padding a chunk with extra frames changes its output.
+    """
+
+    def __init__(self):
+        self.shapes = []
+
+    def get_inputs(self):
+        return _names("noise", "rope_cos_q", "rope_sin_q", "rope_cos_k", "rope_sin_k",
+                      "cat_mel_text", "cat_mel_text_drop", "time_step")
+
+    def get_outputs(self):
+        return _names("denoised", "time_step_out")
+
+    def run(self, output_names, inputs):
+        noise = inputs["noise"]
+        self.shapes.append(noise.shape[:2])
+        step = np.tanh(inputs["cat_mel_text"] - inputs["cat_mel_text_drop"]) * 0.1 + noise.mean(axis=1, keepdims=True) * 0.1
+        return [(noise + step).astype(np.float32), inputs["time_step"] + 1]
+
+
+class FakeDecode:
+    """hop_length samples for every frame after the reference"""
+
+    def get_inputs(self):
+        return _names("noise", "ref_signal_len")
+
+    def get_outputs(self):
+        return _names("wave")
+
+    def run(self, output_names, inputs):
+        noise = inputs["noise"]
+        ref_frames = int(inputs["ref_signal_len"][0])
+        frames = np.clip(noise[0, ref_frames:, 0] * 8000, -32768, 32767).astype(np.int16)
+        return [np.repeat(frames, HOP_LENGTH).reshape(1, 1, -1)]
+
+
+class FakeSessionManager:
+    def __init__(self, config, vocab_path):
+        self.config = config
+        self.vocab_path = vocab_path
+        self.sessions = {"preprocess": FakePreprocess(), "transformer": FakeTransformer(), "decode": FakeDecode()}
+        self.input_names = {name: [i.name for i in s.get_inputs()] for name, s in self.sessions.items()}
+        self.output_names = {name: [o.name for o in s.get_outputs()] for name, s in self.sessions.items()}
+
+    def load_models(self):
+        pass
+
+    def select_sample(self, *args, **kwargs):
+        return REFERENCE, "xin chào các bạn."
+
+    def cleanup(self):
+        pass
+
+
+@pytest.fixture
+def make_engine(tmp_path):
+    vocab_path = tmp_path / "vocab.txt"
+    vocab_path.write_text("\n".join(VOCAB), encoding="utf-8")
+
+    def _make(**overrides):
+        settings = dict(nfe_step=4, use_io_binding=False, duration_model=False, chunk_cache_dir=None)
+        settings.update(overrides)
+        with mock.patch.object(ModelConfig, "validate_paths", lambda self: None):
+            config = ModelConfig(**settings)
+        with mock.patch.object(tts_engine, "ModelSessionManager", lambda config: FakeSessionManager(config, str(vocab_path))):
+            return TTSEngine(config)
+
+    return _make
+
+
+def _chunk_inputs(engine, texts_and_frames):
+    ref_ids = engine.text_processor.text_to_indices([list("xin chào")])[0]
+    inputs_list = []
+    for text, frames in texts_and_frames:
+        chunk_ids = engine.text_processor.text_to_indices([list(text)])[0]
+        text_ids = np.concatenate([ref_ids, chunk_ids])[np.newaxis, :]
+        inputs_list.append((REFERENCE, text_ids, np.array([frames], dtype=np.int64), np.array([0], dtype=np.int32)))
+    return inputs_list
+
+
+MIXED_CHUNKS = [
+    ("một hai ba", 140),
+    ("bốn năm sáu bảy", 160),
+    ("tám chín", 140),
+    ("mười một mười hai", 180),
+    ("mười ba", 140),
+]
+
+
+def test_batched_waves_match_unbatched_for_mixed_lengths(make_engine):
+    engine = make_engine()
+    inputs_list = _chunk_inputs(engine, MIXED_CHUNKS)
+
+    unbatched = engine._generate_waves(inputs_list, batch_size=1)
+    batched = engine._generate_waves(inputs_list, batch_size=4)
+
+    assert len(batched) == len(unbatched)
+    for expected, actual in zip(unbatched, batched):
+        np.testing.assert_array_equal(actual, expected)
+
+
+def test_only_chunks_with_the_same_frame_count_share_a_loop(make_engine):
+    engine = make_engine()
+    transformer = engine.model_session_manager.sessions["transformer"]
+
+    engine._generate_waves(_chunk_inputs(engine, MIXED_CHUNKS), batch_size=4)
+
+    # Three 140-frame chunks in one loop, the 160 and 180-frame chunks on their own
+    assert sorted(set(transformer.shapes)) == [(1, 160), (1, 180), (3, 140)]
+
+
+def test_batch_size_splits_groups(make_engine):
+    engine = make_engine()
+    transformer = engine.model_session_manager.sessions["transformer"]
+
+    engine._generate_waves(_chunk_inputs(engine, MIXED_CHUNKS), batch_size=2)
+
+    assert sorted(set(transformer.shapes)) == [(1, 140), (1, 160), (1, 180), (2, 140)]
+
+
+def test_generate_batch_rejects_mixed_frame_counts(make_engine):
+    engine = make_engine()
+
+    with pytest.raises(ValueError):
+        engine._generate_batch(_chunk_inputs(engine, MIXED_CHUNKS[:2]))
+
+
+def test_pipelined_waves_match_sequential(make_engine):
+    sequential = make_engine()
+    pipelined = make_engine(pipelined=True)
+    inputs_list = _chunk_inputs(sequential, MIXED_CHUNKS)
+
+    expected = sequential._generate_waves(inputs_list)
+    actual = pipelined._generate_waves(inputs_list)
+
+    for wave, other in zip(expected, actual):
+        np.testing.assert_array_equal(other, wave)
+
+
+# Sentences of uneven length, so the planned chunks have different lengths
+LONG_TEXT = " ".join("Con mèo nhỏ" + " nằm ngủ bên cửa sổ" * words + "." for words in [1, 6, 2, 9, 3, 4, 8, 1, 5, 7, 2, 3, 6, 1, 9, 4])
+
+
+def test_batched_planned_chunks_get_the_frame_budget_of_their_bucket(make_engine):
+    engine = make_engine(chunk_buckets=4)
+    prefix = engine._reference_prefix(REFERENCE, "xin chào các bạn.")
+
+    inputs_list = engine._prepare_inputs(REFERENCE, "xin chào các bạn.", LONG_TEXT, batched=True)
+
+    frames = [int(max_duration[0]) - prefix.audio_len for _, _, max_duration, _ in inputs_list]
+    # Chunk lengths differ, but chunks of one bucket share a shape
+    assert len(set(frames)) <= 4
+    assert len(set(frames)) < len(frames)
+
+
+def test_unbatched_planned_chunks_get_the_frame_budget_of_their_own_text(make_engine):
+    engine = make_engine(chunk_buckets=4)
+    config = engine.config
+    prefix = engine._reference_prefix(REFERENCE, "xin chào các bạn.")
+    chars = {index: char for char, index in engine.text_processor.vocab_char_map.items()}
+
+    inputs_list = engine._prepare_inputs(REFERENCE, "xin chào các bạn.", LONG_TEXT)
+
+    for _, text_ids, max_duration, _ in inputs_list:
+        chunk = "".join(chars[int(i)] for i in text_ids[0, len(prefix.text_ids):])
+        length = engine.text_processor.calculate_text_length(chunk, config.pause_punctuation)
+        seconds = max(length / prefix.speaking_rate / config.speed, config.min_target_duration)
+        assert int(max_duration[0]) - prefix.audio_len == int(seconds * config.sample_rate) // config.hop_length + 1
+
+
+def test_synthesize_batch_matches_texts_synthesized_alone(make_engine):
+    texts = ["xin chào", "chúc ngủ ngon", "hẹn gặp lại nhé", "xin chào bạn", LONG_TEXT]
+    batched = make_engine(batch_frame_step=16).synthesize_batch(texts)
+    engine = make_engine(batch_frame_step=16)
+    alone = [engine.synthesize_batch([text])[0] for text in texts]
+
+    for wave, other in zip(alone, batched):
+        np.testing.assert_array_equal(wave, other)
+
+
+def test_synthesize_batch_rounds_frame_budgets_to_shared_shapes(make_engine):
+    engine = make_engine(batch_frame_step=16)
+    transformer = engine.model_session_manager.sessions["transformer"]
+
+    engine.synthesize_batch(["xin chào", "chúc ngủ ngon", "hẹn gặp lại nhé", "xin chào bạn"])
+
+    ref_frames = REFERENCE.shape[-1] // HOP_LENGTH + 1
+    assert all((frames - ref_frames) % 16 == 0 for _, frames in transformer.shapes)
+    assert max(batch for batch, _ in transformer.shapes) > 1
+
+
+class FailingBindingTransformer(FakeTransformer):
+    """A transformer whose bound run fails, like an ORT error on one input shape"""
+
+    def get_providers(self):
+        return ["CPUExecutionProvider"]
+
+    def io_binding(self):
+        raise RuntimeError("bound run failed")
+
+
+def test_io_binding_failure_falls_back_for_that_call_only(make_engine):
+    engine = make_engine(use_io_binding=True)
+    engine.model_session_manager.sessions["transformer"] = FailingBindingTransformer()
+    inputs_list = _chunk_inputs(engine, MIXED_CHUNKS[:1])
+
+    wave = engine._generate_waves(inputs_list)[0]
+
+    np.testing.assert_array_equal(wave, make_engine()._generate_waves(inputs_list)[0])
+    assert engine.use_io_binding
+
+
+def test_io_binding_is_disabled_when_the_session_cannot_bind(make_engine):
+    engine = make_engine(use_io_binding=True)
+
+    engine._generate_waves(_chunk_inputs(engine, MIXED_CHUNKS[:1]))
+
+    assert not engine.use_io_binding
+
+
+def test_only_voices_with_a_duration_model_are_trimmed(make_engine):
+    engine = make_engine()
+    prefix = engine._reference_prefix(REFERENCE, "xin chào các bạn.")
+    model = DurationModel(slope=0.05, intercept=0.2, margin=0.1, points=10)
+    wave = np.concatenate([np.full(24000, 8000, dtype=np.int16), np.zeros(48000, dtype=np.int16)]).reshape(1, 1, -1)
+
+    engine.duration_models = DurationModels({"another voice": model})
+    assert engine._trim_wave(wave, prefix.audio).shape == wave.shape
+
+    engine.duration_models = DurationModels({prefix.digest: model})
+    assert engine._trim_wave(wave, prefix.audio).shape[-1] < wave.shape[-1]
+
+
+def test_requested_nfe_steps_are_bounded(make_engine):
+    config = make_engine().config
+
+    assert config.resolve_nfe_step(nfe_step=MAX_NFE_STEP) == MAX_NFE_STEP
+    for nfe_step in (1, MAX_NFE_STEP + 1):
+        with pytest.raises(ValueError):
+            config.resolve_nfe_step(nfe_step=nfe_step)
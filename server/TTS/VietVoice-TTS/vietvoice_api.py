@@ -3,13 +3,31 @@ VietVoice TTS API wrapper for integration with TTS service
 """
 import sys
 import os
-from typing import Optional
+from typing import Generator, List, Optional, Tuple
 
 current_dir = os.path.dirname(os.path.abspath(__file__))
 if current_dir not in sys.path:
     sys.path.insert(0, current_dir)
 
-from vietvoicetts import synthesize as vietvoice_synthesize
+from vietvoicetts import ModelConfig, TTSApi
+
+
+def create_vietvoice_api(config: Optional[ModelConfig] = None) -> TTSApi:
+    """
+    Create a TTSApi and load its engine eagerly
+
+    The returned instance owns the ONNX sessions and is meant to be kept
+    alive and reused across requests.
+
+    Args:
+        config: ModelConfig instance (optional, uses default if not provided)
+
+    Returns:
+        TTSApi with a loaded engine
+    """
+    api = TTSApi(config)
+    _ = api.engine
+    return api
 
 
 def synthesize_vietvoice(
@@ -17,7 +35,9 @@ def synthesize_vietvoice(
     output_path: str,
     gender: str = "female",
     area: str = "central",
-    emotion: str = "neutral"
+    emotion: str = "neutral",
+    api: Optional[TTSApi] = None,
+    quality: Optional[str] = None
 ) -> float:
     """
     Synthesize speech using VietVoice TTS
@@ -28,6 +48,8 @@ def synthesize_vietvoice(
         gender: Voice gender ("male" or "female")
         area: Voice area ("northern", "central", or "southern")
         emotion: Voice emotion ("neutral", "happy", "sad", "angry", "surprised")
+        api: Resident TTSApi to reuse (optional, a throwaway one is built if not provided)
+        quality: Quality tier ("draft", "standard" or "high"), defaults to config.nfe_step
     
     Returns:
         Duration of generated audio in seconds
@@ -35,14 +57,121 @@ def synthesize_vietvoice(
     Raises:
         Exception: If synthesis fails
     """
-    duration = vietvoice_synthesize(
+    # A throwaway engine built here releases its sessions once the file is written
+    owns_api = api is None
+    if owns_api:
+        api = TTSApi()
+    try:
+        return api.synthesize_to_file(
+            text=text,
+            output_path=output_path,
+            gender=gender,
+            area=area,
+            emotion=emotion,
+            quality=quality
+        )
+    finally:
+        if owns_api:
+            api.cleanup()
+
+
+def synthesize_vietvoice_pcm(
+    text: str,
+    api: TTSApi,
+    gender: str = "female",
+    area: str = "central",
+    emotion: str = "neutral",
+    quality: Optional[str] = None
+) -> Tuple[bytes, int]:
+    """
+    Synthesize speech with a resident VietVoice engine, without touching disk
+    
+    Args:
+        text: Text to synthesize
+        api: Resident TTSApi (see create_vietvoice_api)
+        gender: Voice gender ("male" or "female")
+        area: Voice area ("northern", "central", or "southern")
+        emotion: Voice emotion ("neutral", "happy", "sad", "angry", "surprised")
+        quality: Quality tier ("draft", "standard" or "high"), defaults to config.nfe_step
+    
+    Returns:
+        Raw little-endian 16-bit mono PCM and its sample rate
+    """
+    audio, _ = api.synthesize(
         text=text,
         gender=gender,
         area=area,
         emotion=emotion,
-        output_path=output_path
+        quality=quality
     )
-    return duration
+    return audio.reshape(-1).astype("<i2", copy=False).tobytes(), api.config.sample_rate
+
+
+def synthesize_vietvoice_pcm_batch(
+    texts: List[str],
+    api: TTSApi,
+    gender: str = "female",
+    area: str = "central",
+    emotion: str = "neutral",
+    quality: Optional[str] = None,
+    max_batch_size: Optional[int] = None
+) -> Tuple[List[bytes], int]:
+    """
+    Synthesize several texts with a resident VietVoice engine in shared transformer batches
+    
+    Args:
+        texts: Texts to synthesize
+        api: Resident TTSApi (see create_vietvoice_api)
+        gender: Voice gender ("male" or "female")
+        area: Voice area ("northern", "central", or "southern")
+        emotion: Voice emotion ("neutral", "happy", "sad", "angry", "surprised")
+        quality: Quality tier ("draft", "standard" or "high"), defaults to config.nfe_step
+        max_batch_size: Chunks per transformer loop, defaults to all chunks at once
+    
+    Returns:
+        Raw little-endian 16-bit mono PCM of each text, in order, and the sample rate
+    """
+    waves = api.synthesize_batch(
+        texts=texts,
+        gender=gender,
+        area=area,
+        emotion=emotion,
+        quality=quality,
+        max_batch_size=max_batch_size
+    )
+    return [wave.reshape(-1).astype("<i2", copy=False).tobytes() for wave in waves], api.config.sample_rate
+
+
+def stream_vietvoice(
+    text: str,
+    api: TTSApi,
+    gender: str = "female",
+    area: str = "central",
+    emotion: str = "neutral",
+    quality: Optional[str] = None
+) -> Generator[bytes, None, None]:
+    """
+    Stream speech synthesized with a resident VietVoice engine
+    
+    Args:
+        text: Text to synthesize
+        api: Resident TTSApi (see create_vietvoice_api)
+        gender: Voice gender ("male" or "female")
+        area: Voice area ("northern", "central", or "southern")
+        emotion: Voice emotion ("neutral", "happy", "sad", "angry", "surprised")
+        quality: Quality tier ("draft", "standard" or "high"), defaults to config.nfe_step
+    
+    Yields:
+        Raw little-endian 16-bit mono PCM at api.config.sample_rate
+    """
+    for segment in api.synthesize_stream(
+        text=text,
+        gender=gender,
+        area=area,
+        emotion=emotion,
+        quality=quality
+    ):
+        yield segment.astype("<i2", copy=False).tobytes()
 
 
 if __name__ == "__main__":
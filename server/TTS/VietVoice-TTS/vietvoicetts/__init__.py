@@ -2,7 +2,7 @@
 VietVoice TTS - Vietnamese Text-to-Speech Library
 """
 
-from .core.model_config import ModelConfig, TTSConfig, MODEL_GENDER, MODEL_GROUP, MODEL_AREA, MODEL_EMOTION
+from .core.model_config import ModelConfig, TTSConfig, MODEL_GENDER, MODEL_GROUP, MODEL_AREA, MODEL_EMOTION, QUALITY_TIERS
 from .core.tts_engine import TTSEngine
 from .api import TTSApi, synthesize, synthesize_to_bytes
 
@@ -19,4 +19,5 @@ __all__ = [
     "MODEL_GROUP",
     "MODEL_AREA",
     "MODEL_EMOTION",
+    "QUALITY_TIERS",
 ] 
\ No newline at end of file
@@ -2,13 +2,11 @@
 High-level API for VietVoice TTS
 """
 
-import tempfile
 import os
-from pathlib import Path
-from typing import Optional, Tuple, Union
+from typing import Generator, List, Optional, Tuple, Union
 import numpy as np
 
-from .core import ModelConfig, TTSEngine
+from .core import AudioProcessor, ModelConfig, TTSEngine
 from .core.model_config import MODEL_GENDER, MODEL_GROUP, MODEL_AREA, MODEL_EMOTION
 
 
@@ -45,7 +43,9 @@ class TTSApi:
                    emotion: Optional[str] = None,
                    output_path: Optional[str] = None,
                    reference_audio: Optional[str] = None,
-                   reference_text: Optional[str] = None) -> Tuple[np.ndarray, float]:
+                   reference_text: Optional[str] = None,
+                   quality: Optional[str] = None,
+                   seed: Optional[int] = None) -> Tuple[np.ndarray, float]:
         """
         Synthesize speech from text
         
@@ -53,6 +53,8 @@ class TTSApi:
             text: Text to synthesize
             reference_audio: Path to reference audio file (optional)
             reference_text: Reference text matching the reference audio (optional)
+            quality: Quality tier - draft/standard/high (optional, uses config.nfe_step if not provided)
+            seed: Seed of the random generator that picks among matching voices, fixing the voice (optional, varies between calls if not provided)
             output_path: Path to save the generated audio (optional)
             
         Returns:
@@ -66,7 +68,80 @@ class TTSApi:
             emotion=emotion,
             output_path=output_path,
             reference_audio=reference_audio,
-            reference_text=reference_text
+            reference_text=reference_text,
+            quality=quality,
+            seed=seed
+        )
+    
+    def synthesize_stream(self, text: str,
+                          gender: Optional[str] = None,
+                          group: Optional[str] = None,
+                          area: Optional[str] = None,
+                          emotion: Optional[str] = None,
+                          reference_audio: Optional[str] = None,
+                          reference_text: Optional[str] = None,
+                          quality: Optional[str] = None,
+                          seed: Optional[int] = None) -> Generator[np.ndarray, None, None]:
+        """
+        Synthesize speech and yield audio as each chunk finishes
+        
+        Args:
+            text: Text to synthesize
+            reference_audio: Path to reference audio file (optional)
+            reference_text: Reference text matching the reference audio (optional)
+            quality: Quality tier - draft/standard/high (optional, uses config.nfe_step if not provided)
+            seed: Seed of the random generator that picks among matching voices, fixing the voice (optional, varies between calls if not provided)
+            
+        Yields:
+            int16 PCM segments at config.sample_rate
+        """
+        return self.engine.synthesize_stream(
+            text=text,
+            gender=gender,
+            group=group,
+            area=area,
+            emotion=emotion,
+            reference_audio=reference_audio,
+            reference_text=reference_text,
+            quality=quality,
+            seed=seed
+        )
+    
+    def synthesize_batch(self, texts: List[str],
+                         gender: Optional[str] = None,
+                         group: Optional[str] = None,
+                         area: Optional[str] = None,
+                         emotion: Optional[str] = None,
+                         reference_audio: Optional[str] = None,
+                         reference_text: Optional[str] = None,
+                         quality: Optional[str] = None,
+                         seed: Optional[int] = None,
+                         max_batch_size: Optional[int] = None) -> List[np.ndarray]:
+        """
+        Synthesize several texts with one voice in shared transformer batches
+        
+        Args:
+            texts: Texts to synthesize
+            reference_audio: Path to reference audio file (optional)
+            reference_text: Reference text matching the reference audio (optional)
+            quality: Quality tier - draft/standard/high (optional, uses config.nfe_step if not provided)
+            seed: Seed of the random generator that picks among matching voices, fixing the voice (optional, varies between calls if not provided)
+            max_batch_size: Chunks per transformer loop (optional, defaults to all chunks at once)
+            
+        Returns:
+            One int16 audio array per text, in order
+        """
+        return self.engine.synthesize_batch(
+            texts=texts,
+            gender=gender,
+            group=group,
+            area=area,
+            emotion=emotion,
+            reference_audio=reference_audio,
+            reference_text=reference_text,
+            quality=quality,
+            seed=seed,
+            max_batch_size=max_batch_size
         )
     
     def synthesize_to_file(self, text: str, output_path: str,
@@ -75,7 +150,9 @@ class TTSApi:
                            area: Optional[str] = None,
                            emotion: Optional[str] = None,
                            reference_audio: Optional[str] = None,
-                           reference_text: Optional[str] = None) -> float:
+                           reference_text: Optional[str] = None,
+                           quality: Optional[str] = None,
+                           seed: Optional[int] = None) -> float:
         """
         Synthesize speech and save to file
         
@@ -84,6 +161,8 @@ class TTSApi:
             output_path: Path to save the generated audio
             reference_audio: Path to reference audio file (optional)
             reference_text: Reference text matching the reference audio (optional)
+            quality: Quality tier - draft/standard/high (optional, uses config.nfe_step if not provided)
+            seed: Seed of the random generator that picks among matching voices, fixing the voice (optional, varies between calls if not provided)
             
         Returns:
             Generation time in seconds
@@ -96,7 +175,9 @@ class TTSApi:
             emotion=emotion,
             output_path=output_path,
             reference_audio=reference_audio,
-            reference_text=reference_text
+            reference_text=reference_text,
+            quality=quality,
+            seed=seed
         )
         return generation_time
     
@@ -106,7 +187,9 @@ class TTSApi:
                            area: Optional[str] = None,
                            emotion: Optional[str] = None,
                            reference_audio: Optional[str] = None,
-                           reference_text: Optional[str] = None) -> Tuple[bytes, float]:
+                           reference_text: Optional[str] = None,
+                           quality: Optional[str] = None,
+                           seed: Optional[int] = None) -> Tuple[bytes, float]:
         """
         Synthesize speech and return as bytes
         
@@ -114,32 +197,24 @@ class TTSApi:
             text: Text to synthesize
             reference_audio: Path to reference audio file (optional)
             reference_text: Reference text matching the reference audio (optional)
+            quality: Quality tier - draft/standard/high (optional, uses config.nfe_step if not provided)
+            seed: Seed of the random generator that picks among matching voices, fixing the voice (optional, varies between calls if not provided)
             
         Returns:
             Tuple of (wav_bytes, generation_time_seconds)
         """
-        with tempfile.NamedTemporaryFile(suffix='.wav', delete=False) as tmp_file:
-            tmp_path = tmp_file.name
-        
-        try:
-            generation_time = self.synthesize_to_file(
-                text=text,
-                output_path=tmp_path,
-                gender=gender,
-                group=group,
-                area=area,
-                emotion=emotion,
-                reference_audio=reference_audio,
-                reference_text=reference_text
-            )
-            
-            with open(tmp_path, 'rb') as f:
-                wav_bytes = f.read()
-            
-            return wav_bytes, generation_time
-            
-        finally:
-            Path(tmp_path).unlink(missing_ok=True)
+        audio, generation_time = self.synthesize(
+            text=text,
+            gender=gender,
+            group=group,
+            area=area,
+            emotion=emotion,
+            reference_audio=reference_audio,
+            reference_text=reference_text,
+            quality=quality,
+            seed=seed
+        )
+        return AudioProcessor.encode_wav(audio, self.config.sample_rate), generation_time
     
     def validate_configuration(self, reference_audio: Optional[str] = None) -> bool:
         """
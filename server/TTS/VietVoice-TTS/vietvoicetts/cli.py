@@ -8,12 +8,17 @@ from pathlib import Path
 from typing import Optional
 
 from .core import ModelConfig
-from .core.model_config import MODEL_GENDER, MODEL_GROUP, MODEL_AREA, MODEL_EMOTION
+from .core.model_config import MODEL_GENDER, MODEL_GROUP, MODEL_AREA, MODEL_EMOTION, PRECISIONS, QUALITY_TIERS, SESSION_PROFILES
 from .api import TTSApi
 
 
 def main():
     """Main CLI entry point"""
+    if len(sys.argv) > 1 and sys.argv[1] == "convert":
+        return convert_main(sys.argv[2:])
+    if len(sys.argv) > 1 and sys.argv[1] == "calibrate":
+        return calibrate_main(sys.argv[2:])
+    
     parser = argparse.ArgumentParser(
         description="VietVoice TTS - Vietnamese Text-to-Speech",
         formatter_class=argparse.RawDescriptionHelpFormatter
@@ -36,12 +41,18 @@ def main():
     # Speed and random seed
     parser.add_argument("--speed", type=float, default=1.0, help="Speech speed multiplier")
     parser.add_argument("--random-seed", type=int, default=9527, help="Random seed. This is important for keeping the same voice when synthesizing.")
+    parser.add_argument("--quality", choices=list(QUALITY_TIERS),
+                       help="Quality tier (draft/standard/high), overrides --nfe-step")
 
     # Model settings. These are not recommended to change.
     parser.add_argument("--model-url", help="URL to download model from")
     parser.add_argument("--model-cache-dir", help="Directory to cache model files")
     parser.add_argument("--nfe-step", type=int, default=32, help="Number of NFE steps")
     parser.add_argument("--fuse-nfe", type=int, default=1, help="Fuse NFE steps")
+    parser.add_argument("--precision", choices=PRECISIONS, default="fp32",
+                       help="Model precision (int8/fp16 must be created first with 'convert')")
+    parser.add_argument("--preload-samples", action="store_true",
+                       help="Decode all built-in reference samples when the model is loaded")
     
     # Audio processing
     parser.add_argument("--cross-fade-duration", type=float, default=0.1, 
@@ -50,6 +61,16 @@ def main():
                        help="Maximum chunk duration in seconds")
     parser.add_argument("--min-target-duration", type=float, default=1.0,
                        help="Minimum target duration in seconds")
+    parser.add_argument("--chunk-buckets", type=int, default=0,
+                       help="Fixed chunk lengths long texts are planned into (0 = legacy greedy chunking)")
+    parser.add_argument("--max-batch-size", type=int, default=1,
+                       help="Number of chunks to run through the transformer in one batch")
+    parser.add_argument("--parallel-sessions", type=int, default=1,
+                       help="Number of session sets synthesizing chunks in parallel (deterministic per random seed)")
+    parser.add_argument("--pipelined", action="store_true",
+                       help="Overlap preprocess, transformer and decode of consecutive chunks")
+    parser.add_argument("--duration-model", action="store_true",
+                       help="Size chunks of calibrated voices with their duration models (see the calibrate command)")
     
     # ONNX Runtime settings
     parser.add_argument("--inter-op-threads", type=int, default=0,
@@ -58,6 +79,10 @@ def main():
                        help="Number of intra-op threads")
     parser.add_argument("--log-severity", type=int, default=4,
                        help="Log severity level")
+    parser.add_argument("--session-profile", choices=list(SESSION_PROFILES),
+                       help="ONNX Runtime tuning profile (threads, spinning, memory arena)")
+    parser.add_argument("--io-binding", action="store_true",
+                       help="Keep transformer loop tensors in preallocated OrtValues")
     
     args = parser.parse_args()
     
@@ -83,7 +108,8 @@ def main():
             area=args.area,
             emotion=args.emotion,
             reference_audio=args.reference_audio,
-            reference_text=args.reference_text
+            reference_text=args.reference_text,
+            quality=args.quality
         )
         
         print(f"✅ Synthesis complete! Duration: {duration:.2f}s")
@@ -101,15 +127,112 @@ def create_config(args) -> ModelConfig:
         model_cache_dir=args.model_cache_dir or "~/.cache/vietvoicetts",
         nfe_step=args.nfe_step,
         fuse_nfe=args.fuse_nfe,
+        precision=args.precision,
+        preload_samples=args.preload_samples,
         speed=args.speed,
         random_seed=args.random_seed,
         cross_fade_duration=args.cross_fade_duration,
         max_chunk_duration=args.max_chunk_duration,
         min_target_duration=args.min_target_duration,
+        chunk_buckets=args.chunk_buckets,
+        max_batch_size=args.max_batch_size,
+        parallel_sessions=args.parallel_sessions,
+        pipelined=args.pipelined,
+        duration_model=args.duration_model,
         inter_op_num_threads=args.inter_op_threads,
         intra_op_num_threads=args.intra_op_threads,
-        log_severity_level=args.log_severity
+        log_severity_level=args.log_severity,
+        session_profile=args.session_profile,
+        use_io_binding=args.io_binding
+    )
+
+
+def convert_main(argv: Optional[list] = None):
+    """Create reduced-precision model variants: vietvoice-tts convert --precision int8"""
+    from .core.quantization import check_variant_quality, convert_model_variants
+    
+    parser = argparse.ArgumentParser(
+        prog="vietvoice-tts convert",
+        description="Convert the VietVoice ONNX models to INT8/FP16 variants in the model cache"
+    )
+    parser.add_argument("--precision", choices=PRECISIONS[1:], default="int8", help="Target precision")
+    parser.add_argument("--model-url", help="URL to download model from")
+    parser.add_argument("--model-cache-dir", help="Directory to cache model files")
+    parser.add_argument("--force", action="store_true", help="Convert again even if the variant exists")
+    parser.add_argument("--check", action="store_true",
+                       help="Compare the variant against FP32 output after converting")
+    parser.add_argument("--max-mel-error", type=float, default=0.1,
+                       help="Largest relative mel error accepted by --check")
+    parser.add_argument("--min-snr-db", type=float, default=None,
+                       help="Smallest waveform SNR in dB accepted by --check (not enforced by default)")
+    args = parser.parse_args(argv)
+    
+    config = ModelConfig(
+        model_url=args.model_url or "https://huggingface.co/nguyenvulebinh/VietVoice-TTS/resolve/main/model-bin.pt",
+        model_cache_dir=args.model_cache_dir or "~/.cache/vietvoicetts",
+    )
+    
+    try:
+        paths = convert_model_variants(config, args.precision, force=args.force)
+        print(f"✅ {args.precision} models written to: {Path(paths['transformer']).parent}")
+        
+        if args.check:
+            report = check_variant_quality(config, args.precision)
+            print(f"Mel relative error:   {report['mel_error']:.4f}")
+            print(f"Waveform SNR:         {report['waveform_snr_db']:.1f} dB")
+            print(f"Transformer speedup:  {report['speedup']:.2f}x")
+            failed = report['mel_error'] > args.max_mel_error
+            if args.min_snr_db is not None and report['waveform_snr_db'] < args.min_snr_db:
+                failed = True
+            if failed:
+                print(f"❌ {args.precision} variant is outside the quality limits", file=sys.stderr)
+                sys.exit(2)
+            print(f"✅ {args.precision} variant is within the quality limits")
+    except Exception as e:
+        print(f"❌ Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+
+def calibrate_main(argv: Optional[list] = None):
+    """Fit per-voice duration models: vietvoice-tts calibrate"""
+    from .core.duration_model import DurationModels, calibrate_durations
+    
+    parser = argparse.ArgumentParser(
+        prog="vietvoice-tts calibrate",
+        description="Measure how long each built-in voice takes to speak a text and store a duration model per voice"
     )
+    parser.add_argument("--model-url", help="URL to download model from")
+    parser.add_argument("--model-cache-dir", help="Directory to cache model files")
+    parser.add_argument("--precision", choices=PRECISIONS, default="fp32", help="Model precision to calibrate with")
+    parser.add_argument("--quality", choices=list(QUALITY_TIERS), default="high",
+                       help="Quality tier the calibration chunks are rendered at")
+    parser.add_argument("--sentences-file", help="UTF-8 file with one calibration sentence per line")
+    args = parser.parse_args(argv)
+    
+    config = ModelConfig(
+        model_url=args.model_url or "https://huggingface.co/nguyenvulebinh/VietVoice-TTS/resolve/main/model-bin.pt",
+        model_cache_dir=args.model_cache_dir or "~/.cache/vietvoicetts",
+        precision=args.precision,
+        nfe_step=QUALITY_TIERS[args.quality],
+    )
+    sentences = None
+    if args.sentences_file:
+        with open(args.sentences_file, encoding="utf-8") as f:
+            sentences = [line.strip() for line in f if line.strip()]
+    
+    try:
+        voices = calibrate_durations(config, sentences)
+        for file_name, voice in voices.items():
+            model = voice["model"]
+            saving = 1 - voice["predicted_seconds"] / voice["allocated_seconds"] if voice["allocated_seconds"] else 0.0
+            print(f"{file_name}: {model['slope'] * 1000:.1f} ms/unit + {model['intercept']:.2f}s "
+                  f"(margin {model['margin']:.2f}s, {model['points']} points), "
+                  f"spoken {voice['spoken_seconds']:.1f}s of {voice['allocated_seconds']:.1f}s allocated, "
+                  f"frames saved {saving:.1%}")
+        print(f"✅ Duration models for {len(voices)} voices written to: {DurationModels.path(config)}")
+    except Exception as e:
+        print(f"❌ Error: {e}", file=sys.stderr)
+        sys.exit(1)
 
 
 if __name__ == "__main__":
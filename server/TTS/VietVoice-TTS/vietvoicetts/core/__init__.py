@@ -7,6 +7,7 @@ from .model import ModelSessionManager
 from .tts_engine import TTSEngine
 from .text_processor import TextProcessor
 from .audio_processor import AudioProcessor
+from .chunk_cache import ChunkCache
 
 __all__ = [
     "ModelConfig",
@@ -15,6 +16,7 @@ __all__ = [
     "TTSEngine",
     "TextProcessor",
     "AudioProcessor",
+    "ChunkCache",
     "MODEL_GENDER",
     "MODEL_GROUP",
     "MODEL_AREA",
@@ -2,13 +2,26 @@
 Audio processing utilities for TTS inference
 """
 
+import itertools
 import numpy as np
 import soundfile as sf
+from functools import lru_cache
 from pathlib import Path
 from pydub import AudioSegment
-from typing import List
+from typing import Generator, Iterable, List, Optional, Tuple
 import io
 
+
+@lru_cache(maxsize=64)
+def _fade_curves(samples: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Cosine-squared fade-out and sine-squared fade-in of a given length (shared, read-only)"""
+    fade_out = np.cos(np.linspace(0, np.pi/2, samples)) ** 2
+    fade_in = np.sin(np.linspace(0, np.pi/2, samples)) ** 2
+    fade_out.flags.writeable = False
+    fade_in.flags.writeable = False
+    return fade_out, fade_in
+
+
 class AudioProcessor:
     """Handles audio processing operations"""
     
@@ -53,6 +66,22 @@ class AudioProcessor:
             return (audio * scale_factor).astype(np.int16)
         return audio
     
+    # int16 level below which trailing samples count as silence (about -36 dBFS)
+    SILENCE_THRESHOLD = 500
+    
+    @staticmethod
+    def speech_end(audio: np.ndarray, threshold: int = SILENCE_THRESHOLD) -> int:
+        """Number of samples up to and including the last one louder than threshold"""
+        loud = np.flatnonzero(np.abs(audio.reshape(-1).astype(np.int32)) > threshold)
+        return int(loud[-1]) + 1 if len(loud) else 0
+    
+    @staticmethod
+    def trim_trailing_silence(audio: np.ndarray, keep_samples: int,
+                              threshold: int = SILENCE_THRESHOLD) -> np.ndarray:
+        """Drop trailing silence, keeping keep_samples after the speech for fades and pauses"""
+        end = min(AudioProcessor.speech_end(audio, threshold) + keep_samples, audio.shape[-1])
+        return audio[..., :max(end, 1)]
+    
     @staticmethod
     def save_audio(audio: np.ndarray, file_path: str, sample_rate: int) -> None:
         """Save audio to file"""
@@ -60,6 +89,13 @@ class AudioProcessor:
         output_dir.mkdir(parents=True, exist_ok=True)
         sf.write(file_path, audio.reshape(-1), sample_rate, format='WAVEX')
     
+    @staticmethod
+    def encode_wav(audio: np.ndarray, sample_rate: int) -> bytes:
+        """Encode audio as WAV in memory (same format as save_audio)"""
+        buffer = io.BytesIO()
+        sf.write(buffer, audio.reshape(-1), sample_rate, format='WAVEX')
+        return buffer.getvalue()
+    
     @staticmethod
     def concatenate_with_crossfade(generated_waves: List[np.ndarray], 
                                    cross_fade_duration: float, 
@@ -113,11 +149,70 @@ class AudioProcessor:
 
         return final_wave
 
+    @staticmethod
+    def _volume_ratio(prev_overlap: np.ndarray, next_overlap: np.ndarray) -> Optional[np.float32]:
+        """Gain that matches next_overlap to prev_overlap, or None when either is near silent"""
+        prev_rms = np.sqrt(np.mean(prev_overlap.astype(np.float32) ** 2))
+        next_rms = np.sqrt(np.mean(next_overlap.astype(np.float32) ** 2))
+        
+        if prev_rms > 100 and next_rms > 100:  # Only adjust if both have reasonable levels
+            # Limit volume adjustment to prevent distortion
+            return np.clip(prev_rms / next_rms, 0.7, 1.5)
+        return None
+
+    @staticmethod
+    def _blend_overlap(prev_overlap: np.ndarray, next_overlap: np.ndarray) -> np.ndarray:
+        """Cosine cross-fade of two equally long int16 windows"""
+        fade_out, fade_in = _fade_curves(len(prev_overlap))
+        return (prev_overlap.astype(np.float32) * fade_out +
+                next_overlap.astype(np.float32) * fade_in).astype(np.int16)
+
+    @staticmethod
+    def _crossfade_overlap(prev_overlap: np.ndarray, next_wave: np.ndarray,
+                           cross_fade_samples: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Volume-match next_wave to prev_overlap and cross-fade the overlap region
+        
+        Returns:
+            Tuple of (cross_faded_overlap, next_wave_adjusted)
+        """
+        volume_ratio = AudioProcessor._volume_ratio(prev_overlap, next_wave[:cross_fade_samples])
+        if volume_ratio is not None:
+            next_wave_adjusted = (next_wave.astype(np.float32) * volume_ratio).astype(np.int16)
+        else:
+            next_wave_adjusted = next_wave
+
+        cross_faded_overlap = AudioProcessor._blend_overlap(prev_overlap, next_wave_adjusted[:cross_fade_samples])
+        return cross_faded_overlap, next_wave_adjusted
+
+    @staticmethod
+    def crossfade_offsets(lengths: List[int], cross_fade_samples: int) -> Tuple[List[int], List[int], int]:
+        """Output layout of a cross-faded concatenation
+        
+        Returns:
+            Tuple of (start offset of each wave in the output, overlap of each wave
+            with what precedes it, total output length)
+        """
+        starts, overlaps = [], []
+        end = 0
+        for length in lengths:
+            overlap = min(cross_fade_samples, end, length)
+            starts.append(end - overlap)
+            overlaps.append(overlap)
+            end += length - overlap
+        return starts, overlaps, end
+
     @staticmethod
     def concatenate_with_crossfade_improved(generated_waves: List[np.ndarray], 
                                            cross_fade_duration: float, 
                                            sample_rate: int) -> np.ndarray:
-        """Improved concatenation with better volume handling and smoother cross-fade"""
+        """Improved concatenation with better volume handling and smoother cross-fade
+        
+        All output offsets are computed up front and every wave is written once into a
+        single preallocated int16 buffer, so the cost is linear in the total length
+        rather than in chunks x length. A window may span several earlier waves when
+        chunks are shorter than the cross-fade; it blends with the already mixed output,
+        exactly as chaining pairwise cross-fades would.
+        """
         if not generated_waves:
             return np.array([])
         
@@ -125,63 +220,88 @@ class AudioProcessor:
             return generated_waves[0].reshape(-1)
         
         # Flatten all waves to 1D arrays and fix clipping
-        flattened_waves = []
-        for wave in generated_waves:
-            flat_wave = wave.reshape(-1)
-            # Fix clipped audio
-            fixed_wave = AudioProcessor.fix_clipped_audio(flat_wave)
-            flattened_waves.append(fixed_wave)
-        
-        if cross_fade_duration <= 0:
-            return np.concatenate(flattened_waves)
+        flattened_waves = [AudioProcessor.fix_clipped_audio(wave.reshape(-1)) for wave in generated_waves]
         
-        # Improved cross-fading with volume matching
-        final_wave = flattened_waves[0]
+        cross_fade_samples = max(int(cross_fade_duration * sample_rate), 0)
+        starts, overlaps, total = AudioProcessor.crossfade_offsets(
+            [len(wave) for wave in flattened_waves], cross_fade_samples
+        )
+        output = np.empty(total, dtype=np.int16)
         
-        for i in range(1, len(flattened_waves)):
-            prev_wave = final_wave
-            next_wave = flattened_waves[i]
-
-            # Calculate cross-fade samples
-            cross_fade_samples = int(cross_fade_duration * sample_rate)
-            cross_fade_samples = min(cross_fade_samples, len(prev_wave), len(next_wave))
-
-            if cross_fade_samples <= 0:
-                final_wave = np.concatenate([prev_wave, next_wave])
+        for wave, start, overlap in zip(flattened_waves, starts, overlaps):
+            if overlap <= 0:
+                output[start:start + len(wave)] = wave
                 continue
+            
+            window = output[start:start + overlap]
+            volume_ratio = AudioProcessor._volume_ratio(window, wave[:overlap])
+            if volume_ratio is None:
+                next_overlap, body = wave[:overlap], wave[overlap:]
+            else:
+                # Scaled straight into the output; only the short overlap is rounded separately
+                next_overlap = (wave[:overlap].astype(np.float32) * volume_ratio).astype(np.int16)
+                body = np.multiply(wave[overlap:], volume_ratio, dtype=np.float32)
+            
+            window[:] = AudioProcessor._blend_overlap(window, next_overlap)
+            output[start + overlap:start + len(wave)] = body
+        
+        return output
 
-            # Get overlapping parts
-            prev_overlap = prev_wave[-cross_fade_samples:]
-            next_overlap = next_wave[:cross_fade_samples]
+    @staticmethod
+    def crossfade_stream(generated_waves: Iterable[np.ndarray],
+                         cross_fade_duration: float,
+                         sample_rate: int) -> Generator[np.ndarray, None, None]:
+        """Incremental counterpart of concatenate_with_crossfade_improved
+        
+        Consumes waves one at a time and yields finished 1D segments as soon as
+        they can no longer be touched by the next cross-fade. Only the last
+        cross-fade window is held back until the following wave (or the end of
+        the input) arrives.
+        """
+        hold_samples = max(int(cross_fade_duration * sample_rate), 0)
+        tail = None
+        
+        waves = iter(generated_waves)
+        first = next(waves, None)
+        if first is None:
+            return
+        first = first.reshape(-1)
+        if AudioProcessor.fix_clipped_audio(first) is not first:
+            # A lone wave is returned unchanged by the concatenation, so a clipped first wave waits for a second one
+            second = next(waves, None)
+            if second is None:
+                yield first
+                return
+            waves = itertools.chain([second], waves)
+        
+        for wave in itertools.chain([first], waves):
+            next_wave = AudioProcessor.fix_clipped_audio(wave.reshape(-1))
             
-            # Match volume levels in overlap region more carefully
-            prev_rms = np.sqrt(np.mean(prev_overlap.astype(np.float32) ** 2))
-            next_rms = np.sqrt(np.mean(next_overlap.astype(np.float32) ** 2))
+            if tail is None:
+                merged = next_wave
+            else:
+                cross_fade_samples = min(hold_samples, len(tail), len(next_wave))
+                if cross_fade_samples <= 0:
+                    merged = np.concatenate([tail, next_wave])
+                else:
+                    cross_faded_overlap, next_wave_adjusted = AudioProcessor._crossfade_overlap(
+                        tail[-cross_fade_samples:], next_wave, cross_fade_samples
+                    )
+                    merged = np.concatenate([
+                        tail[:-cross_fade_samples],
+                        cross_faded_overlap,
+                        next_wave_adjusted[cross_fade_samples:]
+                    ])
             
-            if prev_rms > 100 and next_rms > 100:  # Only adjust if both have reasonable levels
-                # Adjust next wave to match previous wave's volume
-                volume_ratio = prev_rms / next_rms
-                # Limit volume adjustment to prevent distortion
-                volume_ratio = np.clip(volume_ratio, 0.7, 1.5)
-                next_wave_adjusted = (next_wave.astype(np.float32) * volume_ratio).astype(np.int16)
-                next_overlap = next_wave_adjusted[:cross_fade_samples]
+            if hold_samples <= 0:
+                tail = merged[:0]
+                ready = merged
             else:
-                next_wave_adjusted = next_wave
-                next_overlap = next_wave_adjusted[:cross_fade_samples]
-
-            # Use cosine-based fade for smoother transition
-            fade_out = np.cos(np.linspace(0, np.pi/2, cross_fade_samples)) ** 2
-            fade_in = np.sin(np.linspace(0, np.pi/2, cross_fade_samples)) ** 2
-
-            # Cross-faded overlap with proper data type handling
-            cross_faded_overlap = (prev_overlap.astype(np.float32) * fade_out + 
-                                   next_overlap.astype(np.float32) * fade_in).astype(np.int16)
-
-            # Combine waves
-            final_wave = np.concatenate([
-                prev_wave[:-cross_fade_samples], 
-                cross_faded_overlap, 
-                next_wave_adjusted[cross_fade_samples:]
-            ])
-
-        return final_wave 
\ No newline at end of file
+                split = max(len(merged) - hold_samples, 0)
+                ready, tail = merged[:split], merged[split:]
+            
+            if len(ready) > 0:
+                yield ready
+        
+        if tail is not None and len(tail) > 0:
+            yield tail
@@ -0,0 +1,124 @@
+"""
+Persistent cache of decoded chunk waveforms
+"""
+
+import hashlib
+import os
+import tempfile
+import threading
+from pathlib import Path
+from typing import Iterable, List, Optional, Tuple
+
+import numpy as np
+
+
+class ChunkCache:
+    """Stores the decoded waveform of each synthesized chunk on disk
+
+    Entries are plain .npy files named by a content hash of everything that
+    determines the chunk audio (text ids, frame budget, reference sample and
+    sampling settings). Recency is tracked through file mtimes and the oldest
+    entries are evicted once the directory grows past max_bytes. The directory
+    is scanned for its size once, then the size is tracked per put and the
+    directory only scanned again to evict.
+    """
+
+    def __init__(self, cache_dir: str, max_bytes: int):
+        self.cache_dir = Path(cache_dir).expanduser()
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._total: Optional[int] = None  # Bytes on disk, None until the first scan
+
+    @staticmethod
+    def make_key(parts: Iterable) -> str:
+        """Hash a sequence of str/bytes/ndarray/number parts into a cache key"""
+        digest = hashlib.sha256()
+        for part in parts:
+            if isinstance(part, np.ndarray):
+                data = part.dtype.str.encode() + str(part.shape).encode() + part.tobytes()
+            elif isinstance(part, bytes):
+                data = part
+            else:
+                data = repr(part).encode("utf-8")
+            digest.update(len(data).to_bytes(8, "little"))
+            digest.update(data)
+        return digest.hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}.npy"
+
+    def get(self, key: str) -> Optional[np.ndarray]:
+        """Return the cached waveform for key, or None"""
+        path = self._path(key)
+        try:
+            wave = np.load(path, allow_pickle=False)
+        except (OSError, ValueError):
+            return None
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return wave
+
+    def put(self, key: str, wave: np.ndarray) -> None:
+        """Store a waveform and evict old entries if the cache is over its size cap"""
+        path = self._path(key)
+        tmp_path = None
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                np.save(f, np.ascontiguousarray(wave), allow_pickle=False)
+            added = os.path.getsize(tmp_path) - self._file_size(path)
+            os.replace(tmp_path, path)
+            tmp_path = None
+        except OSError as e:
+            print(f"Warning: failed to write chunk cache entry {key}: {e}")
+            return
+        finally:
+            if tmp_path is not None:
+                try:
+                    os.unlink(tmp_path)
+                except OSError:
+                    pass
+        self._evict(added)
+
+    @staticmethod
+    def _file_size(path: Path) -> int:
+        try:
+            return path.stat().st_size
+        except OSError:
+            return 0
+
+    def _scan(self) -> Tuple[List[Tuple[float, int, Path]], int]:
+        entries = []
+        total = 0
+        for entry in self.cache_dir.glob("*/*.npy"):
+            try:
+                stat = entry.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, entry))
+            total += stat.st_size
+        return entries, total
+
+    def _evict(self, added: int) -> None:
+        with self._lock:
+            if self._total is None:
+                self._total = self._scan()[1]  # Already counts the entry just written
+            else:
+                self._total += added
+            if self._total <= self.max_bytes:
+                return
+
+            entries, total = self._scan()
+            entries.sort()
+            for _, size, entry in entries:
+                if total <= self.max_bytes:
+                    break
+                try:
+                    entry.unlink()
+                    total -= size
+                except OSError:
+                    pass
+            self._total = total
@@ -0,0 +1,144 @@
+"""
+Chunk planning for long texts
+"""
+
+import math
+import re
+from dataclasses import dataclass
+from typing import Callable, List, Tuple
+
+
+SENTENCE_BREAK = re.compile(r'(?<=[.!?]) +')
+_CLAUSE_BREAK = re.compile(r'(?<=,) +')
+
+
+def bucket_sizes(max_length: int, bucket_count: int) -> List[int]:
+    """Evenly spaced chunk lengths up to max_length (empty when bucketing is off)"""
+    if bucket_count <= 0:
+        return []
+    return [math.ceil(max_length * k / bucket_count) for k in range(1, bucket_count + 1)]
+
+
+@dataclass
+class ChunkPlan:
+    """Chunks of a text with the bucket each one is padded to when batched"""
+
+    chunks: List[str]
+    lengths: List[int]  # Weighted text length of each chunk (TextProcessor.calculate_text_length)
+    buckets: List[int]  # Bucket length each chunk is padded to
+    split_sentences: int = 0  # Sentences that had to be cut because they exceed the chunk budget
+
+    @classmethod
+    def from_chunks(cls, chunks: List[str], lengths: List[int], sizes: List[int],
+                    split_sentences: int = 0) -> "ChunkPlan":
+        """Describe an existing chunking against a set of bucket sizes"""
+        return cls(chunks, lengths, [_bucket_for(length, sizes) for length in lengths], split_sentences)
+
+    @property
+    def padding(self) -> int:
+        return sum(bucket - length for bucket, length in zip(self.buckets, self.lengths))
+
+    @property
+    def padding_ratio(self) -> float:
+        """Padding as a fraction of the real text length"""
+        total = sum(self.lengths)
+        return self.padding / total if total else 0.0
+
+    def summary(self) -> str:
+        shapes = sorted(set(self.buckets))
+        return (f"{len(self.chunks)} chunks, {len(shapes)} shapes {shapes}, "
+                f"padding overhead {self.padding_ratio:.1%}, {self.split_sentences} sentences split")
+
+
+def _bucket_for(length: int, sizes: List[int]) -> int:
+    for size in sizes:
+        if length <= size:
+            return size
+    return length
+
+
+def _split_words(text: str, max_length: int, measure: Callable[[str], int]) -> List[str]:
+    """Greedy word packing; a single word longer than max_length is cut by characters"""
+    pieces, current = [], ""
+    for word in text.split(" "):
+        candidate = f"{current} {word}" if current else word
+        if measure(candidate) <= max_length:
+            current = candidate
+            continue
+        if current:
+            pieces.append(current)
+        while measure(word) > max_length:
+            cut = max(len(word) * max_length // measure(word), 1)
+            pieces.append(word[:cut])
+            word = word[cut:]
+        current = word
+    if current:
+        pieces.append(current)
+    return pieces
+
+
+def _split_sentence(sentence: str, max_length: int, measure: Callable[[str], int]) -> List[str]:
+    """Cut an over-long sentence at commas, and at word boundaries only where a clause is still too long"""
+    parts = []
+    for clause in _CLAUSE_BREAK.split(sentence):
+        if measure(clause) <= max_length:
+            parts.append(clause)
+        else:
+            parts.extend(_split_words(clause, max_length, measure))
+    return parts
+
+
+def plan_chunks(text: str, max_length: int, measure: Callable[[str], int],
+                bucket_count: int = 4) -> ChunkPlan:
+    """Pack sentences into as few chunks as possible, then as close to bucket lengths as possible
+
+    Sentences are kept whole unless one alone exceeds max_length. Among the plans
+    with the fewest chunks, dynamic programming picks the one with the least padding
+    to the bucket sizes and, after that, the most even chunk lengths.
+
+    Args:
+        text: Cleaned text (TextProcessor.clean_text)
+        max_length: Largest weighted length a chunk may have
+        measure: Weighted length of a piece of text
+        bucket_count: Number of fixed chunk lengths to aim for (0 disables bucketing)
+    """
+    atoms, split_sentences = [], 0
+    for sentence in SENTENCE_BREAK.split(text.strip()):
+        sentence = sentence.strip()
+        if not sentence:
+            continue
+        if measure(sentence) <= max_length:
+            atoms.append(sentence)
+        else:
+            split_sentences += 1
+            atoms.extend(_split_sentence(sentence, max_length, measure))
+    if not atoms:
+        return ChunkPlan([], [], [])
+
+    sizes = bucket_sizes(max_length, bucket_count)
+    atom_lengths = [measure(atom) for atom in atoms]
+
+    # best[j]: cost (chunks, padding, sum of squared lengths) of the best plan for atoms[:j]
+    inf = (math.inf, math.inf, math.inf)
+    best: List[Tuple[float, float, float]] = [(0, 0, 0)] + [inf] * len(atoms)
+    start_of: List[int] = [0] * (len(atoms) + 1)
+    for j in range(1, len(atoms) + 1):
+        length = -1  # Joining with spaces adds one per extra atom
+        for i in range(j - 1, -1, -1):
+            length += atom_lengths[i] + 1
+            if length > max_length and i < j - 1:
+                break
+            chunks, padding, spread = best[i]
+            cost = (chunks + 1, padding + _bucket_for(length, sizes) - length, spread + length * length)
+            if cost < best[j]:
+                best[j] = cost
+                start_of[j] = i
+
+    chunks = []
+    j = len(atoms)
+    while j > 0:
+        i = start_of[j]
+        chunks.append(" ".join(atoms[i:j]))
+        j = i
+    chunks.reverse()
+    return ChunkPlan.from_chunks(chunks, [measure(chunk) for chunk in chunks], sizes, split_sentences)
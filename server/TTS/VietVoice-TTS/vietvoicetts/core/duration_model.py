@@ -0,0 +1,148 @@
+"""
+Per-voice duration models fitted offline against the speech the engine produces
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+from dataclasses import asdict, dataclass, replace
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from .audio_processor import AudioProcessor
+from .model_config import ModelConfig
+
+
+# Sentences of increasing length, so the fit sees the whole range of chunk sizes
+CALIBRATION_SENTENCES = [
+    "Vâng.",
+    "Chào buổi sáng.",
+    "Hôm nay trời nắng đẹp.",
+    "Con mèo nhỏ nằm ngủ bên cửa sổ.",
+    "Buổi chiều, gió thổi nhẹ qua cánh đồng lúa chín vàng.",
+    "Hôm nay trời đẹp quá, chúng ta cùng nhau đi dạo trong công viên nhé.",
+    "Ngày xửa ngày xưa, ở một ngôi làng nhỏ ven sông, có hai anh em sống nương tựa vào nhau.",
+    "Những câu chuyện cổ tích luôn mang lại cho trẻ em nhiều bài học quý giá về lòng tốt và sự dũng cảm.",
+    "Mỗi sáng, người mẹ dậy thật sớm để nấu cơm, quét sân và chuẩn bị mọi thứ trước khi các con thức dậy đi học.",
+    "Khi mặt trời lặn sau rặng núi xa, cả khu rừng chìm vào yên lặng, chỉ còn tiếng suối chảy róc rách và tiếng côn trùng kêu.",
+]
+
+
+@dataclass(frozen=True)
+class DurationModel:
+    """Linear fit of spoken seconds against weighted text length for one voice, at speed 1.0"""
+
+    slope: float  # seconds per unit of TextProcessor.calculate_text_length
+    intercept: float  # seconds
+    margin: float  # largest under-estimate seen during calibration, in seconds
+    points: int
+
+    def seconds(self, text_length: int) -> float:
+        """Speech duration to allocate for a text, covering every calibration point"""
+        return self.intercept + self.slope * text_length + self.margin
+
+
+class DurationModels:
+    """Duration models of the built-in voices, looked up by reference audio digest"""
+
+    def __init__(self, models: Optional[Dict[str, DurationModel]] = None, digest: Optional[str] = None):
+        self.models = models or {}
+        self.digest = digest  # Content hash of the calibration file, None when nothing is loaded
+
+    def __len__(self) -> int:
+        return len(self.models)
+
+    def get(self, reference_digest: str) -> Optional[DurationModel]:
+        return self.models.get(reference_digest)
+
+    @staticmethod
+    def path(config: ModelConfig) -> Path:
+        cache_dir = Path(config.model_cache_dir).expanduser()
+        return cache_dir / f"{Path(config.model_filename).stem}-durations.json"
+
+    @classmethod
+    def load(cls, config: ModelConfig) -> "DurationModels":
+        path = cls.path(config)
+        if not path.exists():
+            return cls()
+        try:
+            data = path.read_bytes()
+            voices = json.loads(data)["voices"]
+            models = {voice["digest"]: DurationModel(**voice["model"]) for voice in voices.values()}
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            print(f"Warning: ignoring unreadable duration models {path}: {e}")
+            return cls()
+        print(f"Loaded duration models for {len(models)} voices from {path}")
+        return cls(models, hashlib.sha256(data).hexdigest()[:16])
+
+
+def _fit(lengths: List[int], seconds: List[float]) -> DurationModel:
+    slope, intercept = np.polyfit(np.asarray(lengths, dtype=np.float64), np.asarray(seconds, dtype=np.float64), 1)
+    residuals = np.asarray(seconds) - (intercept + slope * np.asarray(lengths))
+    return DurationModel(slope=float(slope), intercept=float(intercept),
+                         margin=float(max(residuals.max(), 0.0)), points=len(lengths))
+
+
+def calibrate_durations(config: ModelConfig, sentences: Optional[List[str]] = None) -> Dict[str, dict]:
+    """Synthesize the calibration sentences with every built-in voice and fit its duration model
+
+    Chunks are sized with the uncalibrated speaking-rate estimate and the spoken
+    length is measured up to the last non-silent sample. The models are written
+    next to the model archive (DurationModels.path) and picked up by TTSEngine.
+
+    Returns:
+        Mapping of sample file name to its fitted model and allocation figures
+    """
+    from .tts_engine import TTSEngine
+
+    sentences = sentences or CALIBRATION_SENTENCES
+    if len(sentences) < 2:
+        raise ValueError("Calibration needs at least two sentences")
+
+    engine = TTSEngine(replace(config, speed=1.0, duration_model=False, chunk_cache_dir=None, parallel_sessions=1))
+    text_processor = engine.text_processor
+    voices = {}
+    try:
+        for sample in engine.model_session_manager.sample_metadata:
+            ref_audio = engine.model_session_manager.get_sample_audio(sample)
+            prefix = engine._reference_prefix(ref_audio, sample["text"])
+            lengths, spoken, allocated = [], [], []
+            for sentence in sentences:
+                text = text_processor.clean_text(sentence)
+                length = text_processor.calculate_text_length(text, config.pause_punctuation)
+                inputs = engine._prepare_inputs(ref_audio, sample["text"], text)
+                if len(inputs) != 1:
+                    continue  # Too long for one chunk with this voice
+                audio, text_ids, max_duration, time_step = inputs[0]
+                wave = engine._generate_chunk(audio, text_ids, max_duration, time_step).reshape(-1)
+                lengths.append(length)
+                spoken.append(AudioProcessor.speech_end(wave) / config.sample_rate)
+                allocated.append((int(max_duration[0]) - prefix.audio_len) * config.hop_length / config.sample_rate)
+            if len(set(lengths)) < 2:
+                print(f"Warning: not enough calibration points for {sample['file_name']}, skipped")
+                continue
+            model = _fit(lengths, spoken)
+            voices[sample["file_name"]] = {
+                "digest": prefix.digest,
+                "model": asdict(model),
+                "allocated_seconds": float(sum(allocated)),
+                "spoken_seconds": float(sum(spoken)),
+                "predicted_seconds": float(sum(model.seconds(length) for length in lengths)),
+            }
+    finally:
+        engine.cleanup()
+
+    path = DurationModels.path(config)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump({"sentences": sentences, "voices": voices}, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, path)
+    except BaseException:
+        Path(tmp_path).unlink(missing_ok=True)
+        raise
+    return voices
@@ -2,16 +2,35 @@
 Model session management for ONNX Runtime
 """
 
+import hashlib
+import os
 import tarfile
 import tempfile
 import shutil
+import threading
+import time
 from pathlib import Path
-from typing import List, Tuple, Optional
+from typing import Dict, List, Tuple, Optional, Union
 import json
+import platform
+import numpy as np
 import onnxruntime
 import random
 
-from .model_config import ModelConfig, MODEL_GENDER, MODEL_GROUP, MODEL_AREA, MODEL_EMOTION
+from .model_config import ModelConfig, MODEL_GENDER, MODEL_GROUP, MODEL_AREA, MODEL_EMOTION, MODEL_FILES, SESSION_PROFILES
+from .audio_processor import AudioProcessor
+
+
+# Bump when the layout of the extracted model directory changes
+EXTRACT_FORMAT_VERSION = 1
+
+
+def _file_sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(block)
+    return digest.hexdigest()
 
 
 class ModelSessionManager:
@@ -24,8 +43,12 @@ class ModelSessionManager:
         self.input_names = {}
         self.output_names = {}
         self.sample_metadata = {}
-        self.temp_dir = None
+        self.sample_audio: Dict[str, np.ndarray] = {}
+        self._sample_lock = threading.Lock()
+        # Picks among matching voices for requests without a seed of their own, seeded once like ORT
+        self._voice_rng = random.Random(config.random_seed)
         self.vocab_path = None
+        self.load_report: Dict[str, dict] = {}
         
     def _get_optimal_providers(self) -> List[str]:
         """Get the fastest available providers"""
@@ -35,6 +58,8 @@ class ModelSessionManager:
             'CUDAExecutionProvider',
             'CPUExecutionProvider'
         ]
+        if not self.config.use_gpu:
+            provider_priority.remove('CUDAExecutionProvider')
         
         selected_providers = []
         for provider in provider_priority:
@@ -48,89 +73,344 @@ class ModelSessionManager:
     
     def _create_session_options(self) -> onnxruntime.SessionOptions:
         """Create optimized ONNX Runtime session options"""
+        intra_op_threads = self.config.intra_op_num_threads
+        enable_cpu_mem_arena = self.config.enable_cpu_mem_arena
+        allow_spinning = True
+        config_entries = {}
+        cpu_share = 1.0
+        
+        if self.config.session_profile is not None:
+            profile = SESSION_PROFILES[self.config.session_profile]
+            cpu_share = profile["intra_op_share"]
+            enable_cpu_mem_arena = profile["enable_cpu_mem_arena"]
+            allow_spinning = profile["allow_spinning"]
+            config_entries = profile["config_entries"]
+        
+        # Parallel session sets split the cores between them instead of each claiming all of them
+        if intra_op_threads == 0 and (cpu_share < 1.0 or self.config.parallel_sessions > 1):
+            intra_op_threads = max(1, int((os.cpu_count() or 1) * cpu_share / self.config.parallel_sessions))
+        
         session_opts = onnxruntime.SessionOptions()
         session_opts.log_severity_level = self.config.log_severity_level
         session_opts.log_verbosity_level = self.config.log_verbosity_level
         session_opts.inter_op_num_threads = self.config.inter_op_num_threads
-        session_opts.intra_op_num_threads = self.config.intra_op_num_threads
-        session_opts.enable_cpu_mem_arena = self.config.enable_cpu_mem_arena
+        session_opts.intra_op_num_threads = intra_op_threads
+        session_opts.enable_cpu_mem_arena = enable_cpu_mem_arena
         session_opts.execution_mode = onnxruntime.ExecutionMode.ORT_SEQUENTIAL
         session_opts.graph_optimization_level = onnxruntime.GraphOptimizationLevel.ORT_ENABLE_ALL
-        session_opts.add_session_config_entry("session.intra_op.allow_spinning", "1")
-        session_opts.add_session_config_entry("session.inter_op.allow_spinning", "1")
+        spinning = "1" if allow_spinning else "0"
+        session_opts.add_session_config_entry("session.intra_op.allow_spinning", spinning)
+        session_opts.add_session_config_entry("session.inter_op.allow_spinning", spinning)
         session_opts.add_session_config_entry("session.set_denormal_as_zero", "1")
+        for key, value in config_entries.items():
+            session_opts.add_session_config_entry(key, value)
         return session_opts
     
     def _load_models_from_file(self) -> None:
-        """Load ONNX models from downloaded model file and extract vocab"""
+        """Load ONNX models from the extracted model directory"""
         # Ensure model is downloaded and get path
         model_path = self.config.ensure_model_downloaded()
         
         if not Path(model_path).exists():
             raise FileNotFoundError(f"Model file not found: {model_path}")
         
-        expected_models = {
-            'preprocess': 'preprocess.onnx',
-            'transformer': 'transformer.onnx', 
-            'decode': 'decode.onnx'
-        }
-        
         try:
-            with tarfile.open(model_path, 'r') as tar:
-                tar_members = tar.getnames()
-                
-                # Load metadata.json
-                self.sample_metadata = json.load(tar.extractfile("audio_metadata.json"))
-                
-                # Load ONNX models
-                for model_name, filename in expected_models.items():
-                    matching_member = next((m for m in tar_members if m.endswith(filename)), None)
-                    if not matching_member:
-                        raise FileNotFoundError(f"Model file '{filename}' not found in model archive")
-                    
-                    extracted_file = tar.extractfile(matching_member)
-                    if not extracted_file:
-                        raise RuntimeError(f"Failed to extract {filename} from model archive")
-                    
-                    model_bytes = extracted_file.read()
-                    session_opts = self._create_session_options()
-                    session = onnxruntime.InferenceSession(
-                        model_bytes,
-                        sess_options=session_opts,
-                        providers=self.providers
-                    )
-                    
-                    self.sessions[model_name] = session
-                    self.input_names[model_name] = [inp.name for inp in session.get_inputs()]
-                    self.output_names[model_name] = [out.name for out in session.get_outputs()]
-                
-                # Extract vocab.txt to temporary file
-                vocab_member = next((m for m in tar_members if m.endswith('vocab.txt')), None)
-                if not vocab_member:
-                    raise FileNotFoundError("Vocabulary file 'vocab.txt' not found in model archive")
-                
-                self.temp_dir = tempfile.mkdtemp(prefix="tts_vocab_")
-                vocab_temp_path = Path(self.temp_dir) / 'vocab.txt'
-                
-                extracted_file = tar.extractfile(vocab_member)
-                if not extracted_file:
-                    raise RuntimeError("Failed to extract vocab.txt from model archive")
+            model_dir = self.ensure_models_extracted()
+            
+            with open(model_dir / "audio_metadata.json", "r", encoding="utf-8") as f:
+                self.sample_metadata = json.load(f)
+            
+            # Sessions load from file paths, so no in-memory copy of the graphs is kept
+            # and weights stored as external data are memory-mapped by ONNX Runtime
+            for model_name, filename in MODEL_FILES.items():
+                if self.config.precision != "fp32":
+                    model_source = self._variant_model_path(filename)
+                else:
+                    model_source = str(model_dir / filename)
                 
-                with open(vocab_temp_path, 'wb') as f:
-                    f.write(extracted_file.read())
+                session = self._create_session(model_name, model_source)
                 
-                self.vocab_path = str(vocab_temp_path)
+                self.sessions[model_name] = session
+                self.input_names[model_name] = [inp.name for inp in session.get_inputs()]
+                self.output_names[model_name] = [out.name for out in session.get_outputs()]
+            
+            self.vocab_path = str(model_dir / "vocab.txt")
+            self._print_load_report()
+            
+            if self.config.preload_samples:
+                with tarfile.open(model_path, 'r') as tar:
+                    self._index_samples(tar, self.sample_metadata)
                 
         except Exception as e:
-            if self.temp_dir and Path(self.temp_dir).exists():
-                shutil.rmtree(self.temp_dir)
-                self.temp_dir = None
             raise RuntimeError(f"Failed to load models from file: {str(e)}")
     
+    def _create_session(self, model_name: str, model_source: str) -> onnxruntime.InferenceSession:
+        """Create a session, reusing a graph optimized by an earlier process when possible"""
+        if not self.config.cache_optimized_models:
+            start = time.perf_counter()
+            session = onnxruntime.InferenceSession(
+                model_source, sess_options=self._create_session_options(), providers=self.providers
+            )
+            self.load_report[model_name] = {"optimized_cache": "disabled", "seconds": time.perf_counter() - start}
+            return session
+        
+        cache_path = self._optimized_model_path(model_source)
+        timing_path = cache_path.with_suffix(".json")
+        
+        if cache_path.exists():
+            session_opts = self._create_session_options()
+            # The cached graph is already optimized for this ORT version and provider
+            session_opts.graph_optimization_level = onnxruntime.GraphOptimizationLevel.ORT_DISABLE_ALL
+            start = time.perf_counter()
+            try:
+                session = onnxruntime.InferenceSession(
+                    str(cache_path), sess_options=session_opts, providers=self.providers
+                )
+            except Exception as e:
+                print(f"Warning: optimized model cache for {model_name} is unusable ({e}), optimizing again")
+                for stale in (cache_path, cache_path.with_name(f"{cache_path.name}.data"), timing_path):
+                    stale.unlink(missing_ok=True)
+            else:
+                seconds = time.perf_counter() - start
+                try:
+                    with open(timing_path, "r", encoding="utf-8") as f:
+                        cold_seconds = json.load(f)["seconds"]
+                except (OSError, ValueError, KeyError):
+                    cold_seconds = None
+                self.load_report[model_name] = {
+                    "optimized_cache": "hit",
+                    "seconds": seconds,
+                    "saved_seconds": None if cold_seconds is None else max(cold_seconds - seconds, 0.0),
+                }
+                return session
+        
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        work_dir = Path(tempfile.mkdtemp(prefix=".optimize_", dir=cache_path.parent))
+        try:
+            session_opts = self._create_session_options()
+            session_opts.optimized_model_filepath = str(work_dir / cache_path.name)
+            # Large initializers go to a side file so the graph stays under the 2GB protobuf limit
+            session_opts.add_session_config_entry(
+                "session.optimized_model_external_initializers_file_name", f"{cache_path.name}.data"
+            )
+            session_opts.add_session_config_entry(
+                "session.optimized_model_external_initializers_min_size_in_bytes", "1024"
+            )
+            start = time.perf_counter()
+            session = onnxruntime.InferenceSession(
+                model_source, sess_options=session_opts, providers=self.providers
+            )
+            seconds = time.perf_counter() - start
+            
+            try:
+                # Weights first: a visible graph file implies its data file is complete
+                written = sorted(work_dir.iterdir(), key=lambda path: path.name == cache_path.name)
+                for path in written:
+                    os.replace(path, cache_path.parent / path.name)
+                with open(timing_path, "w", encoding="utf-8") as f:
+                    json.dump({"seconds": seconds}, f)
+            except OSError as e:
+                print(f"Warning: failed to write optimized model cache for {model_name}: {e}")
+        finally:
+            shutil.rmtree(work_dir, ignore_errors=True)
+        
+        self.load_report[model_name] = {"optimized_cache": "miss", "seconds": seconds}
+        return session
+    
+    def _optimized_model_path(self, model_source: str) -> Path:
+        """Cache location of the optimized graph of a model file
+        
+        Optimized graphs may contain kernels specific to the ORT build, execution
+        provider and CPU architecture, so all of them are part of the key, along
+        with the precision and the identity of the source file.
+        """
+        source = Path(model_source)
+        stat = source.stat()
+        identity = json.dumps([
+            onnxruntime.__version__,
+            self.providers,
+            platform.machine(),
+            self.config.precision,
+            str(source.resolve()),
+            stat.st_size,
+            stat.st_mtime_ns,
+        ])
+        key = hashlib.sha256(identity.encode("utf-8")).hexdigest()[:16]
+        cache_dir = Path(self.config.model_cache_dir).expanduser()
+        return cache_dir / "optimized" / key / source.name
+    
+    def _print_load_report(self) -> None:
+        seconds = sum(entry["seconds"] for entry in self.load_report.values())
+        hits = [entry for entry in self.load_report.values() if entry["optimized_cache"] == "hit"]
+        saved = sum(entry.get("saved_seconds") or 0.0 for entry in hits)
+        if hits:
+            print(f"Created {len(self.load_report)} sessions in {seconds:.2f}s "
+                  f"({len(hits)} from the optimized model cache, saved {saved:.2f}s)")
+        else:
+            print(f"Created {len(self.load_report)} sessions in {seconds:.2f}s")
+    
+    def _extracted_dir(self, model_path: str) -> Path:
+        """Versioned extraction directory of a model archive
+        
+        The version is derived from the archive's identity, so a re-downloaded
+        archive is extracted into a fresh directory.
+        """
+        stat = Path(model_path).stat()
+        identity = f"{EXTRACT_FORMAT_VERSION}:{self.config.model_url}:{stat.st_size}:{stat.st_mtime_ns}"
+        version = hashlib.sha256(identity.encode("utf-8")).hexdigest()[:16]
+        cache_dir = Path(self.config.model_cache_dir).expanduser()
+        return cache_dir / "extracted" / f"{Path(self.config.model_filename).stem}-{version}"
+    
+    def ensure_models_extracted(self) -> Path:
+        """Extract the ONNX graphs, vocab and sample metadata once and return their directory
+        
+        Every file is recorded with its size and sha256 in manifest.json. Sizes are
+        checked on each load, checksums only when config.verify_model_checksums is
+        set. A directory that fails verification is extracted again.
+        """
+        model_path = self.config.ensure_model_downloaded()
+        model_dir = self._extracted_dir(model_path)
+        
+        if model_dir.exists():
+            if self._verify_extracted(model_dir, full=self.config.verify_model_checksums):
+                return model_dir
+            print(f"Extracted models in {model_dir} failed verification, extracting again")
+            shutil.rmtree(model_dir, ignore_errors=True)
+        
+        start = time.perf_counter()
+        model_dir.parent.mkdir(parents=True, exist_ok=True)
+        work_dir = Path(tempfile.mkdtemp(prefix=".extract_", dir=model_dir.parent))
+        try:
+            self._extract_archive(model_path, work_dir)
+            try:
+                os.rename(work_dir, model_dir)
+            except OSError:
+                # Another process finished extracting the same version first
+                if not self._verify_extracted(model_dir, full=True):
+                    raise
+        finally:
+            shutil.rmtree(work_dir, ignore_errors=True)
+        print(f"Extracted models to {model_dir} in {time.perf_counter() - start:.1f}s")
+        
+        # Older versions of the same archive are no longer used by new processes
+        for stale in model_dir.parent.glob(f"{Path(self.config.model_filename).stem}-*"):
+            if stale != model_dir and stale.is_dir():
+                shutil.rmtree(stale, ignore_errors=True)
+        return model_dir
+    
+    def _extract_archive(self, model_path: str, target: Path) -> None:
+        """Write the archive members the sessions need into target, plus a manifest"""
+        wanted = list(MODEL_FILES.values()) + ["vocab.txt", "audio_metadata.json"]
+        with tarfile.open(model_path, 'r') as tar:
+            tar_members = tar.getnames()
+            for filename in wanted:
+                matching_member = next((m for m in tar_members if m.endswith(filename)), None)
+                if not matching_member:
+                    raise FileNotFoundError(f"File '{filename}' not found in model archive")
+                extracted_file = tar.extractfile(matching_member)
+                if not extracted_file:
+                    raise RuntimeError(f"Failed to extract {filename} from model archive")
+                with open(target / filename, 'wb') as f:
+                    shutil.copyfileobj(extracted_file, f, 1024 * 1024)
+        
+        external_data = self._externalize_weights(target)
+        
+        files = {}
+        for path in sorted(target.iterdir()):
+            files[path.name] = {"size": path.stat().st_size, "sha256": _file_sha256(path)}
+        manifest = {
+            "format": EXTRACT_FORMAT_VERSION,
+            "model_url": self.config.model_url,
+            "external_data": external_data,
+            "files": files,
+        }
+        with open(target / "manifest.json", "w", encoding="utf-8") as f:
+            json.dump(manifest, f, indent=2)
+    
+    @staticmethod
+    def _externalize_weights(target: Path) -> bool:
+        """Move initializers of the extracted graphs into external .data files
+        
+        ONNX Runtime maps external weights into memory instead of copying them
+        out of the protobuf, so worker processes share them through the page cache.
+        Skipped when the optional onnx package is not installed.
+        """
+        try:
+            import onnx
+        except ImportError:
+            return False
+        
+        for filename in MODEL_FILES.values():
+            path = target / filename
+            model = onnx.load(str(path))
+            onnx.save_model(
+                model,
+                str(path),
+                save_as_external_data=True,
+                all_tensors_to_one_file=True,
+                location=f"{filename}.data",
+                size_threshold=1024,
+            )
+        return True
+    
+    @staticmethod
+    def _verify_extracted(model_dir: Path, full: bool = False) -> bool:
+        """Check an extracted directory against its manifest"""
+        try:
+            with open(model_dir / "manifest.json", "r", encoding="utf-8") as f:
+                manifest = json.load(f)
+            if manifest.get("format") != EXTRACT_FORMAT_VERSION:
+                return False
+            for filename, entry in manifest["files"].items():
+                path = model_dir / filename
+                if path.stat().st_size != entry["size"]:
+                    return False
+                if full and _file_sha256(path) != entry["sha256"]:
+                    return False
+        except (OSError, ValueError, KeyError):
+            return False
+        return True
+    
+    def _variant_model_path(self, filename: str) -> str:
+        """Path of a converted model for the configured precision"""
+        path = Path(self.config.variant_dir()) / filename
+        if not path.exists():
+            raise FileNotFoundError(
+                f"{self.config.precision} model '{path}' not found. "
+                f"Create it with: vietvoice-tts convert --precision {self.config.precision}"
+            )
+        return str(path)
+    
+    def _index_samples(self, tar: tarfile.TarFile, samples: List[dict]) -> None:
+        """Decode reference samples from an open model archive into the sample index"""
+        for sample in samples:
+            file_name = sample["file_name"]
+            if file_name in self.sample_audio:
+                continue
+            ref_audio = tar.extractfile("cleaned_audios/" + file_name)
+            if not ref_audio:
+                raise FileNotFoundError(f"Audio file {file_name} not found in model archive")
+            audio = AudioProcessor.load_audio(ref_audio.read(), self.config.sample_rate)
+            # Shared by every request, so keep it immutable
+            audio.setflags(write=False)
+            self.sample_audio[file_name] = audio
+    
+    def get_sample_audio(self, sample: dict) -> np.ndarray:
+        """Return the decoded, resampled and normalized audio of a built-in sample"""
+        audio = self.sample_audio.get(sample["file_name"])
+        if audio is not None:
+            return audio
+        
+        with self._sample_lock:
+            if sample["file_name"] not in self.sample_audio:
+                model_path = self.config.ensure_model_downloaded()
+                with tarfile.open(model_path, 'r') as tar:
+                    self._index_samples(tar, [sample])
+        return self.sample_audio[sample["file_name"]]
+    
     def load_models(self) -> None:
         """Load all ONNX models from downloaded model file"""
         onnxruntime.set_seed(self.config.random_seed)
-        random.seed(self.config.random_seed)
         self._load_models_from_file()
     
     def select_sample(self, gender: Optional[str] = None,
@@ -138,8 +418,20 @@ class ModelSessionManager:
                      area: Optional[str] = None,
                      emotion: Optional[str] = None,
                      reference_audio: Optional[str] = None,
-                     reference_text: Optional[str] = None) -> Tuple[str, str]:
-        """Select a sample from the metadata"""
+                     reference_text: Optional[str] = None,
+                     rng: Optional[random.Random] = None) -> Tuple[Union[str, np.ndarray], str]:
+        """Select a sample from the metadata
+        
+        Among several matching voices the choice is drawn from rng, the random
+        generator of a seeded request, which always picks the same voice. Without
+        one the manager's generator, seeded once with config.random_seed, is used,
+        so consecutive requests vary between the matching voices.
+        
+        Returns:
+            Tuple of (reference audio, reference text). The audio is the caller's
+            file path when reference_audio is given, otherwise the decoded int16
+            samples of the selected built-in voice.
+        """
         filter_options = {}
         if gender is not None:
             if gender not in MODEL_GENDER:
@@ -181,29 +473,24 @@ class ModelSessionManager:
             if len(available_samples) == 0:
                 sample, sample_idx = self.sample_metadata[0], 0
             else:
-                sample, sample_idx = random.choice(available_samples)
+                rng = rng or self._voice_rng
+                sample, sample_idx = rng.choice(available_samples)
 
             print(f"Selected sample #{sample_idx} with gender: {sample['gender']}, group: {sample['group']}, area: {sample['area']}, emotion: {sample['emotion']}")
 
-            # Get the cached model path
-            model_path = self.config.ensure_model_downloaded()
-            
-            with tarfile.open(model_path, 'r') as tar:
-                ref_audio = tar.extractfile("cleaned_audios/" + sample["file_name"])
-                if not ref_audio:
-                    raise FileNotFoundError(f"Audio file {sample['file_name']} not found in model archive")
-                ref_audio = ref_audio.read()
-                ref_text = sample["text"]
+            ref_audio = self.get_sample_audio(sample)
+            ref_text = sample["text"]
         except KeyError:
             raise ValueError(f"Sample not found for gender: {gender}, group: {group}, area: {area}, emotion: {emotion}")
         return ref_audio, ref_text
     
     def cleanup(self) -> None:
-        """Clean up temporary files"""
-        if self.temp_dir and Path(self.temp_dir).exists():
-            shutil.rmtree(self.temp_dir)
-            self.temp_dir = None
-            self.vocab_path = None
+        """Clean up resources
+        
+        The extracted model directory is persistent and shared with other
+        processes, so nothing is removed from disk.
+        """
+        self.sample_audio.clear()
     
     def __del__(self):
         self.cleanup() 
\ No newline at end of file
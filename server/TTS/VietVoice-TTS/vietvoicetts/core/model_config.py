@@ -16,6 +16,48 @@ MODEL_GROUP = ["story", "news", "audiobook", "interview", "review"]
 MODEL_AREA = ["northern", "southern", "central"]
 MODEL_EMOTION = ["neutral", "serious", "monotone", "sad", "surprised", "happy", "angry"]
 
+# ONNX graph file of each session inside the model archive
+MODEL_FILES = {
+    'preprocess': 'preprocess.onnx',
+    'transformer': 'transformer.onnx',
+    'decode': 'decode.onnx'
+}
+
+# Model precisions; anything but fp32 is produced offline with `vietvoice-tts convert`
+PRECISIONS = ["fp32", "int8", "fp16"]
+
+# Quality tiers: number of flow-matching (NFE) steps per tier
+QUALITY_TIERS = {"draft": 8, "standard": 16, "high": 32}
+# Largest number of NFE steps a request may ask for, twice the "high" tier
+MAX_NFE_STEP = 64
+
+# ONNX Runtime session tuning profiles. intra_op_share is the fraction of CPU cores given to
+# each session's intra-op pool (1.0 lets ONNX Runtime pick), explicit thread counts in the
+# config still take precedence.
+SESSION_PROFILES = {
+    # Dedicated host, one request at a time: all cores, busy-wait between ops
+    "latency": {
+        "intra_op_share": 1.0,
+        "allow_spinning": True,
+        "enable_cpu_mem_arena": True,
+        "config_entries": {},
+    },
+    # Dedicated host, long batched renders: all cores, dynamic work splitting across threads
+    "throughput": {
+        "intra_op_share": 1.0,
+        "allow_spinning": True,
+        "enable_cpu_mem_arena": True,
+        "config_entries": {"session.dynamic_block_base": "4"},
+    },
+    # Host shared with other services (e.g. OCR): half the cores, no spinning, memory returned after runs
+    "shared_host": {
+        "intra_op_share": 0.5,
+        "allow_spinning": False,
+        "enable_cpu_mem_arena": False,
+        "config_entries": {},
+    },
+}
+
 
 @dataclass
 class ModelConfig:
@@ -25,6 +67,8 @@ class ModelConfig:
     model_url: str = "https://huggingface.co/nguyenvulebinh/VietVoice-TTS/resolve/main/model-bin.pt"
     model_cache_dir: str = "~/.cache/vietvoicetts"
     model_filename: str = "model-bin.pt"
+    precision: str = "fp32"  # One of PRECISIONS
+    verify_model_checksums: bool = False  # Re-hash extracted model files on every load (sizes are always checked)
     nfe_step: int = 32
     fuse_nfe: int = 1
     sample_rate: int = 24000
@@ -32,6 +76,8 @@ class ModelConfig:
     random_seed: int = 9527
     hop_length: int = 256
     
+    preload_samples: bool = False  # Decode every built-in reference sample at load instead of on first use
+    
     # Text processing
     pause_punctuation: str = r".,?!:"
     
@@ -39,6 +85,20 @@ class ModelConfig:
     cross_fade_duration: float = 0.1  # Duration in seconds for cross-fading between chunks
     max_chunk_duration: float = 15.0  # Maximum duration in seconds for each chunk
     min_target_duration: float = 1.0  # Minimum duration in seconds for target audio
+    duration_model: bool = False  # Size chunks with the per-voice duration models from `calibrate`, when present (opt-in)
+    duration_headroom: float = 0.1  # Extra fraction of the calibrated duration allocated on top
+    chunk_buckets: int = 0  # Fixed chunk lengths the chunk planner packs long texts into; budgets use them only when batching (0 = legacy greedy chunk_text)
+    
+    # Batching
+    max_batch_size: int = 1  # Number of chunks pushed through the transformer together (1 disables batching)
+    batch_frame_step: int = 16  # synthesize_batch rounds frame budgets up to a multiple of this, so similar texts share a shape
+    parallel_sessions: int = 1  # Independent session sets synthesizing the chunks of one text concurrently (1 = sequential)
+    pipelined: bool = False  # Overlap preprocess, transformer and decode of consecutive chunks on three threads
+    pipeline_queue_size: int = 2  # Chunks that may wait between two pipeline stages
+    
+    # Chunk cache
+    chunk_cache_dir: Optional[str] = None  # Directory for decoded chunk waveforms (None disables the cache)
+    chunk_cache_max_mb: int = 1024  # Size cap of the chunk cache in megabytes
     
     # ONNX Runtime settings
     log_severity_level: int = 4
@@ -46,9 +106,29 @@ class ModelConfig:
     inter_op_num_threads: int = 0
     intra_op_num_threads: int = 0
     enable_cpu_mem_arena: bool = True
+    session_profile: Optional[str] = None  # One of SESSION_PROFILES (None keeps the settings above)
+    use_io_binding: bool = False  # Keep transformer loop tensors in preallocated OrtValues
+    use_gpu: bool = True  # Use CUDAExecutionProvider when onnxruntime has it (False pins the sessions to the CPU)
+    cache_optimized_models: bool = True  # Save ORT-optimized graphs under model_cache_dir and reuse them on later starts
 
     def __post_init__(self):
         """Post-initialization validation"""
+        if self.max_batch_size < 1:
+            raise ValueError(f"max_batch_size must be >= 1, got {self.max_batch_size}")
+        if self.batch_frame_step < 1:
+            raise ValueError(f"batch_frame_step must be >= 1, got {self.batch_frame_step}")
+        if self.duration_headroom < 0:
+            raise ValueError(f"duration_headroom must be >= 0, got {self.duration_headroom}")
+        if self.chunk_buckets < 0:
+            raise ValueError(f"chunk_buckets must be >= 0, got {self.chunk_buckets}")
+        if self.parallel_sessions < 1:
+            raise ValueError(f"parallel_sessions must be >= 1, got {self.parallel_sessions}")
+        if self.pipeline_queue_size < 1:
+            raise ValueError(f"pipeline_queue_size must be >= 1, got {self.pipeline_queue_size}")
+        if self.precision not in PRECISIONS:
+            raise ValueError(f"Invalid precision: {self.precision}. Must be one of {PRECISIONS}")
+        if self.session_profile is not None and self.session_profile not in SESSION_PROFILES:
+            raise ValueError(f"Invalid session_profile: {self.session_profile}. Must be one of {list(SESSION_PROFILES)}")
         self.validate_paths()
     
     @property
@@ -57,6 +137,12 @@ class ModelConfig:
         cache_dir = Path(self.model_cache_dir).expanduser()
         return str(cache_dir / self.model_filename)
     
+    def variant_dir(self, precision: Optional[str] = None) -> str:
+        """Directory holding the converted ONNX models of a precision variant"""
+        precision = precision or self.precision
+        cache_dir = Path(self.model_cache_dir).expanduser()
+        return str(cache_dir / "variants" / f"{Path(self.model_filename).stem}-{precision}")
+    
     def ensure_model_downloaded(self) -> str:
         """Ensure model is downloaded and cached, return path to model file"""
         model_path = Path(self.model_path)
@@ -129,6 +215,18 @@ class ModelConfig:
             print(f"❌ Error validating reference audio: {e}")
             return False
     
+    def resolve_nfe_step(self, quality: Optional[str] = None, nfe_step: Optional[int] = None) -> int:
+        """Number of NFE steps for a request: explicit steps, then quality tier, then config default"""
+        if nfe_step is not None:
+            if not 2 <= nfe_step <= MAX_NFE_STEP:
+                raise ValueError(f"nfe_step must be between 2 and {MAX_NFE_STEP}, got {nfe_step}")
+            return nfe_step
+        if quality is not None:
+            if quality not in QUALITY_TIERS:
+                raise ValueError(f"Invalid quality: {quality}. Must be one of {list(QUALITY_TIERS)}")
+            return QUALITY_TIERS[quality]
+        return self.nfe_step
+    
     @classmethod
     def from_dict(cls, config_dict: dict) -> "ModelConfig":
         """Create config from dictionary"""
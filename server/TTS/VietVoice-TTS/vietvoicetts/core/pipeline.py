@@ -0,0 +1,181 @@
+"""
+Pipelined chunk synthesis: preprocess, transformer and decode of consecutive chunks overlap
+"""
+
+import queue
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Callable, Dict, Generator, Optional, Sequence, Tuple
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from .tts_engine import TTSEngine
+
+
+STAGES = ("preprocess", "transformer", "decode")
+
+# Marks the end of a stage's output; errors travel down the queues as _Failure
+_DONE = object()
+# How often blocked stages check whether the run was abandoned, in seconds
+_POLL_INTERVAL = 0.1
+
+
+@dataclass
+class _Failure:
+    error: BaseException
+
+
+@dataclass
+class StageStats:
+    """Time one stage spent computing and waiting on its neighbours"""
+
+    busy: float = 0.0  # seconds running its model
+    starved: float = 0.0  # seconds waiting for input from the previous stage
+    blocked: float = 0.0  # seconds waiting for room in the queue to the next stage
+    chunks: int = 0
+
+
+@dataclass
+class PipelineStats:
+    """Per-stage utilisation of pipelined runs, summed over every run recorded"""
+
+    stages: Dict[str, StageStats] = field(default_factory=lambda: {name: StageStats() for name in STAGES})
+    wall: float = 0.0  # seconds from the first chunk entering to the last one leaving
+    runs: int = 0
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+
+    def utilisation(self) -> Dict[str, float]:
+        """Fraction of the wall time each stage was busy"""
+        return {name: (stats.busy / self.wall if self.wall else 0.0) for name, stats in self.stages.items()}
+
+    def add(self, other: "PipelineStats") -> None:
+        with self._lock:
+            for name, stats in other.stages.items():
+                total = self.stages[name]
+                total.busy += stats.busy
+                total.starved += stats.starved
+                total.blocked += stats.blocked
+                total.chunks += stats.chunks
+            self.wall += other.wall
+            self.runs += other.runs
+
+    def summary(self) -> str:
+        busy = ", ".join(f"{name} {share:.0%}" for name, share in self.utilisation().items())
+        return f"{self.stages['decode'].chunks} chunks in {self.wall:.2f}s, stage utilisation: {busy}"
+
+    def as_dict(self) -> dict:
+        with self._lock:
+            return {
+                "runs": self.runs,
+                "wallSeconds": self.wall,
+                "stages": {
+                    name: {"busySeconds": stats.busy, "starvedSeconds": stats.starved,
+                           "blockedSeconds": stats.blocked, "chunks": stats.chunks,
+                           "utilisation": stats.busy / self.wall if self.wall else 0.0}
+                    for name, stats in self.stages.items()
+                },
+            }
+
+
+class ChunkPipeline:
+    """Run the three models of consecutive chunks on three threads joined by bounded queues
+
+    While chunk i is in the transformer loop, chunk i+1 is preprocessed and chunk
+    i-1 decoded. Each stage handles the chunks in order, so the waves come out in
+    input order and the preprocess noise is drawn in the same sequence as a
+    sequential run. At most queue_size chunks wait between two stages.
+    """
+
+    def __init__(self, engine: "TTSEngine", nfe_step: Optional[int] = None, queue_size: int = 2):
+        self.engine = engine
+        self.nfe_step = nfe_step
+        self.queue_size = queue_size
+        self.stats = PipelineStats(runs=1)
+
+    def _preprocess(self, inputs: Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]) -> tuple:
+        audio, text_ids, max_duration, time_step = inputs
+        return tuple(self.engine._run_preprocess(audio, text_ids, max_duration)), time_step, audio
+
+    def _transformer(self, item: tuple) -> tuple:
+        (noise, rope_cos_q, rope_sin_q, rope_cos_k, rope_sin_k,
+         cat_mel_text, cat_mel_text_drop, ref_signal_len), time_step, audio = item
+        noise, _ = self.engine._run_transformer_steps(
+            noise, rope_cos_q, rope_sin_q, rope_cos_k, rope_sin_k,
+            cat_mel_text, cat_mel_text_drop, time_step, self.nfe_step
+        )
+        return noise, ref_signal_len, audio
+
+    def _decode(self, item: tuple) -> np.ndarray:
+        noise, ref_signal_len, audio = item
+        return self.engine._trim_wave(self.engine._run_decode(noise, ref_signal_len), audio)
+
+    def run(self, inputs_list: Sequence[Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]]
+            ) -> Generator[np.ndarray, None, None]:
+        """Yield the wave of every chunk, in input order, as soon as it is decoded
+
+        Closing the generator early stops the stage threads after their current chunk.
+        """
+        stop = threading.Event()
+        queues = [queue.Queue(maxsize=self.queue_size) for _ in STAGES]
+
+        def _put(target: queue.Queue, item, stats: StageStats) -> None:
+            started = time.perf_counter()
+            while not stop.is_set():
+                try:
+                    target.put(item, timeout=_POLL_INTERVAL)
+                    break
+                except queue.Full:
+                    continue
+            stats.blocked += time.perf_counter() - started
+
+        def _stage(name: str, work: Callable, source, target: queue.Queue) -> None:
+            stats = self.stats.stages[name]
+            try:
+                while not stop.is_set():
+                    started = time.perf_counter()
+                    if isinstance(source, queue.Queue):
+                        try:
+                            item = source.get(timeout=_POLL_INTERVAL)
+                        except queue.Empty:
+                            stats.starved += time.perf_counter() - started
+                            continue
+                    else:
+                        item = next(source, _DONE)
+                    stats.starved += time.perf_counter() - started
+                    if item is _DONE or isinstance(item, _Failure):
+                        _put(target, item, stats)
+                        return
+                    started = time.perf_counter()
+                    result = work(item)
+                    stats.busy += time.perf_counter() - started
+                    stats.chunks += 1
+                    _put(target, result, stats)
+            except BaseException as e:
+                _put(target, _Failure(e), stats)
+
+        sources = [iter(inputs_list)] + queues[:-1]
+        works = [self._preprocess, self._transformer, self._decode]
+        threads = [
+            threading.Thread(target=_stage, args=(name, work, source, target),
+                             name=f"tts-{name}", daemon=True)
+            for name, work, source, target in zip(STAGES, works, sources, queues)
+        ]
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        try:
+            while True:
+                item = queues[-1].get()
+                if item is _DONE:
+                    break
+                if isinstance(item, _Failure):
+                    raise item.error
+                yield item
+        finally:
+            stop.set()
+            for thread in threads:
+                thread.join()
+            self.stats.wall = time.perf_counter() - started
+
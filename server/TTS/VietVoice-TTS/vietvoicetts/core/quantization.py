@@ -0,0 +1,122 @@
+"""
+Offline conversion of the VietVoice ONNX models to reduced-precision variants
+"""
+
+import shutil
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, Optional
+
+import numpy as np
+
+from .model import ModelSessionManager
+from .model_config import ModelConfig, MODEL_FILES, PRECISIONS
+
+
+def _model_size(path: Path) -> int:
+    """Size of an ONNX graph including its external weight file, if any"""
+    external = path.with_name(f"{path.name}.data")
+    return path.stat().st_size + (external.stat().st_size if external.exists() else 0)
+
+
+def _quantize_int8(source: str, target: str) -> None:
+    try:
+        from onnxruntime.quantization import QuantType, quantize_dynamic
+    except ImportError as e:
+        raise RuntimeError(f"INT8 conversion requires the 'onnx' package: {e}")
+    # Dynamic quantization: int8 weights, activations quantized per run, no calibration data needed
+    quantize_dynamic(source, target, weight_type=QuantType.QInt8)
+
+
+def _convert_fp16(source: str, target: str) -> None:
+    try:
+        import onnx
+        from onnxconverter_common import float16
+    except ImportError as e:
+        raise RuntimeError(f"FP16 conversion requires the 'onnx' and 'onnxconverter-common' packages: {e}")
+    model = onnx.load(source)
+    # Inputs and outputs stay float32 so the engine feeds the same arrays
+    model = float16.convert_float_to_float16(model, keep_io_types=True)
+    onnx.save(model, target)
+
+
+def convert_model_variants(config: ModelConfig, precision: str, force: bool = False) -> Dict[str, str]:
+    """Write the precision variant of the three sessions into the model cache
+
+    Returns:
+        Mapping of session name to the converted ONNX file
+    """
+    if precision not in PRECISIONS or precision == "fp32":
+        raise ValueError(f"Invalid precision for conversion: {precision}. Must be one of {PRECISIONS[1:]}")
+
+    variant_dir = Path(config.variant_dir(precision))
+    targets = {name: str(variant_dir / filename) for name, filename in MODEL_FILES.items()}
+    if not force and all(Path(path).exists() for path in targets.values()):
+        print(f"Using existing {precision} models in {variant_dir}")
+        return targets
+
+    convert = _quantize_int8 if precision == "int8" else _convert_fp16
+    model_dir = ModelSessionManager(config).ensure_models_extracted()
+    variant_dir.mkdir(parents=True, exist_ok=True)
+    work_dir = tempfile.mkdtemp(prefix="tts_convert_", dir=variant_dir.parent)
+    try:
+        for model_name, filename in MODEL_FILES.items():
+            source = model_dir / filename
+            start = time.perf_counter()
+            tmp_target = str(Path(work_dir) / f"{model_name}.{precision}.onnx")
+            convert(str(source), tmp_target)
+            Path(tmp_target).replace(targets[model_name])
+            source_mb = _model_size(source) / 2**20
+            target_mb = Path(targets[model_name]).stat().st_size / 2**20
+            print(f"{model_name}: {source_mb:.1f} MB -> {target_mb:.1f} MB ({precision}) in {time.perf_counter() - start:.1f}s")
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+    return targets
+
+
+def check_variant_quality(config: ModelConfig, precision: str,
+                          text: str = "Xin chào các bạn! Đây là ví dụ cơ bản về tổng hợp giọng nói tiếng Việt.",
+                          gender: Optional[str] = "female") -> Dict[str, float]:
+    """Compare a precision variant against the FP32 models on one chunk
+
+    Both engines start the flow from the same FP32 noise, so the difference is
+    the precision error alone.
+
+    Returns:
+        Dict with mel_error (relative L2 of the transformer output), waveform_snr_db,
+        and the transformer loop time of each precision
+    """
+    from dataclasses import replace
+    from .tts_engine import TTSEngine
+
+    reference = TTSEngine(replace(config, precision="fp32"))
+    variant = TTSEngine(replace(config, precision=precision))
+    try:
+        ref_audio, ref_text = reference.model_session_manager.select_sample(gender=gender)
+        audio, text_ids, max_duration, time_step = reference._prepare_inputs(ref_audio, ref_text, text)[0]
+
+        results = {}
+        outputs = {}
+        for name, engine in (("fp32", reference), (precision, variant)):
+            noise, *conditioning, ref_signal_len = engine._run_preprocess(audio, text_ids, max_duration)
+            if name != "fp32":
+                noise = outputs["fp32"][2]
+            start = time.perf_counter()
+            mel, _ = engine._run_transformer_steps(noise, *conditioning, time_step)
+            results[f"{name}_transformer_seconds"] = time.perf_counter() - start
+            wave = engine._run_decode(mel, ref_signal_len).astype(np.float64).reshape(-1)
+            outputs[name] = (mel.astype(np.float64), wave, noise)
+
+        ref_mel, ref_wave, _ = outputs["fp32"]
+        mel, wave, _ = outputs[precision]
+        results["mel_error"] = float(np.linalg.norm(mel - ref_mel) / max(np.linalg.norm(ref_mel), 1e-12))
+        n = min(len(wave), len(ref_wave))
+        noise_power = float(np.sum((wave[:n] - ref_wave[:n]) ** 2))
+        signal_power = float(np.sum(ref_wave[:n] ** 2))
+        results["waveform_snr_db"] = float(10 * np.log10(signal_power / noise_power)) if noise_power > 0 else float("inf")
+        results["speedup"] = results["fp32_transformer_seconds"] / max(results[f"{precision}_transformer_seconds"], 1e-12)
+        return results
+    finally:
+        reference.cleanup()
+        variant.cleanup()
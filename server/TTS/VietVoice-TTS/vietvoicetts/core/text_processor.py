@@ -7,6 +7,34 @@ import numpy as np
 from pathlib import Path
 from typing import List, Dict
 
+from .chunk_planner import SENTENCE_BREAK, ChunkPlan, plan_chunks
+
+# only keep readable characters in alphabet, vietnamese characters, space, punctuation
+ALPHABET_CHARS = "abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789"
+VIETNAMESE_CHARS = "àáảãạăằắẳẵặâầấẩẫậèéẻẽẹêềếểễệđìíỉĩịòóỏõọôồốổỗộơờớởỡợùúủũụưừứửữựỳỵỷỹýỳỵỷỹ"
+PUNCTUATION_CHARS = " .,!?'@$%&/:;()"
+
+# Runs collapsed to a single character by clean_text. After translation the only
+# whitespace left is " ", and plain str.replace beats a regex scan on non-ASCII text
+_COLLAPSED_RUNS = (("..", "."), (",,", ","), ("  ", " "))
+
+
+class _CleanTable(dict):
+    """str.translate table of clean_text: invalid characters become spaces and ;:() commas
+    
+    The set of characters outside the allowed set is open-ended, so entries for them
+    are added on first sight instead of up front.
+    """
+    
+    def __init__(self, valid_chars: str):
+        super().__init__({ord(char): char for char in valid_chars})
+        self.update({ord(char): "," for char in ";:()"})
+    
+    def __missing__(self, code: int) -> str:
+        # Threads racing on a new character all store the same value, so no lock is needed
+        self[code] = " "
+        return " "
+
 
 class TextProcessor:
     """Handles text processing operations"""
@@ -14,6 +42,10 @@ class TextProcessor:
     def __init__(self, vocab_path: str):
         self.vocab_char_map = self._load_vocab(vocab_path)
         self.vocab_size = len(self.vocab_char_map)
+        valid_chars = (ALPHABET_CHARS + ALPHABET_CHARS.upper() + VIETNAMESE_CHARS +
+                       VIETNAMESE_CHARS.upper() + PUNCTUATION_CHARS)
+        self._clean_table = _CleanTable(valid_chars)
+        self._pause_patterns: Dict[str, re.Pattern] = {}
     
     def _load_vocab(self, vocab_path: str) -> Dict[str, int]:
         """Load vocabulary mapping from file"""
@@ -36,19 +68,17 @@ class TextProcessor:
         return np.stack(list_idx_tensors, axis=0)
     
     def calculate_text_length(self, text: str, pause_punc: str) -> int:
-        """Calculate text length including pause punctuation weighting"""
-        return len(text.encode('utf-8')) + 3 * len(re.findall(pause_punc, text))
+        """Calculate text length including pause punctuation weighting
+        
+        pause_punc is a regular expression; it is compiled once per distinct value.
+        """
+        pattern = self._pause_patterns.get(pause_punc)
+        if pattern is None:
+            pattern = self._pause_patterns.setdefault(pause_punc, re.compile(pause_punc))
+        return len(text.encode('utf-8')) + 3 * len(pattern.findall(text))
     
     def clean_text(self, text: str) -> str:
         """Clean text to keep only readable characters"""
-        # only keep readable characters in alphabet, vietnamese characters, space, punctuation
-        alphabet_chars = "abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789"
-        vietnamese_chars = "àáảãạăằắẳẵặâầấẩẫậèéẻẽẹêềếểễệđìíỉĩịòóỏõọôồốổỗộơờớởỡợùúủũụưừứửữựỳỵỷỹýỳỵỷỹ"
-        punctuation_chars = " .,!?'@$%&/:;()"
-        all_valid_chars = alphabet_chars + alphabet_chars.upper() + vietnamese_chars + vietnamese_chars.upper() + punctuation_chars
-        all_valid_chars = list(set(all_valid_chars))
-        
-        # replace all invalid characters with space using all_valid_chars and regex
         if "\n" in text:
             chunks = [chunk.strip() for chunk in text.split("\n") if chunk.strip()]
             for idx, chunk in enumerate(chunks):
@@ -56,15 +86,13 @@ class TextProcessor:
                     chunks[idx] = chunk.strip() + "."
             text = " ".join(chunks)
 
-        text = re.sub(f"[^{''.join(all_valid_chars)}]", " ", text)
-        text = text.strip()
-        # replace ;:() with ,
-        text = re.sub(r'[;:()]', ',', text)
+        # replace all invalid characters with space and ;:() with , in one pass
+        text = text.translate(self._clean_table).strip()
         
-        # make sure no duplicate ,.
-        text = re.sub(r'\.+', '.', text)
-        text = re.sub(r',+', ',', text)
-        text = re.sub(r'\s+', ' ', text)
+        # make sure no duplicate ,. or spaces
+        for run, single in _COLLAPSED_RUNS:
+            while run in text:
+                text = text.replace(run, single)
         
         # Append . at the end of the text if it doesn't end with . or ? or ! or ,
         if not text.endswith(('.', '?', '!', ',')):
@@ -72,13 +100,21 @@ class TextProcessor:
         
         return text
     
+    def plan_chunks(self, text: str, max_length: int, pause_punc: str, bucket_count: int = 4) -> ChunkPlan:
+        """Split text into the fewest chunks of at most max_length, sized to a few fixed buckets
+        
+        Lengths are weighted like calculate_text_length, so max_length maps directly to a
+        duration budget. See chunk_planner.plan_chunks.
+        """
+        return plan_chunks(text, max_length, lambda piece: self.calculate_text_length(piece, pause_punc), bucket_count)
+    
     def chunk_text(self, text: str, max_chars: int = 135) -> List[str]:
         """Split text into chunks with maximum character limit"""
         # Split text into sentences
         sentences = []
         
         # Split by .?!
-        for s in re.split(r'(?<=[.!?]) +', text.strip()):
+        for s in SENTENCE_BREAK.split(text.strip()):
             s = s.strip()
             if s:            
                 if len(s) < max_chars:
@@ -2,20 +2,71 @@
 TTS Engine - Main speech synthesis engine
 """
 
+import copy
+import hashlib
+import logging
+import random
+import threading
 import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
 import numpy as np
-import torch
-from typing import List, Tuple, Optional, Generator
+import onnxruntime
+from typing import List, Tuple, Optional, Generator, Union
 from tqdm import tqdm
 
 from .model_config import ModelConfig
 from .model import ModelSessionManager
 from .text_processor import TextProcessor
 from .audio_processor import AudioProcessor
+from .chunk_cache import ChunkCache
+from .duration_model import DurationModels
+from .pipeline import ChunkPipeline, PipelineStats
+
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class ReferencePrefix:
+    """Reference-side inputs shared by every chunk synthesized with one voice sample"""
+    
+    audio: np.ndarray  # (1, 1, samples) int16 reference audio
+    text: str  # cleaned reference text
+    text_ids: np.ndarray  # vocabulary ids of the cleaned reference text
+    audio_len: int  # reference length in mel frames
+    duration: float  # reference length in seconds
+    speaking_rate: float  # weighted characters per second
+    digest: str  # content hash of the reference audio
+
+
+@dataclass
+class _BindingScratch:
+    """IO binding and ping-pong buffers of the transformer loop, owned by one thread"""
+    
+    key: tuple  # (device, noise shape and dtype, time_step shape and dtype) the buffers were allocated for
+    binding: onnxruntime.IOBinding
+    noise: List[onnxruntime.OrtValue]
+    time_step: List[onnxruntime.OrtValue]
 
 
 class TTSEngine:
-    """Main TTS engine for inference"""
+    """Main TTS engine for inference
+    
+    One engine serves concurrent synthesize calls from several threads. The ONNX
+    sessions are only read (InferenceSession.run is thread-safe), the shared caches
+    are guarded by a lock, every call draws its voice from its own random generator
+    and the transformer scratch buffers belong to the thread that uses them.
+    """
+    
+    # Number of reference prefixes kept in memory
+    REFERENCE_CACHE_SIZE = 64
+    # Silence kept after the speech when trimming a chunk, on top of the cross-fade
+    TRAILING_SILENCE_KEEP = 0.15
+    # Shortest target duration a duration model may allocate, in seconds
+    MIN_CALIBRATED_DURATION = 0.3
     
     def __init__(self, config: Optional[ModelConfig] = None):
         self.config = config or ModelConfig()
@@ -28,9 +79,43 @@ class TTSEngine:
         self.text_processor = TextProcessor(self.model_session_manager.vocab_path)
         self.audio_processor = AudioProcessor()
         self.sample_cache = {}
+        self.reference_cache: "OrderedDict[tuple, ReferencePrefix]" = OrderedDict()
+        self._cache_lock = threading.Lock()  # Guards sample_cache and reference_cache
+        self.use_io_binding = self.config.use_io_binding
+        self._scratch = threading.local()
+        self.pipeline_stats = PipelineStats()  # Stage utilisation summed over every pipelined run
+        self.duration_models = DurationModels.load(self.config) if self.config.duration_model else DurationModels()
+        self.chunk_cache = None
+        if self.config.chunk_cache_dir:
+            self.chunk_cache = ChunkCache(self.config.chunk_cache_dir, self.config.chunk_cache_max_mb * 1024 * 1024)
+        
+        # Extra session sets for scatter/gather synthesis of one text
+        self.replicas: List["TTSEngine"] = []
+        self.chunk_executor: Optional[ThreadPoolExecutor] = None
+        if self.config.parallel_sessions > 1:
+            self.replicas = [self._make_replica() for _ in range(self.config.parallel_sessions - 1)]
+            self.chunk_executor = ThreadPoolExecutor(max_workers=self.config.parallel_sessions,
+                                                     thread_name_prefix="tts-chunk")
+    
+    def _make_replica(self) -> "TTSEngine":
+        """Engine with its own ONNX sessions that shares this engine's processors and caches"""
+        replica = copy.copy(self)
+        # load_models re-applies random_seed, so every session set starts from the same RNG state
+        replica.model_session_manager = ModelSessionManager(self.config)
+        replica.model_session_manager.load_models()
+        replica._scratch = threading.local()
+        replica.replicas = []
+        replica.chunk_executor = None
+        return replica
     
     def cleanup(self) -> None:
         """Clean up resources"""
+        if self.chunk_executor is not None:
+            self.chunk_executor.shutdown(wait=True)
+            self.chunk_executor = None
+        for replica in self.replicas:
+            replica.model_session_manager.cleanup()
+        self.replicas = []
         if self.model_session_manager:
             self.model_session_manager.cleanup()
     
@@ -40,24 +125,127 @@ class TTSEngine:
     def __exit__(self, exc_type, exc_val, exc_tb):
         self.cleanup()
     
-    def _prepare_inputs(self, reference_audio_path_or_bytes: str, reference_text: str, 
-                       target_text: str) -> List[Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]]:
-        """Prepare all inputs for inference, handling text chunking if needed"""
-        audio = self.audio_processor.load_audio(reference_audio_path_or_bytes, self.config.sample_rate)
-        audio = audio.reshape(1, 1, -1)
-
-        # Clean text
-        reference_text = self.text_processor.clean_text(reference_text)
-        target_text = self.text_processor.clean_text(target_text)
+    def _load_reference_audio(self, reference_audio: Union[str, bytes, np.ndarray]) -> np.ndarray:
+        """Decode reference audio, reusing earlier decodes of the same reference file"""
+        if isinstance(reference_audio, np.ndarray):
+            return reference_audio
+        if isinstance(reference_audio, bytes):
+            return self.audio_processor.load_audio(reference_audio, self.config.sample_rate)
+        
+        stat = Path(reference_audio).stat()
+        cache_key = (str(Path(reference_audio).resolve()), stat.st_mtime_ns, stat.st_size, self.config.sample_rate)
+        audio = self.sample_cache.get(cache_key)
+        if audio is None:
+            audio = self.audio_processor.load_audio(reference_audio, self.config.sample_rate)
+            audio.setflags(write=False)
+            with self._cache_lock:
+                # Another thread may have decoded the same file meanwhile; keep the first copy
+                audio = self.sample_cache.setdefault(cache_key, audio)
+        return audio
+    
+    def _reference_cache_key(self, reference_audio: Union[str, bytes, np.ndarray], reference_text: str) -> tuple:
+        """Cheap identity of a reference sample (no hashing of the audio itself)"""
+        if isinstance(reference_audio, np.ndarray):
+            # prefix.audio is a view of this array, so a cached prefix keeps it alive and its id unique
+            audio_key = ("array", id(reference_audio), reference_audio.shape)
+        elif isinstance(reference_audio, bytes):
+            audio_key = ("bytes", hashlib.sha256(reference_audio).hexdigest())
+        else:
+            stat = Path(reference_audio).stat()
+            audio_key = ("file", str(Path(reference_audio).resolve()), stat.st_mtime_ns, stat.st_size)
+        return (audio_key, reference_text, self.config.sample_rate, self.config.hop_length, self.config.pause_punctuation)
+    
+    def _reference_prefix(self, reference_audio: Union[str, bytes, np.ndarray], reference_text: str) -> ReferencePrefix:
+        """Compute (or reuse) the reference-side inputs for a voice sample"""
+        cache_key = self._reference_cache_key(reference_audio, reference_text)
+        with self._cache_lock:
+            prefix = self.reference_cache.get(cache_key)
+            if prefix is not None:
+                self.reference_cache.move_to_end(cache_key)
+                return prefix
+        
+        audio = self._load_reference_audio(reference_audio).reshape(1, 1, -1)
+        cleaned_text = self.text_processor.clean_text(reference_text)
         
         # Calculate reference audio duration and text length
-        ref_text_len = self.text_processor.calculate_text_length(reference_text, self.config.pause_punctuation)
-        ref_audio_len = audio.shape[-1] // self.config.hop_length + 1
+        ref_text_len = self.text_processor.calculate_text_length(cleaned_text, self.config.pause_punctuation)
         ref_audio_duration = audio.shape[-1] / self.config.sample_rate
         
         # Estimate speaking rate (characters per second)
         speaking_rate = ref_text_len / ref_audio_duration if ref_audio_duration > 0 else 100
         
+        text_ids = self.text_processor.text_to_indices([list(cleaned_text)])[0]
+        text_ids.setflags(write=False)
+        
+        prefix = ReferencePrefix(
+            audio=audio,
+            text=cleaned_text,
+            text_ids=text_ids,
+            audio_len=audio.shape[-1] // self.config.hop_length + 1,
+            duration=ref_audio_duration,
+            speaking_rate=speaking_rate,
+            digest=self._reference_digest(audio),
+        )
+        with self._cache_lock:
+            self.reference_cache[cache_key] = prefix
+            while len(self.reference_cache) > self.REFERENCE_CACHE_SIZE:
+                self.reference_cache.popitem(last=False)
+        return prefix
+    
+    def _greedy_chunks(self, target_text: str, max_chars_per_chunk: int, speaking_rate: float,
+                       ref_audio_duration: float, available_target_duration: float) -> Tuple[List[str], List[int]]:
+        """Legacy chunking: greedy chunk_text, re-splitting chunks that overshoot max_chunk_duration
+        
+        Returns:
+            Tuple of (chunks, weighted text length of each chunk)
+        """
+        chunks = self.text_processor.chunk_text(target_text, max_chars=max_chars_per_chunk)
+        
+        # Post-process: verify each chunk meets duration requirements
+        # Lengths are measured once here and reused when building the inputs
+        final_chunks = []
+        chunk_lengths = []
+        for chunk in chunks:
+            chunk_text_len = self.text_processor.calculate_text_length(chunk, self.config.pause_punctuation)
+            chunk_target_duration = max(chunk_text_len / speaking_rate / self.config.speed, self.config.min_target_duration)
+            chunk_total_duration = ref_audio_duration + chunk_target_duration
+            
+            if chunk_total_duration <= self.config.max_chunk_duration:
+                final_chunks.append(chunk)
+                chunk_lengths.append(chunk_text_len)
+            else:
+                # Split this chunk further
+                print(f"Warning: Chunk too long ({chunk_total_duration:.1f}s), splitting further...")
+                # Calculate a smaller max_chars for this specific chunk
+                smaller_max_chars = int(len(chunk) * available_target_duration / chunk_target_duration * 0.9)  # 90% safety
+                sub_chunks = self.text_processor.chunk_text(chunk, max_chars=smaller_max_chars)
+                final_chunks.extend(sub_chunks)
+                chunk_lengths.extend(
+                    self.text_processor.calculate_text_length(sub_chunk, self.config.pause_punctuation)
+                    for sub_chunk in sub_chunks
+                )
+        
+        return final_chunks, chunk_lengths
+    
+    def _prepare_inputs(self, reference_audio: Union[str, bytes, np.ndarray], reference_text: str, 
+                       target_text: str, frame_step: int = 1,
+                       batched: bool = False) -> List[Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]]:
+        """Prepare all inputs for inference, handling text chunking if needed
+        
+        Target frame budgets are rounded up to a multiple of frame_step, so chunks of
+        similar length end up with the same shape and can share a transformer loop.
+        Planned chunks get the frame budget of their bucket only when batched, since
+        the model stretches speech to fill its budget.
+        """
+        prefix = self._reference_prefix(reference_audio, reference_text)
+        audio = prefix.audio
+        
+        target_text = self.text_processor.clean_text(target_text)
+        
+        ref_audio_len = prefix.audio_len
+        ref_audio_duration = prefix.duration
+        speaking_rate = prefix.speaking_rate
+        
         # Calculate total duration including reference audio
         target_text_len = self.text_processor.calculate_text_length(target_text, self.config.pause_punctuation)
         target_audio_duration = max(target_text_len / speaking_rate / self.config.speed, self.config.min_target_duration)
@@ -67,6 +255,7 @@ class TTSEngine:
         if total_estimated_duration <= self.config.max_chunk_duration:
             # Single chunk processing
             chunks = [target_text]
+            frame_lengths = [target_text_len]
             print(f"Single chunk: total estimated duration {total_estimated_duration:.1f}s (ref: {ref_audio_duration:.1f}s + target: {target_audio_duration:.1f}s)")
         else:
             # Multiple chunks needed
@@ -77,49 +266,47 @@ class TTSEngine:
             if available_target_duration <= 0:
                 raise ValueError(f"Reference audio duration ({ref_audio_duration:.1f}s) exceeds max chunk duration ({self.config.max_chunk_duration}s)")
             
-            # Calculate max characters per chunk based on available duration
-            max_chars_per_chunk = int(speaking_rate * available_target_duration * self.config.speed)
-            chunks = self.text_processor.chunk_text(target_text, max_chars=max_chars_per_chunk)
-            
-            # Post-process: verify each chunk meets duration requirements
-            final_chunks = []
-            for chunk in chunks:
-                chunk_text_len = self.text_processor.calculate_text_length(chunk, self.config.pause_punctuation)
-                chunk_target_duration = max(chunk_text_len / speaking_rate / self.config.speed, self.config.min_target_duration)
-                chunk_total_duration = ref_audio_duration + chunk_target_duration
-                
-                if chunk_total_duration <= self.config.max_chunk_duration:
-                    final_chunks.append(chunk)
-                else:
-                    # Split this chunk further
-                    print(f"Warning: Chunk too long ({chunk_total_duration:.1f}s), splitting further...")
-                    # Calculate a smaller max_chars for this specific chunk
-                    smaller_max_chars = int(len(chunk) * available_target_duration / chunk_target_duration * 0.9)  # 90% safety
-                    sub_chunks = self.text_processor.chunk_text(chunk, max_chars=smaller_max_chars)
-                    final_chunks.extend(sub_chunks)
-            
-            chunks = final_chunks
+            # Largest weighted text length that still fits the available duration
+            max_length = int(speaking_rate * available_target_duration * self.config.speed)
+            if self.config.chunk_buckets > 0:
+                plan = self.text_processor.plan_chunks(
+                    target_text, max_length, self.config.pause_punctuation, self.config.chunk_buckets
+                )
+                # Batched chunks of one bucket get the same frame budget, so they share a shape
+                chunks, frame_lengths = plan.chunks, plan.buckets if batched else plan.lengths
+                print(f"Chunk plan: {plan.summary()}")
+            else:
+                chunks, frame_lengths = self._greedy_chunks(target_text, max_length, speaking_rate, ref_audio_duration,
+                                                            available_target_duration)
             print(f"Long text detected (total estimated {total_estimated_duration:.1f}s), split into {len(chunks)} chunks")
             print(f"Reference audio: {ref_audio_duration:.1f}s, available per chunk: {available_target_duration:.1f}s (with {safety_margin}s safety margin)")
         
+        # Calibrated voices get the frames their speech actually needs, never more than the estimate above
+        duration_model = self.duration_models.get(prefix.digest)
+        estimated_frames = allocated_frames = 0
+        
         # Prepare inputs for each chunk
         inputs_list = []
-        for i, chunk in enumerate(chunks):
-            chunk_text_len = self.text_processor.calculate_text_length(chunk, self.config.pause_punctuation)
-            
+        for i, (chunk, frame_len) in enumerate(zip(chunks, frame_lengths)):
             # Calculate target duration with minimum enforcement
-            chunk_target_duration = max(chunk_text_len / speaking_rate / self.config.speed, self.config.min_target_duration)
+            chunk_target_duration = max(frame_len / speaking_rate / self.config.speed, self.config.min_target_duration)
+            if duration_model is not None:
+                estimated_frames += int(chunk_target_duration * self.config.sample_rate) // self.config.hop_length + 1
+                calibrated_duration = duration_model.seconds(frame_len) * (1 + self.config.duration_headroom) / self.config.speed
+                chunk_target_duration = min(chunk_target_duration, max(calibrated_duration, self.MIN_CALIBRATED_DURATION))
             
             # Calculate chunk_audio_len based on the enforced target duration
             # Convert target duration to audio length units
             target_audio_samples = int(chunk_target_duration * self.config.sample_rate)
             target_audio_len = target_audio_samples // self.config.hop_length + 1
+            target_audio_len = -(-target_audio_len // frame_step) * frame_step
             chunk_audio_len = ref_audio_len + target_audio_len
+            allocated_frames += target_audio_len
             
             max_duration = np.array([chunk_audio_len], dtype=np.int64)
             
-            combined_text = [list(reference_text + chunk)]
-            text_ids = self.text_processor.text_to_indices(combined_text)
+            chunk_ids = self.text_processor.text_to_indices([list(chunk)])[0]
+            text_ids = np.concatenate([prefix.text_ids, chunk_ids])[np.newaxis, :]
             time_step = np.array([0], dtype=np.int32)
             
             inputs_list.append((audio, text_ids, max_duration, time_step))
@@ -128,6 +315,11 @@ class TTSEngine:
             chunk_total_duration = ref_audio_duration + chunk_target_duration
             print(f"Chunk {i+1}/{len(chunks)}: {len(chunk)} chars, total duration {chunk_total_duration:.1f}s (ref: {ref_audio_duration:.1f}s + target: {chunk_target_duration:.1f}s). Content: {chunk}")
         
+        if duration_model is not None and estimated_frames:
+            saved = estimated_frames - allocated_frames
+            print(f"Duration model: {allocated_frames} target frames instead of {estimated_frames} "
+                  f"({saved} fewer, {saved / estimated_frames:.1%} less transformer work)")
+        
         return inputs_list
     
     def _run_preprocess(self, audio: np.ndarray, text_ids: np.ndarray, 
@@ -148,15 +340,32 @@ class TTSEngine:
     def _run_transformer_steps(self, noise: np.ndarray, rope_cos_q: np.ndarray,
                               rope_sin_q: np.ndarray, rope_cos_k: np.ndarray,
                               rope_sin_k: np.ndarray, cat_mel_text: np.ndarray,
-                              cat_mel_text_drop: np.ndarray, time_step: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+                              cat_mel_text_drop: np.ndarray, time_step: np.ndarray,
+                              nfe_step: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray]:
         """Run transformer model iteratively"""
+        nfe_step = nfe_step or self.config.nfe_step
+        if self.use_io_binding:
+            try:
+                return self._run_transformer_steps_bound(
+                    noise, rope_cos_q, rope_sin_q, rope_cos_k, rope_sin_k,
+                    cat_mel_text, cat_mel_text_drop, time_step, nfe_step
+                )
+            except (AttributeError, NotImplementedError) as e:
+                # This onnxruntime build or provider cannot bind OrtValues at all
+                logger.warning("IO binding is not supported (%s), using numpy inputs from now on", e)
+                self.use_io_binding = False
+            except Exception as e:
+                # Only this call falls back; later chunks (other shapes, other threads) try the bound loop again
+                logger.warning("IO binding failed (%s), falling back to numpy inputs for this chunk", e)
+                self._scratch.transformer = None
+        
         session = self.model_session_manager.sessions['transformer']
         input_names = self.model_session_manager.input_names['transformer']
         output_names = self.model_session_manager.output_names['transformer']
         
-        for i in tqdm(range(0, self.config.nfe_step - 1, self.config.fuse_nfe), 
+        for i in tqdm(range(0, nfe_step - 1, self.config.fuse_nfe), 
                       desc="Processing", 
-                      total=self.config.nfe_step // self.config.fuse_nfe - 1):
+                      total=nfe_step // self.config.fuse_nfe - 1):
             
             inputs = {
                 input_names[0]: noise,
@@ -173,6 +382,71 @@ class TTSEngine:
         
         return noise, time_step
     
+    def _binding_scratch(self, session: onnxruntime.InferenceSession, noise: np.ndarray,
+                         time_step: np.ndarray, device: str) -> _BindingScratch:
+        """This thread's IO binding and loop buffers, reallocated only when the shapes change"""
+        key = (device, noise.shape, noise.dtype, time_step.shape, time_step.dtype)
+        scratch = getattr(self._scratch, "transformer", None)
+        if scratch is None or scratch.key != key:
+            scratch = _BindingScratch(
+                key=key,
+                binding=session.io_binding(),
+                noise=[onnxruntime.OrtValue.ortvalue_from_shape_and_type(noise.shape, noise.dtype, device, 0)
+                       for _ in range(2)],
+                time_step=[onnxruntime.OrtValue.ortvalue_from_shape_and_type(time_step.shape, time_step.dtype, device, 0)
+                           for _ in range(2)],
+            )
+            self._scratch.transformer = scratch
+        return scratch
+    
+    def _run_transformer_steps_bound(self, noise: np.ndarray, rope_cos_q: np.ndarray,
+                                     rope_sin_q: np.ndarray, rope_cos_k: np.ndarray,
+                                     rope_sin_k: np.ndarray, cat_mel_text: np.ndarray,
+                                     cat_mel_text_drop: np.ndarray, time_step: np.ndarray,
+                                     nfe_step: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Run the transformer loop on preallocated OrtValues
+        
+        The rope and mel-text inputs are bound once for the whole loop. noise and
+        time_step ping-pong between two buffers each, so iterations neither copy
+        numpy arrays in nor allocate outputs. The buffers and the binding are kept
+        per thread and reused by later chunks of the same shape.
+        """
+        session = self.model_session_manager.sessions['transformer']
+        input_names = self.model_session_manager.input_names['transformer']
+        output_names = self.model_session_manager.output_names['transformer']
+        device = 'cuda' if session.get_providers()[0] == 'CUDAExecutionProvider' else 'cpu'
+        
+        scratch = self._binding_scratch(session, noise, time_step, device)
+        binding = scratch.binding
+        static_inputs = [rope_cos_q, rope_sin_q, rope_cos_k, rope_sin_k, cat_mel_text, cat_mel_text_drop]
+        # Keep references so the OrtValues outlive the loop
+        static_values = [onnxruntime.OrtValue.ortvalue_from_numpy(np.ascontiguousarray(value), device, 0)
+                         for value in static_inputs]
+        for name, value in zip(input_names[1:7], static_values):
+            binding.bind_ortvalue_input(name, value)
+        
+        # Outputs are written into the scratch buffers, so the caller's arrays are copied in
+        noise_buffers, time_step_buffers = scratch.noise, scratch.time_step
+        noise_buffers[0].update_inplace(np.ascontiguousarray(noise))
+        time_step_buffers[0].update_inplace(np.ascontiguousarray(time_step))
+        
+        current = 0
+        for i in tqdm(range(0, nfe_step - 1, self.config.fuse_nfe), 
+                      desc="Processing", 
+                      total=nfe_step // self.config.fuse_nfe - 1):
+            binding.bind_ortvalue_input(input_names[0], noise_buffers[current])
+            binding.bind_ortvalue_input(input_names[7], time_step_buffers[current])
+            binding.bind_ortvalue_output(output_names[0], noise_buffers[1 - current])
+            binding.bind_ortvalue_output(output_names[1], time_step_buffers[1 - current])
+            session.run_with_iobinding(binding)
+            current = 1 - current
+        
+        noise, time_step = noise_buffers[current].numpy(), time_step_buffers[current].numpy()
+        if device == 'cpu':
+            # On CPU these alias the scratch buffers, which the next chunk on this thread overwrites
+            noise, time_step = noise.copy(), time_step.copy()
+        return noise, time_step
+    
     def _run_decode(self, noise: np.ndarray, ref_signal_len: np.ndarray) -> np.ndarray:
         """Run decode model to generate final audio"""
         session = self.model_session_manager.sessions['decode']
@@ -186,6 +460,202 @@ class TTSEngine:
         
         return session.run(output_names, inputs)[0]
     
+    def _audio_digest(self, audio: np.ndarray) -> str:
+        """Content hash of reference audio, taken from its cached prefix when there is one"""
+        with self._cache_lock:
+            for prefix in self.reference_cache.values():
+                if prefix.audio is audio:
+                    return prefix.digest
+        return self._reference_digest(audio)
+    
+    def _trim_wave(self, wave: np.ndarray, audio: np.ndarray) -> np.ndarray:
+        """Cut the silence a calibrated, still over-estimated frame budget leaves after the speech
+        
+        Only chunks of a voice with a duration model are trimmed; the frame budget of
+        any other voice is the plain estimate, whose trailing pause is left alone.
+        """
+        if not len(self.duration_models) or self.duration_models.get(self._audio_digest(audio)) is None:
+            return wave
+        keep = int((self.config.cross_fade_duration + self.TRAILING_SILENCE_KEEP) * self.config.sample_rate)
+        return self.audio_processor.trim_trailing_silence(wave, keep)
+    
+    def _generate_chunk(self, audio: np.ndarray, text_ids: np.ndarray,
+                        max_duration: np.ndarray, time_step: np.ndarray,
+                        nfe_step: Optional[int] = None) -> np.ndarray:
+        """Run preprocess, transformer and decode for a single chunk"""
+        preprocess_outputs = self._run_preprocess(audio, text_ids, max_duration)
+        (noise, rope_cos_q, rope_sin_q, rope_cos_k, rope_sin_k, 
+         cat_mel_text, cat_mel_text_drop, ref_signal_len) = preprocess_outputs
+        
+        noise, time_step = self._run_transformer_steps(
+            noise, rope_cos_q, rope_sin_q, rope_cos_k, rope_sin_k,
+            cat_mel_text, cat_mel_text_drop, time_step, nfe_step
+        )
+        
+        return self._trim_wave(self._run_decode(noise, ref_signal_len), audio)
+    
+    @staticmethod
+    def _reference_digest(reference_audio: Union[str, bytes, np.ndarray]) -> str:
+        """Content hash of the reference audio used for a synthesis"""
+        if isinstance(reference_audio, str):
+            reference_audio = Path(reference_audio).read_bytes()
+        elif isinstance(reference_audio, np.ndarray):
+            reference_audio = reference_audio.tobytes()
+        return hashlib.sha256(reference_audio).hexdigest()
+    
+    def _chunk_cache_keys(self, reference_digest: str,
+                          inputs_list: List[Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]],
+                          nfe_step: Optional[int] = None) -> Optional[List[str]]:
+        """Chunk cache keys for every chunk, or None when the cache is disabled"""
+        if self.chunk_cache is None:
+            return None
+        
+        config = self.config
+        settings = (config.model_url, config.model_filename, config.precision, nfe_step or config.nfe_step, config.fuse_nfe,
+                    config.random_seed, config.sample_rate, config.hop_length)
+        return [
+            ChunkCache.make_key((reference_digest, text_ids, max_duration, *settings))
+            for _, text_ids, max_duration, _ in inputs_list
+        ]
+    
+    def _generate_waves(self, inputs_list: List[Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]],
+                        cache_keys: Optional[List[str]] = None,
+                        nfe_step: Optional[int] = None,
+                        batch_size: Optional[int] = None) -> List[np.ndarray]:
+        """Generate waves for all chunks, reusing cached chunks and batching (max_batch_size > 1) or pipelining (pipelined) the rest"""
+        batch_size = batch_size or self.config.max_batch_size
+        generated_waves: List[Optional[np.ndarray]] = [None] * len(inputs_list)
+        if cache_keys is not None:
+            for i, key in enumerate(cache_keys):
+                generated_waves[i] = self.chunk_cache.get(key)
+        
+        pending = [i for i, wave in enumerate(generated_waves) if wave is None]
+        if len(pending) < len(inputs_list):
+            print(f"Chunk cache: reusing {len(inputs_list) - len(pending)}/{len(inputs_list)} chunks")
+        
+        if self.chunk_executor is not None and len(pending) > 1:
+            new_waves = self._generate_waves_parallel([inputs_list[i] for i in pending], nfe_step)
+        elif batch_size > 1 and len(pending) > 1:
+            new_waves = self._generate_waves_batched([inputs_list[i] for i in pending], nfe_step, batch_size)
+        elif self.config.pipelined and len(pending) > 1:
+            new_waves = list(self._pipelined_waves([inputs_list[i] for i in pending], nfe_step))
+        else:
+            new_waves = []
+            for i in pending:
+                print(f"Generating speech for chunk {i+1}/{len(inputs_list)}...")
+                new_waves.append(self._generate_chunk(*inputs_list[i], nfe_step=nfe_step))
+        
+        for i, wave in zip(pending, new_waves):
+            generated_waves[i] = wave
+            if cache_keys is not None:
+                self.chunk_cache.put(cache_keys[i], wave)
+        
+        return generated_waves
+    
+    def _generate_waves_parallel(self, inputs_list: List[Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]],
+                                 nfe_step: Optional[int] = None) -> List[np.ndarray]:
+        """Scatter chunks over the session sets and gather the waves in original order
+        
+        Chunk i always runs on session set i % parallel_sessions and every set works
+        through its share in order, so the output is the same for a given random_seed
+        however the threads are scheduled.
+        """
+        engines = [self] + self.replicas
+        shares = [list(range(k, len(inputs_list), len(engines))) for k in range(len(engines))]
+        
+        def _run_share(k: int) -> List[np.ndarray]:
+            engine, indices = engines[k], shares[k]
+            if engine.config.max_batch_size > 1 and len(indices) > 1:
+                return engine._generate_waves_batched([inputs_list[i] for i in indices], nfe_step)
+            waves = []
+            for i in indices:
+                print(f"Generating speech for chunk {i+1}/{len(inputs_list)} on session set {k + 1}/{len(engines)}...")
+                waves.append(engine._generate_chunk(*inputs_list[i], nfe_step=nfe_step))
+            return waves
+        
+        futures = [(shares[k], self.chunk_executor.submit(_run_share, k)) for k in range(len(engines)) if shares[k]]
+        generated_waves: List[Optional[np.ndarray]] = [None] * len(inputs_list)
+        for indices, future in futures:
+            for i, wave in zip(indices, future.result()):
+                generated_waves[i] = wave
+        
+        return generated_waves
+    
+    def _pipelined_waves(self, inputs_list: List[Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]],
+                         nfe_step: Optional[int] = None) -> Generator[np.ndarray, None, None]:
+        """Yield the waves of the chunks from a ChunkPipeline, in order, and record its stage utilisation"""
+        pipeline = ChunkPipeline(self, nfe_step, self.config.pipeline_queue_size)
+        try:
+            yield from pipeline.run(inputs_list)
+        finally:
+            self.pipeline_stats.add(pipeline.stats)
+            print(f"Pipeline: {pipeline.stats.summary()}")
+    
+    def _generate_waves_batched(self, inputs_list: List[Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]],
+                                nfe_step: Optional[int] = None,
+                                batch_size: Optional[int] = None) -> List[np.ndarray]:
+        """Generate waves in batches of chunks with the same frame count, returned in original order
+        
+        Only chunks with the same reference audio and exactly the same max_duration
+        share a transformer loop, so no chunk is padded. Chunks without a batch
+        mate run one at a time.
+        """
+        batch_size = batch_size or self.config.max_batch_size
+        groups: "OrderedDict[tuple, List[int]]" = OrderedDict()
+        for idx, (audio, _, max_duration, _) in enumerate(inputs_list):
+            groups.setdefault((id(audio), audio.shape, int(max_duration[0])), []).append(idx)
+        
+        generated_waves: List[Optional[np.ndarray]] = [None] * len(inputs_list)
+        for indices in groups.values():
+            for start in range(0, len(indices), batch_size):
+                batch_indices = indices[start:start + batch_size]
+                if len(batch_indices) == 1:
+                    print(f"Generating speech for chunk {batch_indices[0] + 1}/{len(inputs_list)}...")
+                else:
+                    print(f"Generating speech for chunks {[idx + 1 for idx in batch_indices]}/{len(inputs_list)} (batch of {len(batch_indices)})...")
+                batch_waves = self._generate_batch([inputs_list[idx] for idx in batch_indices], nfe_step)
+                for idx, wave in zip(batch_indices, batch_waves):
+                    generated_waves[idx] = wave
+        
+        return generated_waves
+    
+    def _generate_batch(self, batch_inputs: List[Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]],
+                        nfe_step: Optional[int] = None) -> List[np.ndarray]:
+        """Run one transformer loop over a batch of chunks with the same frame count, then decode each chunk"""
+        if len(batch_inputs) == 1:
+            return [self._generate_chunk(*batch_inputs[0], nfe_step=nfe_step)]
+        if len({int(max_duration[0]) for _, _, max_duration, _ in batch_inputs}) > 1:
+            raise ValueError("Chunks of one batch must have the same max_duration")
+        
+        preprocess_outputs = [self._run_preprocess(audio, text_ids, max_duration)
+                              for audio, text_ids, max_duration, _ in batch_inputs]
+        
+        # Rope tables and the reference length only depend on the (shared) frame count and reference audio
+        _, rope_cos_q, rope_sin_q, rope_cos_k, rope_sin_k, _, _, ref_signal_len = preprocess_outputs[0]
+        noise = np.concatenate([outputs[0] for outputs in preprocess_outputs], axis=0)
+        cat_mel_text = np.concatenate([outputs[5] for outputs in preprocess_outputs], axis=0)
+        cat_mel_text_drop = np.concatenate([outputs[6] for outputs in preprocess_outputs], axis=0)
+        time_step = batch_inputs[0][3]
+        
+        try:
+            noise, _ = self._run_transformer_steps(
+                noise, rope_cos_q, rope_sin_q, rope_cos_k, rope_sin_k,
+                cat_mel_text, cat_mel_text_drop, time_step, nfe_step
+            )
+        except Exception as e:
+            print(f"Warning: batched transformer run failed ({e}), falling back to one chunk at a time")
+            return [self._generate_chunk(*inputs, nfe_step=nfe_step) for inputs in batch_inputs]
+        
+        audio = batch_inputs[0][0]
+        return [self._trim_wave(self._run_decode(noise[i:i + 1], ref_signal_len), audio) for i in range(len(batch_inputs))]
+    
+    def _request_rng(self, seed: Optional[int] = None) -> Optional[random.Random]:
+        """Random generator of an explicitly seeded request, independent of concurrent requests
+        
+        Unseeded requests get None and share the session manager's generator.
+        """
+        return random.Random(seed) if seed is not None else None
+    
     def synthesize(self, text: str,
                    gender: Optional[str] = None,
                    group: Optional[str] = None,
@@ -193,7 +663,10 @@ class TTSEngine:
                    emotion: Optional[str] = None,
                    output_path: Optional[str] = None,
                    reference_audio: Optional[str] = None,
-                   reference_text: Optional[str] = None) -> Tuple[np.ndarray, float]:
+                   reference_text: Optional[str] = None,
+                   quality: Optional[str] = None,
+                   nfe_step: Optional[int] = None,
+                   seed: Optional[int] = None) -> Tuple[np.ndarray, float]:
         """
         Synthesize speech from text
         
@@ -202,32 +675,24 @@ class TTSEngine:
             reference_audio: Path to reference audio file (optional, uses default if not provided)
             reference_text: Reference text matching the reference audio (optional, uses default if not provided)
             output_path: Path to save the generated audio (optional)
+            quality: Quality tier from QUALITY_TIERS (optional, uses config.nfe_step if not provided)
+            nfe_step: Explicit number of NFE steps, overrides quality (optional)
+            seed: Seed of this request's random generator, which then always picks the same voice (optional)
             
         Returns:
             Tuple of (generated_audio, generation_time)
         """
         start_time = time.time()
+        nfe_step = self.config.resolve_nfe_step(quality, nfe_step)
         
-        ref_audio, ref_text = self.model_session_manager.select_sample(gender, group, area, emotion, reference_audio, reference_text)
+        ref_audio, ref_text = self.model_session_manager.select_sample(gender, group, area, emotion, reference_audio, reference_text,
+                                                                        rng=self._request_rng(seed))
         
         try:
-            inputs_list = self._prepare_inputs(ref_audio, ref_text, text)
+            inputs_list = self._prepare_inputs(ref_audio, ref_text, text, batched=self.config.max_batch_size > 1)
+            cache_keys = self._chunk_cache_keys(self._reference_prefix(ref_audio, ref_text).digest, inputs_list, nfe_step)
             
-            generated_waves = []
-            for i, (audio, text_ids, max_duration, time_step) in enumerate(inputs_list):
-                print(f"Generating speech for chunk {i+1}/{len(inputs_list)}...")
-                
-                preprocess_outputs = self._run_preprocess(audio, text_ids, max_duration)
-                (noise, rope_cos_q, rope_sin_q, rope_cos_k, rope_sin_k, 
-                 cat_mel_text, cat_mel_text_drop, ref_signal_len) = preprocess_outputs
-                
-                noise, time_step = self._run_transformer_steps(
-                    noise, rope_cos_q, rope_sin_q, rope_cos_k, rope_sin_k,
-                    cat_mel_text, cat_mel_text_drop, time_step
-                )
-                
-                generated_signal = self._run_decode(noise, ref_signal_len)
-                generated_waves.append(generated_signal)
+            generated_waves = self._generate_waves(inputs_list, cache_keys, nfe_step)
             
             # Concatenate all generated waves with cross-fading
             if len(generated_waves) > 1:
@@ -248,6 +713,135 @@ class TTSEngine:
         except Exception as e:
             raise RuntimeError(f"Speech synthesis failed: {str(e)}")
     
+    def synthesize_batch(self, texts: List[str],
+                         gender: Optional[str] = None,
+                         group: Optional[str] = None,
+                         area: Optional[str] = None,
+                         emotion: Optional[str] = None,
+                         reference_audio: Optional[str] = None,
+                         reference_text: Optional[str] = None,
+                         quality: Optional[str] = None,
+                         nfe_step: Optional[int] = None,
+                         seed: Optional[int] = None,
+                         max_batch_size: Optional[int] = None) -> List[np.ndarray]:
+        """
+        Synthesize several texts with one voice, batching their chunks through the transformer together
+        
+        The chunks of all texts share transformer loops of up to max_batch_size
+        chunks, so many short texts cost about as many loops as one long text
+        instead of one loop each. Frame budgets are rounded up to a multiple of
+        config.batch_frame_step and only chunks with the same budget are batched,
+        so no chunk is padded beyond that rounding.
+        
+        Args:
+            texts: Target texts to synthesize
+            reference_audio: Path to reference audio file (optional, uses default if not provided)
+            reference_text: Reference text matching the reference audio (optional, uses default if not provided)
+            quality: Quality tier from QUALITY_TIERS (optional, uses config.nfe_step if not provided)
+            nfe_step: Explicit number of NFE steps, overrides quality (optional)
+            seed: Seed of the random generator that picks the voice, which is then always the same (optional)
+            max_batch_size: Chunks per transformer loop (optional, defaults to every chunk of the call)
+            
+        Returns:
+            One int16 wave per text, in the order of texts
+        """
+        nfe_step = self.config.resolve_nfe_step(quality, nfe_step)
+        ref_audio, ref_text = self.model_session_manager.select_sample(gender, group, area, emotion, reference_audio, reference_text,
+                                                                        rng=self._request_rng(seed))
+        
+        try:
+            digest = self._reference_prefix(ref_audio, ref_text).digest
+            inputs_list, cache_keys, owners = [], [], []
+            for index, text in enumerate(texts):
+                text_inputs = self._prepare_inputs(ref_audio, ref_text, text, self.config.batch_frame_step,
+                                                   batched=max_batch_size is None or max_batch_size > 1)
+                inputs_list.extend(text_inputs)
+                cache_keys.extend(self._chunk_cache_keys(digest, text_inputs, nfe_step) or [])
+                owners.extend([index] * len(text_inputs))
+            
+            generated_waves = self._generate_waves(inputs_list, cache_keys if self.chunk_cache is not None else None,
+                                                   nfe_step, max_batch_size or len(inputs_list))
+            
+            waves_per_text: List[List[np.ndarray]] = [[] for _ in texts]
+            for index, wave in zip(owners, generated_waves):
+                waves_per_text[index].append(wave)
+            return [
+                self.audio_processor.concatenate_with_crossfade_improved(
+                    waves, self.config.cross_fade_duration, self.config.sample_rate
+                )
+                for waves in waves_per_text
+            ]
+        except Exception as e:
+            raise RuntimeError(f"Speech synthesis failed: {str(e)}")
+    
+    def synthesize_stream(self, text: str,
+                          gender: Optional[str] = None,
+                          group: Optional[str] = None,
+                          area: Optional[str] = None,
+                          emotion: Optional[str] = None,
+                          reference_audio: Optional[str] = None,
+                          reference_text: Optional[str] = None,
+                          quality: Optional[str] = None,
+                          nfe_step: Optional[int] = None,
+                          seed: Optional[int] = None) -> Generator[np.ndarray, None, None]:
+        """
+        Synthesize speech chunk by chunk
+        
+        Args:
+            text: Target text to synthesize
+            reference_audio: Path to reference audio file (optional, uses default if not provided)
+            reference_text: Reference text matching the reference audio (optional, uses default if not provided)
+            quality: Quality tier from QUALITY_TIERS (optional, uses config.nfe_step if not provided)
+            nfe_step: Explicit number of NFE steps, overrides quality (optional)
+            seed: Seed of this request's random generator, which then always picks the same voice (optional)
+            
+        Yields:
+            Cross-faded int16 PCM segments at config.sample_rate, in playback order
+        """
+        nfe_step = self.config.resolve_nfe_step(quality, nfe_step)
+        ref_audio, ref_text = self.model_session_manager.select_sample(gender, group, area, emotion, reference_audio, reference_text,
+                                                                        rng=self._request_rng(seed))
+        
+        try:
+            inputs_list = self._prepare_inputs(ref_audio, ref_text, text, batched=self.config.max_batch_size > 1)
+            cache_keys = self._chunk_cache_keys(self._reference_prefix(ref_audio, ref_text).digest, inputs_list, nfe_step)
+        except Exception as e:
+            raise RuntimeError(f"Speech synthesis failed: {str(e)}")
+        
+        def _pipelined() -> Generator[np.ndarray, None, None]:
+            cached = [self.chunk_cache.get(key) for key in cache_keys] if cache_keys is not None else [None] * len(inputs_list)
+            fresh = self._pipelined_waves([inputs for inputs, wave in zip(inputs_list, cached) if wave is None], nfe_step)
+            try:
+                for i, wave in enumerate(cached):
+                    if wave is None:
+                        wave = next(fresh)
+                        if cache_keys is not None:
+                            self.chunk_cache.put(cache_keys[i], wave)
+                    yield wave
+            finally:
+                # Stops the stage threads when the consumer gives up early
+                fresh.close()
+        
+        def _waves() -> Generator[np.ndarray, None, None]:
+            if self.config.pipelined and len(inputs_list) > 1:
+                yield from _pipelined()
+                return
+            for i, inputs in enumerate(inputs_list):
+                if cache_keys is not None:
+                    wave = self.chunk_cache.get(cache_keys[i])
+                    if wave is not None:
+                        yield wave
+                        continue
+                print(f"Streaming speech for chunk {i+1}/{len(inputs_list)}...")
+                wave = self._generate_chunk(*inputs, nfe_step=nfe_step)
+                if cache_keys is not None:
+                    self.chunk_cache.put(cache_keys[i], wave)
+                yield wave
+        
+        yield from self.audio_processor.crossfade_stream(
+            _waves(), self.config.cross_fade_duration, self.config.sample_rate
+        )
+    
     def validate_configuration(self, reference_audio: Optional[str] = None) -> bool:
         """Validate configuration with reference audio"""
         if reference_audio is None:
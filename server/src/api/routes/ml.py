@@ -1,3 +1,5 @@
+from typing import Optional
+
 from fastapi import APIRouter, Depends, File, Form, HTTPException, UploadFile, status
 
 from ...utils.config import get_settings
@@ -37,7 +39,34 @@ async def run_ocr(
 async def run_tts(
     _: None = Depends(_require_tts_enabled),
     text: str = Form(...),
+    quality: Optional[str] = Form(None),
+    format: Optional[str] = Form(None),
 ):
     from ...services.tts import tts_service
 
-    return await tts_service.synthesize(text)
+    return await tts_service.synthesize(text, quality, format)
+
+
+@router.post("/tts/stream")
+async def run_tts_stream(
+    _: None = Depends(_require_tts_enabled),
+    text: str = Form(...),
+    quality: Optional[str] = Form(None),
+    format: Optional[str] = Form(None),
+):
+    from ...services.tts import tts_service
+
+    return await tts_service.synthesize_stream(text, quality, format)
+
+
+@router.get("/tts/status")
+async def tts_status(_: None = Depends(_require_tts_enabled)):
+    from ...services.tts import tts_service, vietvoice_registry
+
+    pool = tts_service.process_pool
+    batcher = tts_service.batcher
+    return {
+        "vietvoice": vietvoice_registry.status(),
+        "pool": pool.status() if pool is not None else None,
+        "batcher": batcher.status() if batcher is not None else None,
+    }
@@ -1,52 +1,13 @@
 import logging
-from fastapi import APIRouter, HTTPException, status, BackgroundTasks
+from fastapi import APIRouter, HTTPException, status
+from fastapi.responses import JSONResponse
 from pydantic import BaseModel, Field
-from typing import Optional
-from uuid import uuid4
-
-router = APIRouter(prefix="/stories", tags=["stories"])
+from starlette.concurrency import run_in_threadpool
+from typing import Literal, Optional
 
+from ...entities import ProcessingStatus
 
-# Step Upload - 8: Background task generating story audio files
-async def generate_audio_background(story_id: str, story_content: str, author_id: str, supabase_url: str, service_role_key: str):
-    """
-    Background task to generate audio for a story.
-    This runs after the response is sent to the client.
-    """
-    try:
-        from supabase import create_client, Client
-        from ...services.tts import tts_service
-        
-        supabase: Client = create_client(supabase_url, service_role_key)
-        
-        supabase.table("stories").update({"audio_status": "PROCESSING"}).eq("id", story_id).execute()
-        logging.getLogger(__name__).info(f"Starting audio generation for story {story_id}")
-        
-        try:
-            audio_bytes, _ = await tts_service.synthesize_bytes(story_content)
-            audio_filename = f"{author_id}/{uuid4()}.wav"
-            
-            supabase.storage.from_("audio-files").upload(
-                audio_filename,
-                audio_bytes,
-                {"content-type": "audio/wav"},
-            )
-            
-            audio_url = supabase.storage.from_("audio-files").get_public_url(audio_filename)
-            
-            supabase.table("stories").update({
-                "audio_url": audio_url,
-                "audio_status": "COMPLETED",
-            }).eq("id", story_id).execute()
-            
-            logging.getLogger(__name__).info(f"Successfully generated audio for story {story_id}")
-            
-        except Exception as e:
-            supabase.table("stories").update({"audio_status": "FAILED"}).eq("id", story_id).execute()
-            logging.getLogger(__name__).error(f"Failed to generate audio for story {story_id}: {e}")
-            
-    except Exception as e:
-        logging.getLogger(__name__).error(f"Background audio generation failed for story {story_id}: {e}")
+router = APIRouter(prefix="/stories", tags=["stories"])
 
 
 class CreateStoryRequest(BaseModel):
@@ -56,6 +17,7 @@ class CreateStoryRequest(BaseModel):
 class GenerateAudioRequest(BaseModel):
     speed: Optional[float] = 1.0
     voice: Optional[str] = None
+    quality: Optional[Literal["draft", "standard", "high", "adaptive"]] = None
 
 
 class CreateCommentRequest(BaseModel):
@@ -206,6 +168,8 @@ async def get_story(
             "content": story_data.get("content") or "",
             "audioUrl": story_data.get("audio_url"),
             "audioStatus": story_data.get("audio_status"),
+            "audioQuality": story_data.get("audio_quality"),
+            "audioPlaylistUrl": story_data.get("audio_playlist_url"),
             "status": (story_data.get("status") or "draft").upper(),
             "views": story_data.get("view_count") or 0,
             "createdAt": story_data.get("created_at") or "",
@@ -234,7 +198,7 @@ async def get_story(
 
 # Step Upload - 7: Publish a story record sourced from upload data
 @router.post("", response_model=None)
-async def create_story(request: CreateStoryRequest, background_tasks: BackgroundTasks):
+async def create_story(request: CreateStoryRequest):
     """Create a new story from upload"""
     try:
         from ...utils.config import get_settings
@@ -318,23 +282,23 @@ async def create_story(request: CreateStoryRequest, background_tasks: Background
         
         story_data = response.data[0]
 
-        # Schedule audio generation as background task (non-blocking)
-        # This allows the response to be sent immediately while audio generates in background
+        # Queue audio generation for the TTS workers (non-blocking)
+        # The response is sent immediately while a worker process renders the audio
         story_content = story_data.get("content", "") or ""
         story_id = story_data.get("id")
         author_id = story_data.get("author_id", "public")
         
         if settings.tts_service_enabled and story_content.strip():
-            # Add background task to generate audio
-            background_tasks.add_task(
-                generate_audio_background,
+            from ...services.tts_jobs import get_tts_job_queue
+
+            await run_in_threadpool(
+                get_tts_job_queue().enqueue,
                 story_id=story_id,
-                story_content=story_content,
+                content=story_content,
                 author_id=author_id,
-                supabase_url=supabase_url_str,
-                service_role_key=settings.supabase_service_role_key
             )
-            story_data["audio_status"] = "PROCESSING"
+            # Same status the response reported before jobs were queued: audio is on its way
+            story_data["audio_status"] = ProcessingStatus.PROCESSING.value
         else:
             story_data["audio_status"] = story_data.get("audio_status") or "PENDING"
 
@@ -400,6 +364,8 @@ async def create_story(request: CreateStoryRequest, background_tasks: Background
             "content": story_data.get("content", ""),
             "audioUrl": story_data.get("audio_url"),
             "audioStatus": story_data.get("audio_status"),
+            "audioQuality": story_data.get("audio_quality"),
+            "audioPlaylistUrl": story_data.get("audio_playlist_url"),
             "status": story_data.get("status", "draft").upper(),
             "views": story_data.get("view_count") or 0,
             "createdAt": story_data.get("created_at", ""),
@@ -430,6 +396,17 @@ async def create_story(request: CreateStoryRequest, background_tasks: Background
 async def get_audio_status(story_id: str):
     """Get the audio generation status for a story"""
     try:
+        from ...services.tts_jobs import get_tts_job_queue
+
+        job = await run_in_threadpool(get_tts_job_queue().latest_for_story, story_id)
+        if job is not None:
+            return {
+                "audioStatus": job.status.value,
+                "audioUrl": job.audio_url,
+                "audioQuality": job.audio_quality,
+                "audioPlaylistUrl": job.playlist_url,
+            }
+
         from ...utils.config import get_settings
         from supabase import create_client, Client
         
@@ -440,7 +417,7 @@ async def get_audio_status(story_id: str):
             settings.supabase_service_role_key
         )
         
-        story_response = supabase.table("stories").select("audio_status, audio_url").eq("id", story_id).execute()
+        story_response = supabase.table("stories").select("audio_status, audio_url, audio_quality, audio_playlist_url").eq("id", story_id).execute()
         
         if not story_response.data or len(story_response.data) == 0:
             raise HTTPException(
@@ -453,6 +430,8 @@ async def get_audio_status(story_id: str):
         return {
             "audioStatus": story.get("audio_status"),
             "audioUrl": story.get("audio_url"),
+            "audioQuality": story.get("audio_quality"),
+            "audioPlaylistUrl": story.get("audio_playlist_url"),
         }
     
     except Exception as e:
@@ -501,33 +480,52 @@ async def generate_audio(story_id: str, request: GenerateAudioRequest):
                 detail="Story content is empty",
             )
 
-        supabase.table("stories").update({"audio_status": "PROCESSING"}).eq("id", story_id).execute()
-
+        from ...services.story_audio import find_published_story_audio
         from ...services.tts import tts_service
+        from ...services.tts_jobs import PRIORITY_HIGH, get_tts_job_queue
 
-        audio_url = story.get("audio_url") or ""
+        queue = get_tts_job_queue()
 
-        try:
-            audio_bytes, _ = await tts_service.synthesize_bytes(story_content)
-            audio_filename = f"{story.get('author_id', 'public')}/{uuid4()}.wav"
-            supabase.storage.from_("audio-files").upload(
-                audio_filename,
-                audio_bytes,
-                {"content-type": "audio/wav"},
-            )
-            audio_url = supabase.storage.from_("audio-files").get_public_url(audio_filename)
+        # Audio already in storage is returned right away instead of queueing behind other renders
+        quality = await tts_service.resolve_request_quality(request.quality)
+        published = await find_published_story_audio(supabase, story_content, quality)
+        if published is not None:
+            audio_url, playlist_url = published
             supabase.table("stories").update({
                 "audio_url": audio_url,
-                "audio_status": "COMPLETED",
+                "audio_status": ProcessingStatus.COMPLETED.value,
+                "audio_quality": quality,
+                "audio_playlist_url": playlist_url,
             }).eq("id", story_id).execute()
-        except Exception as exc:
-            supabase.table("stories").update({"audio_status": "FAILED"}).eq("id", story_id).execute()
+            return {"audioUrl": audio_url, "audioQuality": quality, "audioPlaylistUrl": playlist_url}
+
+        job = await run_in_threadpool(
+            queue.enqueue,
+            story_id=story_id,
+            content=story_content,
+            author_id=story.get("author_id"),
+            priority=PRIORITY_HIGH,
+            quality=request.quality,
+        )
+        supabase.table("stories").update({"audio_status": job.status.value}).eq("id", story_id).execute()
+
+        # Synthesis runs in a TTS worker process; this request only waits a bounded time for the outcome
+        try:
+            job = await queue.wait(job.id, timeout=settings.tts_generate_wait_seconds)
+        except TimeoutError:
+            # Still rendering: the client follows up through /audio-status
+            return JSONResponse(
+                status_code=status.HTTP_202_ACCEPTED,
+                content={"jobId": job.id, "audioStatus": ProcessingStatus.PROCESSING.value},
+            )
+        if job.status != ProcessingStatus.COMPLETED or not job.audio_url:
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail=f"Failed to generate audio: {str(exc)}",
-            ) from exc
+                detail=f"Failed to generate audio: {job.error or 'unknown error'}",
+            )
+        audio_url = job.audio_url
 
-        return {"audioUrl": audio_url}
+        return {"audioUrl": audio_url, "audioQuality": job.audio_quality, "audioPlaylistUrl": job.playlist_url}
 
     except Exception as e:
         if isinstance(e, HTTPException):
@@ -45,8 +45,10 @@ def create_app() -> FastAPI:
 
     if settings.tts_service_enabled:
         from .services.tts import on_startup as tts_startup
+        from .services.tts_jobs import on_startup as tts_jobs_startup
 
         startup_callbacks.append(tts_startup)
+        startup_callbacks.append(tts_jobs_startup)
 
     if startup_callbacks:
 
@@ -58,6 +60,12 @@ def create_app() -> FastAPI:
     @app.on_event("shutdown")
     async def shutdown_event() -> None:  # pragma: no cover
         await shutdown_supabase_proxy()
+        if settings.tts_service_enabled:
+            from .services.tts import on_shutdown as tts_shutdown
+            from .services.tts_jobs import on_shutdown as tts_jobs_shutdown
+
+            tts_jobs_shutdown()
+            tts_shutdown()
 
     return app
 
@@ -0,0 +1,145 @@
+from __future__ import annotations
+
+import contextlib
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+from pathlib import Path
+from typing import Any, Optional
+
+logger = logging.getLogger(__name__)
+
+AUDIO_BUCKET = "audio-files"
+CACHE_PREFIX = "cache"
+
+
+def make_cache_key(normalized_text: str, **voice: Any) -> str:
+    """Content address for a synthesis request.
+
+    ``normalized_text`` must already be the engine-normalized text (``TextProcessor.clean_text``)
+    so that whitespace or punctuation noise does not produce distinct keys.
+    """
+    payload = json.dumps(
+        {"text": normalized_text, "voice": voice},
+        ensure_ascii=False,
+        sort_keys=True,
+        separators=(",", ":"),
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def cache_object_path(key: str, extension: str = "wav") -> str:
+    """Storage path of a cached audio object inside the audio bucket."""
+    return f"{CACHE_PREFIX}/{key}.{extension}"
+
+
+class DiskAudioCache:
+    """Size-capped on-disk LRU of synthesized audio, keyed by content hash.
+
+    Recency is tracked through file mtimes, so the cache survives restarts and can be
+    shared by several workers pointing at the same directory. The directory is scanned
+    once for its size, which is then tracked per write; it is only scanned again to
+    evict, which also corrects for entries other workers added or removed.
+    """
+
+    def __init__(self, directory: str | os.PathLike[str], max_bytes: int) -> None:
+        self._directory = Path(directory).expanduser()
+        self._max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._total: Optional[int] = None  # Bytes on disk, None until the first scan
+
+    @property
+    def enabled(self) -> bool:
+        return self._max_bytes > 0
+
+    def _path(self, key: str) -> Path:
+        return self._directory / key[:2] / f"{key}.bin"
+
+    def get(self, key: str) -> Optional[bytes]:
+        if not self.enabled:
+            return None
+        path = self._path(key)
+        try:
+            data = path.read_bytes()
+        except OSError:
+            return None
+        with contextlib.suppress(OSError):
+            os.utime(path)
+        return data
+
+    def put(self, key: str, data: bytes) -> None:
+        if not self.enabled or len(data) > self._max_bytes:
+            return
+        path = self._path(key)
+        tmp_path = None
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+            with os.fdopen(fd, "wb") as tmp_file:
+                tmp_file.write(data)
+            replaced = _file_size(path)
+            os.replace(tmp_path, path)
+            tmp_path = None
+        except OSError as exc:
+            logger.warning("Failed to write audio cache entry %s: %s", key, exc)
+            return
+        finally:
+            if tmp_path is not None:
+                with contextlib.suppress(OSError):
+                    os.unlink(tmp_path)
+        self._evict(len(data) - replaced)
+
+    def _scan(self) -> tuple[list[tuple[float, int, Path]], int]:
+        entries = []
+        total = 0
+        for entry in self._directory.glob("*/*.bin"):
+            with contextlib.suppress(OSError):
+                stat = entry.stat()
+                entries.append((stat.st_mtime, stat.st_size, entry))
+                total += stat.st_size
+        return entries, total
+
+    def _evict(self, added: int) -> None:
+        with self._lock:
+            if self._total is None:
+                self._total = self._scan()[1]  # Already counts the entry just written
+            else:
+                self._total += added
+            if self._total <= self._max_bytes:
+                return
+
+            entries, total = self._scan()
+            entries.sort()
+            for _, size, entry in entries:
+                if total <= self._max_bytes:
+                    break
+                with contextlib.suppress(OSError):
+                    entry.unlink()
+                    total -= size
+            self._total = total
+
+
+def _file_size(path: Path) -> int:
+    """Size of ``path``, 0 when it does not exist."""
+    try:
+        return path.stat().st_size
+    except OSError:
+        return 0
+
+
+def find_cached_object_url(client: Any, key: str, extension: str = "wav") -> Optional[str]:
+    """Return the public URL of a previously published cache object, if it exists."""
+    filename = f"{key}.{extension}"
+    bucket = client.storage.from_(AUDIO_BUCKET)
+    try:
+        listing = bucket.list(CACHE_PREFIX, {"search": key})
+    except Exception as exc:  # pragma: no cover - network errors only
+        logger.warning("Audio cache lookup failed for %s: %s", key, exc)
+        return None
+
+    if not any((item or {}).get("name") == filename for item in listing or []):
+        return None
+    return bucket.get_public_url(cache_object_path(key, extension))
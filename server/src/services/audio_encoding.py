@@ -0,0 +1,171 @@
+from __future__ import annotations
+
+import queue
+import shutil
+import subprocess
+import threading
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Iterable, Iterator, Optional
+
+
+@dataclass(frozen=True)
+class AudioFormat:
+    """Container/codec a synthesized story can be stored or streamed in."""
+
+    name: str
+    extension: str
+    content_type: str
+    ffmpeg_args: tuple[str, ...] = ()
+
+    @property
+    def needs_encoder(self) -> bool:
+        return bool(self.ffmpeg_args)
+
+
+AUDIO_FORMATS: dict[str, AudioFormat] = {
+    "opus": AudioFormat("opus", "ogg", "audio/ogg", ("-c:a", "libopus", "-f", "ogg")),
+    "mp3": AudioFormat("mp3", "mp3", "audio/mpeg", ("-c:a", "libmp3lame", "-f", "mp3")),
+    # ADTS rather than MP4 so the output can be written to a pipe as it is produced
+    "aac": AudioFormat("aac", "aac", "audio/aac", ("-c:a", "aac", "-f", "adts")),
+    "wav": AudioFormat("wav", "wav", "audio/wav"),
+}
+
+
+def get_audio_format(name: Optional[str]) -> AudioFormat:
+    fmt = AUDIO_FORMATS.get((name or "").lower())
+    if fmt is None:
+        raise ValueError(f"Unknown audio format {name!r}, expected one of {tuple(AUDIO_FORMATS)}")
+    return fmt
+
+
+@lru_cache()
+def ffmpeg_available() -> bool:
+    return shutil.which("ffmpeg") is not None
+
+
+def _ffmpeg_command(
+    fmt: AudioFormat, bitrate_kbps: int, input_args: tuple[str, ...], output_args: tuple[str, ...] = ()
+) -> list[str]:
+    return [
+        "ffmpeg", "-hide_banner", "-loglevel", "error", "-nostdin",
+        *input_args, "-i", "pipe:0",
+        "-ac", "1", "-b:a", f"{bitrate_kbps}k",
+        *output_args, *fmt.ffmpeg_args, "pipe:1",
+    ]
+
+
+def _pcm_input_args(sample_rate: int) -> tuple[str, ...]:
+    return ("-f", "s16le", "-ar", str(sample_rate), "-ac", "1")
+
+
+def _run_ffmpeg(command: list[str], data: bytes, fmt: AudioFormat) -> bytes:
+    result = subprocess.run(command, input=data, capture_output=True, check=False)
+    if result.returncode != 0:
+        raise RuntimeError(f"ffmpeg {fmt.name} encode failed: {result.stderr.decode(errors='replace').strip()}")
+    return result.stdout
+
+
+def encode_wav_bytes(wav: bytes, fmt: AudioFormat, bitrate_kbps: int) -> bytes:
+    """Transcode a complete WAV payload into ``fmt`` (a no-op for WAV)."""
+    if not fmt.needs_encoder:
+        return wav
+    return _run_ffmpeg(_ffmpeg_command(fmt, bitrate_kbps, ("-f", "wav")), wav, fmt)
+
+
+def encode_pcm_bytes(
+    pcm: bytes, fmt: AudioFormat, sample_rate: int, bitrate_kbps: int, output_args: tuple[str, ...] = ()
+) -> bytes:
+    """Encode a block of 16-bit mono PCM into ``fmt``."""
+    return _run_ffmpeg(_ffmpeg_command(fmt, bitrate_kbps, _pcm_input_args(sample_rate), output_args), pcm, fmt)
+
+
+class StreamingEncoder:
+    """Feeds 16-bit mono PCM into an ffmpeg process and hands back encoded bytes as they appear.
+
+    A reader thread drains ffmpeg's stdout so writes never block on a full pipe.
+    """
+
+    _READ_SIZE = 16 * 1024
+
+    def __init__(self, fmt: AudioFormat, sample_rate: int, bitrate_kbps: int) -> None:
+        if not fmt.needs_encoder:
+            raise ValueError("StreamingEncoder needs a compressed format")
+        self._process = subprocess.Popen(
+            _ffmpeg_command(fmt, bitrate_kbps, _pcm_input_args(sample_rate)),
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+        )
+        self._output: "queue.Queue[Optional[bytes]]" = queue.Queue()
+        self._reader = threading.Thread(target=self._drain, name="ffmpeg-reader", daemon=True)
+        self._reader.start()
+        self._done = False
+
+    def _drain(self) -> None:
+        stdout = self._process.stdout
+        while True:
+            data = stdout.read1(self._READ_SIZE)
+            if not data:
+                break
+            self._output.put(data)
+        self._output.put(None)
+
+    def _take(self, block: bool) -> bytes:
+        parts = []
+        while not self._done:
+            try:
+                data = self._output.get(block=block)
+            except queue.Empty:
+                break
+            if data is None:
+                self._done = True
+                break
+            parts.append(data)
+        return b"".join(parts)
+
+    def write(self, pcm: bytes) -> bytes:
+        """Encode another PCM segment; returns whatever encoded output is ready so far."""
+        try:
+            self._process.stdin.write(pcm)
+            self._process.stdin.flush()
+        except BrokenPipeError:
+            self._process.wait()
+            raise RuntimeError(f"ffmpeg encode failed: {self._process.stderr.read().decode(errors='replace').strip()}")
+        return self._take(block=False)
+
+    def finish(self) -> bytes:
+        """Flush the encoder and return the remaining output."""
+        stdin = self._process.stdin
+        if not stdin.closed:
+            stdin.close()
+        tail = self._take(block=True)
+        self._reader.join()
+        stderr = self._process.stderr.read()
+        if self._process.wait() != 0:
+            raise RuntimeError(f"ffmpeg encode failed: {stderr.decode(errors='replace').strip()}")
+        return tail
+
+    def close(self) -> None:
+        """Stop the encoder early (e.g. the client disconnected)."""
+        if self._process.poll() is None:
+            self._process.kill()
+        self._process.wait()
+        self._reader.join()
+
+
+def encode_pcm_stream(
+    segments: Iterable[bytes], fmt: AudioFormat, sample_rate: int, bitrate_kbps: int
+) -> Iterator[bytes]:
+    """Encode PCM segments as they arrive, yielding encoded bytes as soon as ffmpeg emits them."""
+    encoder = StreamingEncoder(fmt, sample_rate, bitrate_kbps)
+    try:
+        for segment in segments:
+            data = encoder.write(segment)
+            if data:
+                yield data
+        data = encoder.finish()
+        if data:
+            yield data
+    finally:
+        encoder.close()
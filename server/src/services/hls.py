@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass, field
+from typing import Iterable, Iterator
+
+from .audio_encoding import AudioFormat, encode_pcm_bytes
+
+# AAC in MPEG-TS: the segment format every HLS player accepts
+HLS_SEGMENT_FORMAT = AudioFormat("hls", "ts", "video/mp2t", ("-c:a", "aac", "-f", "mpegts"))
+PLAYLIST_EXTENSION = "m3u8"
+PLAYLIST_CONTENT_TYPE = "application/vnd.apple.mpegurl"
+
+
+def group_segments(chunks: Iterable[bytes], sample_rate: int, target_seconds: float) -> Iterator[bytes]:
+    """Group per-chunk PCM into segments of at most ``target_seconds``, cut only at chunk boundaries.
+
+    Chunks end on sentence punctuation, so segment edges fall on pauses. A single chunk
+    longer than the target becomes a segment of its own. A segment that reaches the target
+    is released right away rather than when the next chunk arrives.
+    """
+    target_bytes = int(target_seconds * sample_rate) * 2
+    buffer: list[bytes] = []
+    size = 0
+    for chunk in chunks:
+        if not chunk:
+            continue
+        if buffer and size + len(chunk) > target_bytes:
+            yield b"".join(buffer)
+            buffer, size = [], 0
+        buffer.append(chunk)
+        size += len(chunk)
+        if size >= target_bytes:
+            yield b"".join(buffer)
+            buffer, size = [], 0
+    if buffer:
+        yield b"".join(buffer)
+
+
+def encode_segment(pcm: bytes, sample_rate: int, bitrate_kbps: int, start_seconds: float) -> bytes:
+    """Encode one segment, offsetting its timestamps so segments play back as one timeline."""
+    return encode_pcm_bytes(
+        pcm,
+        HLS_SEGMENT_FORMAT,
+        sample_rate,
+        bitrate_kbps,
+        output_args=("-output_ts_offset", f"{start_seconds:.6f}"),
+    )
+
+
+@dataclass
+class HLSPlaylist:
+    """EVENT playlist that grows as segments are published and is closed with ENDLIST."""
+
+    target_duration: float
+    segments: list[tuple[str, float]] = field(default_factory=list)
+
+    def add(self, uri: str, duration: float) -> None:
+        self.segments.append((uri, duration))
+
+    @property
+    def duration(self) -> float:
+        return sum(duration for _, duration in self.segments)
+
+    def render(self, ended: bool = False) -> str:
+        longest = max((duration for _, duration in self.segments), default=0.0)
+        lines = [
+            "#EXTM3U",
+            "#EXT-X-VERSION:3",
+            "#EXT-X-PLAYLIST-TYPE:EVENT",
+            f"#EXT-X-TARGETDURATION:{math.ceil(max(self.target_duration, longest))}",
+            "#EXT-X-MEDIA-SEQUENCE:0",
+        ]
+        for uri, duration in self.segments:
+            lines.append(f"#EXTINF:{duration:.3f},")
+            lines.append(uri)
+        if ended:
+            lines.append("#EXT-X-ENDLIST")
+        return "\n".join(lines) + "\n"
@@ -0,0 +1,159 @@
+from __future__ import annotations
+
+import logging
+from typing import Any, Callable, Iterator, Optional
+
+from starlette.concurrency import run_in_threadpool
+
+from ..utils.config import get_settings
+from .audio_cache import AUDIO_BUCKET, CACHE_PREFIX, cache_object_path, find_cached_object_url
+from .audio_encoding import AudioFormat, encode_wav_bytes, ffmpeg_available, get_audio_format
+from .hls import (
+    HLS_SEGMENT_FORMAT,
+    PLAYLIST_CONTENT_TYPE,
+    PLAYLIST_EXTENSION,
+    HLSPlaylist,
+    encode_segment,
+    group_segments,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def storage_audio_format() -> tuple[AudioFormat, int]:
+    """Format and bitrate story audio is stored in; WAV when the encoder is unavailable."""
+    settings = get_settings()
+    fmt = get_audio_format(settings.tts_audio_format)
+    if fmt.needs_encoder and not ffmpeg_available():
+        logger.warning("ffmpeg not found, storing story audio as WAV instead of %s", fmt.name)
+        fmt = get_audio_format("wav")
+    return fmt, settings.tts_audio_bitrate_kbps
+
+
+def encoded_object_key(cache_key: str, fmt: AudioFormat, bitrate_kbps: int) -> str:
+    """Storage key of the encoded rendering; WAV keeps the bare cache key."""
+    if not fmt.needs_encoder:
+        return cache_key
+    return f"{cache_key}-{fmt.name}{bitrate_kbps}k"
+
+
+def _upload(supabase: Any, path: str, data: bytes, content_type: str, cache_control: Optional[str] = None) -> str:
+    options = {"content-type": content_type, "upsert": "true"}
+    if cache_control is not None:
+        options["cache-control"] = cache_control
+    bucket = supabase.storage.from_(AUDIO_BUCKET)
+    bucket.upload(path, data, options)
+    return bucket.get_public_url(path)
+
+
+def _publish_segments(
+    supabase: Any,
+    chunks: Iterator[bytes],
+    sample_rate: int,
+    object_key: str,
+    segment_seconds: float,
+    bitrate_kbps: int,
+    on_playlist: Optional[Callable[[str], None]],
+) -> bytes:
+    """Upload HLS segments and the growing playlist as chunks arrive; returns the full PCM.
+
+    The playlist lives at cache/<key>.m3u8 and its segments under cache/<key>/, so segment
+    URIs are relative to the playlist.
+    """
+    playlist = HLSPlaylist(target_duration=segment_seconds)
+    playlist_path = cache_object_path(object_key, PLAYLIST_EXTENSION)
+    pcm_parts: list[bytes] = []
+
+    for index, pcm in enumerate(group_segments(chunks, sample_rate, segment_seconds)):
+        uri = f"{object_key}/seg{index:05d}.{HLS_SEGMENT_FORMAT.extension}"
+        data = encode_segment(pcm, sample_rate, bitrate_kbps, playlist.duration)
+        _upload(supabase, f"{CACHE_PREFIX}/{uri}", data, HLS_SEGMENT_FORMAT.content_type)
+        playlist.add(uri, len(pcm) / 2.0 / sample_rate)
+        pcm_parts.append(pcm)
+        # Players re-fetch the playlist while it grows, so it must not be cached
+        playlist_url = _upload(supabase, playlist_path, playlist.render().encode(), PLAYLIST_CONTENT_TYPE, "0")
+        if index == 0 and on_playlist is not None:
+            on_playlist(playlist_url)
+
+    _upload(supabase, playlist_path, playlist.render(ended=True).encode(), PLAYLIST_CONTENT_TYPE)
+    logger.info("Published %s HLS segments (%.1fs) for %s", len(playlist.segments), playlist.duration, object_key)
+    return b"".join(pcm_parts)
+
+
+def _segmented_publishing() -> bool:
+    from .tts import tts_service
+
+    return get_settings().tts_hls_segment_seconds > 0 and tts_service.supports_pcm_stream and ffmpeg_available()
+
+
+def _find_published(
+    supabase: Any, object_key: str, fmt: AudioFormat, segmented: bool
+) -> Optional[tuple[str, Optional[str]]]:
+    # The full file is uploaded last, so once it exists any playlist next to it is complete
+    audio_url = find_cached_object_url(supabase, object_key, fmt.extension)
+    if not audio_url:
+        return None
+    playlist_url = find_cached_object_url(supabase, object_key, PLAYLIST_EXTENSION) if segmented else None
+    return audio_url, playlist_url
+
+
+async def find_published_story_audio(
+    supabase: Any, story_content: str, quality: Optional[str] = None
+) -> Optional[tuple[str, Optional[str]]]:
+    """Public URLs of an identical earlier render: (audio, HLS playlist or None), or None if there is none."""
+    from .tts import tts_service
+
+    fmt, bitrate = storage_audio_format()
+    object_key = encoded_object_key(await tts_service.cache_key(story_content, quality), fmt, bitrate)
+    return await run_in_threadpool(_find_published, supabase, object_key, fmt, _segmented_publishing())
+
+
+async def publish_story_audio(
+    supabase: Any,
+    story_content: str,
+    quality: Optional[str] = None,
+    on_playlist: Optional[Callable[[str], None]] = None,
+) -> str:
+    """Synthesize story audio (or reuse an identical earlier render) and return its public URL.
+
+    With TTS_HLS_SEGMENT_SECONDS set, the render is also published as an HLS playlist whose
+    segments are uploaded while synthesis runs; ``on_playlist`` gets the playlist URL as soon
+    as the first segment is live.
+    """
+    from .tts import _encode_wav, tts_service
+
+    settings = get_settings()
+    fmt, bitrate = storage_audio_format()
+    cache_key = await tts_service.cache_key(story_content, quality)
+    object_key = encoded_object_key(cache_key, fmt, bitrate)
+    segmented = _segmented_publishing()
+
+    published = await run_in_threadpool(_find_published, supabase, object_key, fmt, segmented)
+    if published is not None:
+        logger.info("Reusing cached audio %s", object_key)
+        audio_url, playlist_url = published
+        if playlist_url and on_playlist is not None:
+            on_playlist(playlist_url)
+        return audio_url
+
+    if segmented:
+
+        def _render_segmented() -> bytes:
+            chunks, sample_rate = tts_service.open_pcm_stream(story_content, tts_service.resolve_quality(quality))
+            pcm = _publish_segments(
+                supabase, chunks, sample_rate, object_key, settings.tts_hls_segment_seconds, bitrate, on_playlist
+            )
+            return _encode_wav(pcm, sample_rate)
+
+        audio_bytes = await run_in_threadpool(_render_segmented)
+    else:
+        audio_bytes, _ = await tts_service.synthesize_bytes(story_content, cache_key=cache_key, quality=quality)
+
+    if fmt.needs_encoder:
+        wav_size = len(audio_bytes)
+        audio_bytes = await run_in_threadpool(encode_wav_bytes, audio_bytes, fmt, bitrate)
+        logger.info("Encoded %s: %d -> %d bytes (%s %dk)", object_key, wav_size, len(audio_bytes), fmt.name, bitrate)
+
+    return await run_in_threadpool(
+        _upload, supabase, cache_object_path(object_key, fmt.extension), audio_bytes, fmt.content_type
+    )
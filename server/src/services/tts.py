@@ -3,17 +3,20 @@ from __future__ import annotations
 
 import contextlib
 import os
-import tempfile
-import wave
+import struct
+import time
 import threading
 import sys
-from typing import Optional, Any
+from typing import Optional, Any, Callable, Iterator
 
 from fastapi import HTTPException
-from fastapi.responses import FileResponse
-from starlette.background import BackgroundTask
+from fastapi.responses import Response, StreamingResponse
 from starlette.concurrency import run_in_threadpool
 
+from ..utils.config import get_settings
+from .audio_cache import DiskAudioCache, make_cache_key
+from .audio_encoding import AudioFormat, encode_pcm_stream, encode_wav_bytes, ffmpeg_available, get_audio_format
+
 try:
     import numpy as np
 except Exception:
@@ -38,11 +41,21 @@ try:
         sys.path.insert(0, vietvoice_path)
         print(f"Added VietVoice path to sys.path: {vietvoice_path}")
 
-    from vietvoice_api import synthesize_vietvoice  # type: ignore
+    from vietvoice_api import (  # type: ignore
+        create_vietvoice_api,
+        stream_vietvoice,
+        synthesize_vietvoice_pcm,
+        synthesize_vietvoice_pcm_batch,
+    )
+    from vietvoicetts import ModelConfig  # type: ignore
     VIETVOICE_AVAILABLE = True
     print("VietVoice TTS loaded successfully")
 except Exception as e:
-    synthesize_vietvoice = None
+    create_vietvoice_api = None
+    ModelConfig = None
+    stream_vietvoice = None
+    synthesize_vietvoice_pcm = None
+    synthesize_vietvoice_pcm_batch = None
     VIETVOICE_AVAILABLE = False
     print(f"VietVoice TTS not available: {e}")
     import traceback
@@ -65,6 +78,197 @@ def _is_oom_error(err: BaseException) -> bool:
     return any(k in msg for k in oom_signals)
 
 
+QUALITY_TIERS = ("draft", "standard", "high")
+QUALITY_ADAPTIVE = "adaptive"
+
+
+def choose_quality_tier(
+    requested: Optional[str],
+    queue_depth: int,
+    default: str = "high",
+    standard_depth: int = 4,
+    draft_depth: int = 10,
+) -> str:
+    """Resolve a requested tier (or ``adaptive``) to a concrete draft/standard/high tier.
+
+    Adaptive mode trades NFE steps for latency as the TTS job queue backs up.
+    """
+    tier = requested or default
+    if tier == QUALITY_ADAPTIVE:
+        if queue_depth >= draft_depth:
+            return "draft"
+        if queue_depth >= standard_depth:
+            return "standard"
+        return "high"
+    if tier not in QUALITY_TIERS:
+        raise ValueError(f"Unknown TTS quality {tier!r}, expected one of {QUALITY_TIERS + (QUALITY_ADAPTIVE,)}")
+    return tier
+
+
+def _wav_header(sample_rate: int, data_size: int, channels: int = 1, sample_width: int = 2) -> bytes:
+    """Canonical 44-byte PCM WAV header for ``data_size`` bytes of samples."""
+    riff_size = 0xFFFFFFFF if data_size == 0xFFFFFFFF else 36 + data_size
+    byte_rate = sample_rate * channels * sample_width
+    block_align = channels * sample_width
+    return (
+        b"RIFF"
+        + struct.pack("<I", riff_size)
+        + b"WAVEfmt "
+        + struct.pack("<IHHIIHH", 16, 1, channels, sample_rate, byte_rate, block_align, sample_width * 8)
+        + b"data"
+        + struct.pack("<I", data_size)
+    )
+
+
+def _streaming_wav_header(sample_rate: int, channels: int = 1, sample_width: int = 2) -> bytes:
+    """WAV header for a PCM stream of unknown length (sizes set to the 0xFFFFFFFF sentinel)."""
+    return _wav_header(sample_rate, 0xFFFFFFFF, channels, sample_width)
+
+
+def _encode_wav(pcm: bytes, sample_rate: int) -> bytes:
+    """Wrap 16-bit mono PCM in a WAV container in memory."""
+    return b"".join((_wav_header(sample_rate, len(pcm)), pcm))
+
+
+def _to_pcm16(wave: Any) -> Any:
+    """Flatten a waveform to int16 samples, scaling float audio from [-1, 1]."""
+    wave = np.asarray(wave).reshape(-1)
+    if wave.dtype == np.int16:
+        return wave
+    if np.issubdtype(wave.dtype, np.floating):
+        return (np.clip(wave, -1.0, 1.0) * 32767.0).astype(np.int16)
+    return wave.astype(np.int16)
+
+
+def _wav_duration(data: bytes) -> float:
+    """Duration of a RIFF/WAV(EX) payload, read from its fmt and data chunks."""
+    if len(data) < 12 or data[:4] != b"RIFF" or data[8:12] != b"WAVE":
+        return 0.0
+
+    byte_rate = 0
+    offset = 12
+    while offset + 8 <= len(data):
+        chunk_id = data[offset:offset + 4]
+        chunk_size = struct.unpack("<I", data[offset + 4:offset + 8])[0]
+        if chunk_id == b"fmt " and chunk_size >= 12:
+            byte_rate = struct.unpack("<I", data[offset + 16:offset + 20])[0]
+        elif chunk_id == b"data":
+            payload = min(chunk_size, len(data) - offset - 8)
+            return payload / float(byte_rate) if byte_rate else 0.0
+        offset += 8 + chunk_size + (chunk_size & 1)
+    return 0.0
+
+
+class VietVoiceEngineRegistry:
+    """Process-wide holder of the resident VietVoice engine.
+
+    The engine (ONNX sessions, vocab, sample metadata) is built once and shared by
+    every request instead of being rebuilt per synthesis call. It is reentrant, so
+    concurrent requests run on the same loaded model without a lock around them.
+    """
+
+    def __init__(self, config_factory: Optional[Callable[[], Any]] = None) -> None:
+        self._config_factory = config_factory
+        self._api: Optional[Any] = None
+        self._lock = threading.Lock()
+        self._load_seconds: Optional[float] = None
+        self._loaded_at: Optional[float] = None
+        self._last_error: Optional[str] = None
+
+    @property
+    def is_warm(self) -> bool:
+        return self._api is not None
+
+    @property
+    def load_seconds(self) -> Optional[float]:
+        return self._load_seconds
+
+    def get(self) -> Any:
+        """Return the resident TTSApi, loading it on first use."""
+        if self._api is not None:
+            return self._api
+
+        if not VIETVOICE_AVAILABLE or create_vietvoice_api is None:
+            raise RuntimeError("VietVoice TTS is not available")
+
+        with self._lock:
+            if self._api is not None:
+                return self._api
+
+            started = time.perf_counter()
+            try:
+                config = self._config_factory() if self._config_factory else None
+                api = create_vietvoice_api(config)
+            except Exception as exc:
+                self._last_error = str(exc)
+                raise RuntimeError(f"Unable to load VietVoice engine: {exc}") from exc
+
+            self._load_seconds = time.perf_counter() - started
+            self._loaded_at = time.time()
+            self._last_error = None
+            self._api = api
+            print(f"VietVoice engine loaded in {self._load_seconds:.2f}s")
+            return api
+
+    def status(self) -> dict[str, Any]:
+        sessions = pipeline = None
+        api = self._api
+        if api is not None:
+            engine = getattr(api, "_engine", None)
+            sessions = getattr(getattr(engine, "model_session_manager", None), "load_report", None)
+            stats = getattr(engine, "pipeline_stats", None)
+            pipeline = stats.as_dict() if stats is not None and stats.runs else None
+        return {
+            "state": "warm" if self.is_warm else "cold",
+            "loadSeconds": self._load_seconds,
+            "loadedAt": self._loaded_at,
+            "lastError": self._last_error,
+            "sessions": sessions,
+            "pipeline": pipeline,
+        }
+
+    def shutdown(self) -> None:
+        with self._lock:
+            api, self._api = self._api, None
+        if api is not None:
+            with contextlib.suppress(Exception):
+                api.cleanup()
+
+
+def _vietvoice_config() -> Any:
+    settings = get_settings()
+    return ModelConfig(
+        # prefer_gpu picks the ORT providers once, when the shared engine is built
+        use_gpu=tts_service._prefer_gpu,
+        chunk_cache_dir=settings.tts_chunk_cache_dir or None,
+        chunk_cache_max_mb=settings.tts_chunk_cache_max_mb,
+        session_profile=settings.tts_session_profile or None,
+        parallel_sessions=settings.tts_parallel_sessions,
+        pipelined=settings.tts_pipelined,
+        chunk_buckets=settings.tts_chunk_buckets,
+        duration_model=settings.tts_duration_model,
+        use_io_binding=settings.tts_io_binding,
+        precision=settings.tts_precision,
+        cache_optimized_models=settings.tts_cache_optimized_models,
+    )
+
+
+vietvoice_registry = VietVoiceEngineRegistry(_vietvoice_config)
+
+
+def _vietvoice_key_fields(api: Any, text: str, quality: str) -> tuple[str, dict[str, Any]]:
+    """Cleaned text and engine settings that determine the VietVoice audio for ``text``."""
+    config = api.config
+    return api.engine.text_processor.clean_text(text), {
+        "speed": config.speed,
+        "seed": config.random_seed,
+        "nfe_step": config.resolve_nfe_step(quality),
+        "precision": config.precision,
+        "chunk_buckets": config.chunk_buckets,
+        "durations": api.engine.duration_models.digest,
+    }
+
+
 class TTSService:
     """Synthesize Vietnamese speech using VietVoice TTS with fallback to MMS VITS model."""
 
@@ -79,6 +283,7 @@ class TTSService:
         vietvoice_gender: str = "female",
         vietvoice_area: str = "central",
         vietvoice_emotion: str = "neutral",
+        audio_cache: Optional[DiskAudioCache] = None,
     ) -> None:
         self._model_name = model_name
         self._model: Optional[Any] = None
@@ -97,8 +302,32 @@ class TTSService:
         self._vietvoice_area = vietvoice_area
         self._vietvoice_emotion = vietvoice_emotion
 
+        self._audio_cache = audio_cache
+        self._process_pool: Optional[Any] = None
+        self._batcher: Optional[Any] = None
+
         self._load_lock = threading.Lock()
 
+    @property
+    def uses_vietvoice(self) -> bool:
+        return self._use_vietvoice
+
+    @property
+    def process_pool(self) -> Optional[Any]:
+        return self._process_pool
+
+    def use_process_pool(self, pool: Optional[Any]) -> None:
+        """Route VietVoice synthesis through a running VietVoiceProcessPool (None to stop)."""
+        self._process_pool = pool
+
+    @property
+    def batcher(self) -> Optional[Any]:
+        return self._batcher
+
+    def use_batcher(self, batcher: Optional[Any]) -> None:
+        """Batch short in-process VietVoice requests through a TTSMicroBatcher (None to stop)."""
+        self._batcher = batcher
+
     def load(self) -> None:
         """Load the MMS VITS model preferably on GPU. Fallback to CPU if OOM and configured."""
         if self._initialized:
@@ -136,19 +365,61 @@ class TTSService:
             self._sampling_rate = int(getattr(model.config, "sampling_rate", self._sampling_rate))
             self._initialized = True
 
-    async def _synthesize_to_file(self, text: str) -> tuple[str, float]:
-        """Synthesize speech and save to a temporary WAV file."""
+    def resolve_quality(self, quality: Optional[str], queue_depth: Optional[int] = None) -> str:
+        """Validate a requested quality tier and resolve ``adaptive`` against the job queue depth."""
+        settings = get_settings()
+        if (quality or settings.tts_default_quality) == QUALITY_ADAPTIVE and queue_depth is None:
+            from .tts_jobs import get_tts_job_queue
+
+            queue_depth = get_tts_job_queue().depth()
+        try:
+            return choose_quality_tier(
+                quality,
+                queue_depth or 0,
+                default=settings.tts_default_quality,
+                standard_depth=settings.tts_adaptive_standard_depth,
+                draft_depth=settings.tts_adaptive_draft_depth,
+            )
+        except ValueError as exc:
+            raise HTTPException(status_code=400, detail=str(exc)) from exc
+
+    async def resolve_request_quality(self, quality: Optional[str]) -> str:
+        """``resolve_quality`` for request handlers: the job queue depth is read off the event loop."""
+        queue_depth = None
+        if (quality or get_settings().tts_default_quality) == QUALITY_ADAPTIVE:
+            from .tts_jobs import get_tts_job_queue
+
+            queue_depth = await run_in_threadpool(lambda: get_tts_job_queue().depth())
+        return self.resolve_quality(quality, queue_depth=queue_depth)
+
+    def resolve_format(self, audio_format: Optional[str]) -> AudioFormat:
+        """Validate a requested output format (WAV when none is given)."""
+        try:
+            fmt = get_audio_format(audio_format or "wav")
+        except ValueError as exc:
+            raise HTTPException(status_code=400, detail=str(exc)) from exc
+        if fmt.needs_encoder and not ffmpeg_available():
+            raise HTTPException(status_code=503, detail=f"{fmt.name} output requires ffmpeg on the server")
+        return fmt
+
+    def _normalize_text(self, text: str) -> str:
+        """Validate request text and collapse whitespace."""
         if not text or not text.strip():
             raise HTTPException(status_code=400, detail="Text is required for synthesis")
 
         text = " ".join(text.split())
         if self._max_chars and len(text) > self._max_chars:
             raise HTTPException(status_code=413, detail=f"Text too long (>{self._max_chars} chars)")
+        return text
+
+    async def _synthesize_audio(self, text: str, quality: str) -> tuple[bytes, float]:
+        """Synthesize speech into an in-memory WAV payload."""
+        text = self._normalize_text(text)
 
         if self._use_vietvoice:
             try:
                 print("Attempting to use VietVoice TTS...")
-                return await self._synthesize_with_vietvoice(text)
+                return await self._synthesize_with_vietvoice(text, quality)
             except Exception as e:
                 # Only fall back to MMS if it's an OOM-like error and fallback_on_oom is True
                 print(f"VietVoice TTS failed: {e}")
@@ -161,46 +432,55 @@ class TTSService:
         print("Using MMS TTS...")
         return await self._synthesize_with_mms(text)
 
-    async def _synthesize_with_vietvoice(self, text: str) -> tuple[str, float]:
+    async def _synthesize_with_vietvoice(self, text: str, quality: str) -> tuple[bytes, float]:
         """Sử dụng VietVoice TTS để tổng hợp giọng nói."""
-        if not VIETVOICE_AVAILABLE or synthesize_vietvoice is None:
+        if not VIETVOICE_AVAILABLE or synthesize_vietvoice_pcm is None:
             raise RuntimeError("VietVoice TTS is not available")
 
-        def _vietvoice_infer() -> tuple[str, float]:
-            # Respect prefer_gpu: allow forcing CPU for ORT by hiding CUDA
-            restore_env = None
-            if not self._prefer_gpu:
-                restore_env = os.environ.get("CUDA_VISIBLE_DEVICES", None)
-                os.environ["CUDA_VISIBLE_DEVICES"] = ""
+        if self._process_pool is not None:
+            pcm, sample_rate = await self._process_pool.synthesize_pcm(
+                text, self._vietvoice_gender, self._vietvoice_area, self._vietvoice_emotion, quality
+            )
+            return _encode_wav(pcm, sample_rate), len(pcm) / 2.0 / sample_rate
 
-            fd, wav_path = tempfile.mkstemp(suffix=".wav")
-            os.close(fd)
+        if self._batcher is not None and self._batcher.accepts(text):
+            pcm, sample_rate = await self._batcher.submit(text, quality)
+            return _encode_wav(pcm, sample_rate), len(pcm) / 2.0 / sample_rate
 
+        def _vietvoice_infer() -> tuple[bytes, float]:
             try:
-                duration = synthesize_vietvoice(
+                api = vietvoice_registry.get()
+                pcm, sample_rate = synthesize_vietvoice_pcm(
                     text=text,
-                    output_path=wav_path,
+                    api=api,
                     gender=self._vietvoice_gender,
                     area=self._vietvoice_area,
                     emotion=self._vietvoice_emotion,
+                    quality=quality,
                 )
-                return wav_path, duration
+                return _encode_wav(pcm, sample_rate), len(pcm) / 2.0 / sample_rate
             except Exception as e:
-                with contextlib.suppress(OSError):
-                    os.remove(wav_path)
                 raise RuntimeError(f"VietVoice synthesis failed: {e}") from e
-            finally:
-                # Restore env if we changed it
-                if not self._prefer_gpu:
-                    if restore_env is None:
-                        with contextlib.suppress(KeyError):
-                            del os.environ["CUDA_VISIBLE_DEVICES"]
-                    else:
-                        os.environ["CUDA_VISIBLE_DEVICES"] = restore_env
 
         return await run_in_threadpool(_vietvoice_infer)
 
-    async def _synthesize_with_mms(self, text: str) -> tuple[str, float]:
+    def synthesize_vietvoice_batch(self, texts: list[str], quality: str) -> tuple[list[bytes], int]:
+        """Blocking batched synthesis of several texts on the resident engine (one PCM per text)."""
+        if not VIETVOICE_AVAILABLE or synthesize_vietvoice_pcm_batch is None:
+            raise RuntimeError("VietVoice TTS is not available")
+        try:
+            return synthesize_vietvoice_pcm_batch(
+                texts=texts,
+                api=vietvoice_registry.get(),
+                gender=self._vietvoice_gender,
+                area=self._vietvoice_area,
+                emotion=self._vietvoice_emotion,
+                quality=quality,
+            )
+        except Exception as e:
+            raise RuntimeError(f"VietVoice synthesis failed: {e}") from e
+
+    async def _synthesize_with_mms(self, text: str) -> tuple[bytes, float]:
         """Use MMS VITS model to synthesize speech (fallback)."""
         try:
             await run_in_threadpool(self.load)
@@ -214,7 +494,7 @@ class TTSService:
         model = self._model
         device = self._device or "cpu"
 
-        def _infer_and_write() -> tuple[str, float]:
+        def _infer_and_encode() -> tuple[bytes, float]:
             inputs = tokenizer(text, return_tensors="pt")
             if device.startswith("cuda"):
                 inputs = {k: v.to(device) for k, v in inputs.items()}
@@ -235,70 +515,162 @@ class TTSService:
             if peak > 1.0:
                 waveform = waveform / peak
 
-            pcm16 = (waveform * 32767.0).clip(-32768, 32767).astype(np.int16)
-
-            fd, wav_path = tempfile.mkstemp(suffix=".wav")
-            os.close(fd)
-            try:
-                with wave.open(wav_path, "wb") as wav_file:
-                    wav_file.setnchannels(1)
-                    wav_file.setsampwidth(2)
-                    wav_file.setframerate(self._sampling_rate)
-                    wav_file.writeframes(pcm16.tobytes())
-            except Exception:
-                with contextlib.suppress(OSError):
-                    os.remove(wav_path)
-                raise
-
+            pcm16 = _to_pcm16(waveform)
             duration_seconds = pcm16.size / float(self._sampling_rate)
-            return wav_path, duration_seconds
+            return _encode_wav(pcm16.astype("<i2", copy=False).tobytes(), self._sampling_rate), duration_seconds
 
         try:
-            return await run_in_threadpool(_infer_and_write)
+            return await run_in_threadpool(_infer_and_encode)
         except Exception as exc:
             raise HTTPException(status_code=500, detail=f"TTS synthesis failed: {exc}") from exc
 
-    async def synthesize(self, text: str) -> FileResponse:
-        """Generate speech and return FileResponse (.wav)."""
-        wav_path, duration_seconds = await self._synthesize_to_file(text)
+    async def synthesize(
+        self, text: str, quality: Optional[str] = None, audio_format: Optional[str] = None
+    ) -> Response:
+        """Generate speech and return it as a WAV (or compressed) response."""
+        quality = await self.resolve_request_quality(quality)
+        fmt = self.resolve_format(audio_format)
+        data, duration_seconds = await self._synthesize_audio(text, quality)
+        if fmt.needs_encoder:
+            bitrate = get_settings().tts_audio_bitrate_kbps
+            try:
+                data = await run_in_threadpool(encode_wav_bytes, data, fmt, bitrate)
+            except RuntimeError as exc:
+                raise HTTPException(status_code=500, detail=str(exc)) from exc
+
+        headers = {
+            "Content-Disposition": f'attachment; filename="speech.{fmt.extension}"',
+            "X-Audio-Duration": f"{duration_seconds:.2f}",
+            "X-Audio-Quality": quality,
+        }
+        return Response(content=data, media_type=fmt.content_type, headers=headers)
+
+    async def synthesize_stream(
+        self, text: str, quality: Optional[str] = None, audio_format: Optional[str] = None
+    ) -> StreamingResponse:
+        """Generate speech with VietVoice and stream it (WAV or encoded on the fly) while chunks are synthesized."""
+        text = self._normalize_text(text)
+        quality = await self.resolve_request_quality(quality)
+        fmt = self.resolve_format(audio_format)
+
+        if not self._use_vietvoice or stream_vietvoice is None:
+            raise HTTPException(status_code=503, detail="Streaming synthesis requires VietVoice TTS")
 
-        headers = {"X-Audio-Duration": f"{duration_seconds:.2f}"}
+        try:
+            api = await run_in_threadpool(vietvoice_registry.get)
+        except RuntimeError as exc:
+            raise HTTPException(status_code=500, detail=str(exc)) from exc
 
-        def _cleanup(path: str) -> None:
-            with contextlib.suppress(OSError):
-                os.remove(path)
+        gender = self._vietvoice_gender
+        area = self._vietvoice_area
+        emotion = self._vietvoice_emotion
 
-        background = BackgroundTask(_cleanup, wav_path)
+        bitrate = get_settings().tts_audio_bitrate_kbps
 
-        return FileResponse(
-            wav_path,
-            media_type="audio/wav",
-            filename="speech.wav",
-            headers=headers,
-            background=background,
+        def _stream():
+            segments = stream_vietvoice(
+                text=text,
+                api=api,
+                gender=gender,
+                area=area,
+                emotion=emotion,
+                quality=quality,
+            )
+            if fmt.needs_encoder:
+                yield from encode_pcm_stream(segments, fmt, api.config.sample_rate, bitrate)
+                return
+            yield _streaming_wav_header(api.config.sample_rate)
+            yield from segments
+
+        return StreamingResponse(
+            _stream(),
+            media_type=fmt.content_type,
+            headers={"Content-Disposition": f'inline; filename="speech.{fmt.extension}"', "X-Audio-Quality": quality},
+        )
+
+    @property
+    def supports_pcm_stream(self) -> bool:
+        return self._use_vietvoice and stream_vietvoice is not None
+
+    def open_pcm_stream(self, text: str, quality: str) -> tuple[Iterator[bytes], int]:
+        """Blocking chunk-by-chunk PCM from the resident engine, for use from worker threads.
+
+        Returns the segment iterator (one cross-faded segment per engine chunk) and its sample rate.
+        """
+        if not self.supports_pcm_stream:
+            raise RuntimeError("Chunked synthesis requires VietVoice TTS")
+        text = self._normalize_text(text)
+        api = vietvoice_registry.get()
+        segments = stream_vietvoice(
+            text=text,
+            api=api,
+            gender=self._vietvoice_gender,
+            area=self._vietvoice_area,
+            emotion=self._vietvoice_emotion,
+            quality=quality,
         )
+        return segments, api.config.sample_rate
+
+    async def cache_key(self, text: str, quality: Optional[str] = None) -> str:
+        """Content address of the audio this service would produce for ``text``."""
+        text = self._normalize_text(text)
+        quality = await self.resolve_request_quality(quality)
+
+        if not self._use_vietvoice:
+            return make_cache_key(text, backend="mms", model=self._model_name)
 
-    async def synthesize_bytes(self, text: str) -> tuple[bytes, float]:
-        """Generate speech and return bytes content along with duration."""
         try:
-            wav_path, duration_seconds = await self._synthesize_to_file(text)
+            if self._process_pool is not None:
+                cleaned, fields = await self._process_pool.cache_key_fields(text, quality)
+            else:
+                api = await run_in_threadpool(vietvoice_registry.get)
+                cleaned, fields = _vietvoice_key_fields(api, text, quality)
+        except RuntimeError as exc:
+            raise HTTPException(status_code=500, detail=str(exc)) from exc
+
+        return make_cache_key(
+            cleaned,
+            backend="vietvoice",
+            gender=self._vietvoice_gender,
+            area=self._vietvoice_area,
+            emotion=self._vietvoice_emotion,
+            **fields,
+        )
+
+    async def synthesize_bytes(
+        self,
+        text: str,
+        cache_key: Optional[str] = None,
+        quality: Optional[str] = None,
+    ) -> tuple[bytes, float]:
+        """Generate speech and return bytes content along with duration.
+
+        Results are served from / stored into the local audio cache when one is configured.
+        """
+        quality = await self.resolve_request_quality(quality)
+        if self._audio_cache is not None and self._audio_cache.enabled:
+            cache_key = cache_key or await self.cache_key(text, quality)
+            cached = await run_in_threadpool(self._audio_cache.get, cache_key)
+            if cached is not None:
+                return cached, _wav_duration(cached)
+        else:
+            cache_key = None
+
+        try:
+            data, duration_seconds = await self._synthesize_audio(text, quality)
         except HTTPException:
             raise  # Re-raise HTTPExceptions as-is
         except Exception as exc:
             raise HTTPException(status_code=500, detail=f"TTS synthesis failed: {exc}") from exc
 
-        try:
-            with open(wav_path, "rb") as wav_file:
-                data = wav_file.read()
-        except Exception as exc:
-            raise HTTPException(status_code=500, detail=f"Failed to read audio file: {exc}") from exc
-        finally:
-            with contextlib.suppress(OSError):
-                os.remove(wav_path)
+        if cache_key is not None:
+            await run_in_threadpool(self._audio_cache.put, cache_key, data)
 
         return data, duration_seconds
 
 
+_settings = get_settings()
+
 tts_service = TTSService(
     model_name="sonktx/mms-tts-vie-finetuned",
     prefer_gpu=True,         
@@ -309,10 +681,59 @@ tts_service = TTSService(
     vietvoice_gender="female",
     vietvoice_area="central",
     vietvoice_emotion="neutral",
+    audio_cache=DiskAudioCache(_settings.tts_cache_dir, _settings.tts_cache_max_mb * 1024 * 1024),
 )
 
 
+def _start_process_pool() -> None:
+    from .tts_pool import VietVoiceProcessPool, parse_core_sets
+
+    core_sets = parse_core_sets(_settings.tts_process_cores) if _settings.tts_process_cores else None
+    pool = VietVoiceProcessPool(_settings.tts_process_workers, core_sets=core_sets, prefer_gpu=tts_service._prefer_gpu)
+    try:
+        pool.start()
+    except Exception as exc:
+        print(f"VietVoice process pool failed to start, using the in-process engine: {exc}")
+        pool.shutdown()
+        vietvoice_registry.get()
+        return
+    tts_service.use_process_pool(pool)
+
+
+def _start_batcher() -> None:
+    from .tts_batcher import TTSMicroBatcher
+
+    tts_service.use_batcher(
+        TTSMicroBatcher(
+            tts_service.synthesize_vietvoice_batch,
+            window_seconds=_settings.tts_batch_window_ms / 1000.0,
+            max_batch=_settings.tts_batch_max_size,
+            max_chars=_settings.tts_batch_max_chars,
+        )
+    )
+
+
 def on_startup() -> None:
     """Attempt to warm the TTS model on application startup."""
+    if tts_service.uses_vietvoice:
+        with contextlib.suppress(RuntimeError):
+            if _settings.tts_process_workers > 0:
+                _start_process_pool()
+            elif _settings.tts_workers <= 0:
+                # With job workers each of them holds a model copy already; the API process
+                # then loads its own only when /api/tts is first used
+                vietvoice_registry.get()
+        if tts_service.process_pool is None and _settings.tts_batch_window_ms > 0:
+            _start_batcher()
     with contextlib.suppress(RuntimeError):
         tts_service.load()
+
+
+def on_shutdown() -> None:
+    """Stop the VietVoice worker processes and release the resident engine."""
+    tts_service.use_batcher(None)
+    pool = tts_service.process_pool
+    if pool is not None:
+        tts_service.use_process_pool(None)
+        pool.shutdown()
+    vietvoice_registry.shutdown()
@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Callable, Optional
+
+from starlette.concurrency import run_in_threadpool
+
+logger = logging.getLogger(__name__)
+
+# Blocking ``(texts, quality) -> (PCM per text, sample rate)``, run in the threadpool
+BatchRunner = Callable[[list[str], str], tuple[list[bytes], int]]
+
+
+@dataclass
+class _Batch:
+    texts: list[str] = field(default_factory=list)
+    futures: list[asyncio.Future] = field(default_factory=list)
+    timer: Optional[asyncio.TimerHandle] = None
+
+
+class TTSMicroBatcher:
+    """Collect short synthesis requests that arrive close together and run them as one batch.
+
+    The first request of a quality tier opens a batch; requests of the same tier join it
+    until ``window_seconds`` have passed or ``max_batch`` requests are waiting. The batch
+    then runs once through ``run_batch`` and every caller gets its own PCM back. Tiers are
+    never mixed because the chunks of one batch share a transformer loop (same NFE steps).
+    """
+
+    def __init__(self, run_batch: BatchRunner, window_seconds: float, max_batch: int, max_chars: int) -> None:
+        self._run_batch = run_batch
+        self.window_seconds = max(window_seconds, 0.0)
+        self.max_batch = max(max_batch, 1)
+        self.max_chars = max_chars
+        self._open: dict[str, _Batch] = {}
+        self._running: set[asyncio.Task] = set()
+        self._batches = 0
+        self._requests = 0
+        self._largest = 0
+
+    def accepts(self, text: str) -> bool:
+        """Whether ``text`` is short enough to wait for batch mates."""
+        return len(text) <= self.max_chars
+
+    async def submit(self, text: str, quality: str) -> tuple[bytes, int]:
+        """Synthesize ``text`` in the next batch of its quality tier; returns (int16 PCM, sample rate)."""
+        loop = asyncio.get_running_loop()
+        future: asyncio.Future = loop.create_future()
+        batch = self._open.get(quality)
+        if batch is None:
+            batch = self._open[quality] = _Batch()
+            batch.timer = loop.call_later(self.window_seconds, self._close, quality, batch)
+        batch.texts.append(text)
+        batch.futures.append(future)
+        if len(batch.texts) >= self.max_batch:
+            self._close(quality, batch)
+        return await future
+
+    def _close(self, quality: str, batch: _Batch) -> None:
+        if self._open.get(quality) is not batch:
+            return  # Already closed by the size limit
+        del self._open[quality]
+        if batch.timer is not None:
+            batch.timer.cancel()
+        task = asyncio.get_running_loop().create_task(self._run(quality, batch))
+        self._running.add(task)
+        task.add_done_callback(self._running.discard)
+
+    async def _run(self, quality: str, batch: _Batch) -> None:
+        try:
+            pcms, sample_rate = await run_in_threadpool(self._run_batch, batch.texts, quality)
+        except Exception as exc:
+            logger.warning("Batched synthesis of %s requests failed: %s", len(batch.texts), exc)
+            for future in batch.futures:
+                if not future.done():
+                    future.set_exception(exc)
+            return
+
+        self._batches += 1
+        self._requests += len(batch.texts)
+        self._largest = max(self._largest, len(batch.texts))
+        for future, pcm in zip(batch.futures, pcms):
+            if not future.done():  # The caller may have gone away
+                future.set_result((pcm, sample_rate))
+
+    def status(self) -> dict[str, Any]:
+        return {
+            "windowMs": self.window_seconds * 1000,
+            "maxBatch": self.max_batch,
+            "maxChars": self.max_chars,
+            "batches": self._batches,
+            "requests": self._requests,
+            "meanBatch": self._requests / self._batches if self._batches else None,
+            "largestBatch": self._largest,
+            "waiting": sum(len(batch.texts) for batch in self._open.values()),
+        }
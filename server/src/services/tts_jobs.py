@@ -0,0 +1,706 @@
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import logging
+import multiprocessing
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Optional
+
+from starlette.concurrency import run_in_threadpool
+
+from ..entities import ProcessingStatus
+from ..utils.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+PRIORITY_LOW = 0
+PRIORITY_NORMAL = 10
+PRIORITY_HIGH = 20
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS tts_jobs (
+    id TEXT PRIMARY KEY,
+    story_id TEXT NOT NULL,
+    author_id TEXT,
+    content TEXT NOT NULL,
+    priority INTEGER NOT NULL DEFAULT 0,
+    status TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    max_attempts INTEGER NOT NULL DEFAULT 3,
+    error TEXT,
+    audio_url TEXT,
+    quality TEXT,
+    audio_quality TEXT,
+    playlist_url TEXT,
+    worker TEXT,
+    heartbeat_at REAL,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE UNIQUE INDEX IF NOT EXISTS tts_jobs_pending_story
+    ON tts_jobs (story_id) WHERE status = 'PENDING';
+CREATE INDEX IF NOT EXISTS tts_jobs_claim
+    ON tts_jobs (status, priority DESC, created_at);
+CREATE INDEX IF NOT EXISTS tts_jobs_story
+    ON tts_jobs (story_id, created_at DESC);
+"""
+
+# Columns added after the first release of the schema, applied to existing databases on open
+_ADDED_COLUMNS = {
+    "quality": "TEXT",
+    "audio_quality": "TEXT",
+    "playlist_url": "TEXT",
+    "heartbeat_at": "REAL",
+}
+
+
+@dataclass(slots=True)
+class TTSJob:
+    id: str
+    story_id: str
+    author_id: Optional[str]
+    content: str
+    priority: int
+    status: ProcessingStatus
+    attempts: int
+    max_attempts: int
+    error: Optional[str]
+    audio_url: Optional[str]
+    worker: Optional[str]
+    created_at: float
+    updated_at: float
+    quality: Optional[str] = None
+    audio_quality: Optional[str] = None
+    playlist_url: Optional[str] = None
+    heartbeat_at: Optional[float] = None
+
+    @property
+    def is_finished(self) -> bool:
+        return self.status in (ProcessingStatus.COMPLETED, ProcessingStatus.FAILED)
+
+    @classmethod
+    def from_row(cls, row: sqlite3.Row) -> "TTSJob":
+        data = dict(row)
+        data["status"] = ProcessingStatus(data["status"])
+        return cls(**data)
+
+
+class TTSJobQueue:
+    """SQLite-backed durable queue of story audio jobs.
+
+    Every call opens its own connection, so the queue can be shared between the web
+    process and the TTS worker processes. At most one PENDING job exists per story:
+    re-submitting a story merges into the queued job instead of rendering it twice.
+
+    A claimed job is leased to its worker, which renews the lease with ``heartbeat``
+    while it renders. Only jobs whose lease ran out are treated as abandoned, so
+    several web processes can share the queue without taking each other's jobs.
+    """
+
+    def __init__(self, db_path: str, max_attempts: int = 3) -> None:
+        self._db_path = str(Path(db_path).expanduser())
+        self._max_attempts = max_attempts
+        Path(self._db_path).parent.mkdir(parents=True, exist_ok=True)
+        with contextlib.closing(self._connect()) as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+            existing = {row["name"] for row in conn.execute("PRAGMA table_info(tts_jobs)")}
+            for column, column_type in _ADDED_COLUMNS.items():
+                if column not in existing:
+                    conn.execute(f"ALTER TABLE tts_jobs ADD COLUMN {column} {column_type}")
+
+    @property
+    def db_path(self) -> str:
+        return self._db_path
+
+    @property
+    def max_attempts(self) -> int:
+        return self._max_attempts
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self._db_path, timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    @contextlib.contextmanager
+    def _transaction(self):
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            yield conn
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+
+    @staticmethod
+    def _fetch(conn: sqlite3.Connection, job_id: str) -> TTSJob:
+        row = conn.execute("SELECT * FROM tts_jobs WHERE id = ?", (job_id,)).fetchone()
+        return TTSJob.from_row(row)
+
+    def enqueue(
+        self,
+        story_id: str,
+        content: str,
+        author_id: Optional[str] = None,
+        priority: int = PRIORITY_NORMAL,
+        quality: Optional[str] = None,
+    ) -> TTSJob:
+        """Queue a story render, de-duplicating against work already queued for the story.
+
+        ``quality`` is the requested tier (``None`` for the server default); ``adaptive`` is
+        resolved only when a worker picks the job up.
+        """
+        now = time.time()
+        with self._transaction() as conn:
+            pending = conn.execute(
+                "SELECT id FROM tts_jobs WHERE story_id = ? AND status = ?",
+                (story_id, ProcessingStatus.PENDING.value),
+            ).fetchone()
+            if pending is not None:
+                conn.execute(
+                    "UPDATE tts_jobs SET content = ?, author_id = COALESCE(?, author_id), "
+                    "priority = MAX(priority, ?), quality = COALESCE(?, quality), updated_at = ? WHERE id = ?",
+                    (content, author_id, priority, quality, now, pending["id"]),
+                )
+                return self._fetch(conn, pending["id"])
+
+            running = conn.execute(
+                "SELECT id FROM tts_jobs WHERE story_id = ? AND status = ? AND content = ? AND quality IS ?",
+                (story_id, ProcessingStatus.PROCESSING.value, content, quality),
+            ).fetchone()
+            if running is not None:
+                return self._fetch(conn, running["id"])
+
+            job_id = str(uuid.uuid4())
+            conn.execute(
+                "INSERT INTO tts_jobs (id, story_id, author_id, content, priority, quality, status, attempts, "
+                "max_attempts, created_at, updated_at) VALUES (?, ?, ?, ?, ?, ?, ?, 0, ?, ?, ?)",
+                (
+                    job_id,
+                    story_id,
+                    author_id,
+                    content,
+                    priority,
+                    quality,
+                    ProcessingStatus.PENDING.value,
+                    self._max_attempts,
+                    now,
+                    now,
+                ),
+            )
+            return self._fetch(conn, job_id)
+
+    def claim(self, worker: str) -> Optional[TTSJob]:
+        """Atomically take the highest-priority, oldest pending job and lease it to ``worker``."""
+        with self._transaction() as conn:
+            row = conn.execute(
+                "SELECT id FROM tts_jobs WHERE status = ? ORDER BY priority DESC, created_at LIMIT 1",
+                (ProcessingStatus.PENDING.value,),
+            ).fetchone()
+            if row is None:
+                return None
+            now = time.time()
+            conn.execute(
+                "UPDATE tts_jobs SET status = ?, attempts = attempts + 1, worker = ?, heartbeat_at = ?, "
+                "updated_at = ? WHERE id = ?",
+                (ProcessingStatus.PROCESSING.value, worker, now, now, row["id"]),
+            )
+            return self._fetch(conn, row["id"])
+
+    def heartbeat(self, job_id: str, worker: str) -> None:
+        """Renew the lease of a job the worker is still rendering."""
+        with self._transaction() as conn:
+            conn.execute(
+                "UPDATE tts_jobs SET heartbeat_at = ? WHERE id = ? AND worker = ? AND status = ?",
+                (time.time(), job_id, worker, ProcessingStatus.PROCESSING.value),
+            )
+
+    def set_audio_quality(self, job_id: str, audio_quality: str) -> None:
+        """Record the concrete tier a worker chose for the job."""
+        with self._transaction() as conn:
+            conn.execute(
+                "UPDATE tts_jobs SET audio_quality = ?, updated_at = ? WHERE id = ?",
+                (audio_quality, time.time(), job_id),
+            )
+
+    def set_playlist_url(self, job_id: str, playlist_url: str) -> None:
+        """Record the HLS playlist that becomes playable while the job is still rendering."""
+        with self._transaction() as conn:
+            conn.execute(
+                "UPDATE tts_jobs SET playlist_url = ?, updated_at = ? WHERE id = ?",
+                (playlist_url, time.time(), job_id),
+            )
+
+    def complete(self, job_id: str, audio_url: str, worker: Optional[str] = None) -> Optional[TTSJob]:
+        """Record the rendered audio; returns None when ``worker`` no longer holds the job.
+
+        A worker whose lease expired may finish after its job was requeued or claimed by
+        another worker, and must not overwrite that attempt.
+        """
+        with self._transaction() as conn:
+            updated = conn.execute(
+                "UPDATE tts_jobs SET status = ?, audio_url = ?, error = NULL, updated_at = ? "
+                "WHERE id = ? AND status = ? AND worker IS COALESCE(?, worker)",
+                (
+                    ProcessingStatus.COMPLETED.value,
+                    audio_url,
+                    time.time(),
+                    job_id,
+                    ProcessingStatus.PROCESSING.value,
+                    worker,
+                ),
+            ).rowcount
+            return self._fetch(conn, job_id) if updated else None
+
+    def fail(self, job_id: str, error: str, worker: Optional[str] = None) -> Optional[TTSJob]:
+        """Record a failed attempt; the job goes back to PENDING until it runs out of attempts.
+
+        Returns None when ``worker`` no longer holds the job, like ``complete``.
+        """
+        with self._transaction() as conn:
+            job = self._fetch(conn, job_id)
+            if job.status != ProcessingStatus.PROCESSING or (worker is not None and job.worker != worker):
+                return None
+            self._fail_attempt(conn, job, error)
+            return self._fetch(conn, job_id)
+
+    def is_superseded(self, job: TTSJob) -> bool:
+        """Whether a newer job was queued for the job's story since it was created."""
+        with contextlib.closing(self._connect()) as conn:
+            row = conn.execute(
+                "SELECT 1 FROM tts_jobs WHERE story_id = ? AND id != ? AND created_at >= ? LIMIT 1",
+                (job.story_id, job.id, job.created_at),
+            ).fetchone()
+        return row is not None
+
+    def _fail_attempt(self, conn: sqlite3.Connection, job: TTSJob, error: str) -> ProcessingStatus:
+        status = ProcessingStatus.FAILED
+        if job.attempts < job.max_attempts and not self._has_pending(conn, job.story_id):
+            status = ProcessingStatus.PENDING
+        conn.execute(
+            "UPDATE tts_jobs SET status = ?, error = ?, updated_at = ? WHERE id = ?",
+            (status.value, error, time.time(), job.id),
+        )
+        return status
+
+    def release_worker(self, worker: str, error: str) -> int:
+        """Count the job of a worker that died as a failed attempt; returns the jobs released."""
+        with self._transaction() as conn:
+            rows = conn.execute(
+                "SELECT * FROM tts_jobs WHERE worker = ? AND status = ?",
+                (worker, ProcessingStatus.PROCESSING.value),
+            ).fetchall()
+            for row in rows:
+                self._fail_attempt(conn, TTSJob.from_row(row), error)
+        return len(rows)
+
+    def requeue_stale(self, lease_seconds: float) -> int:
+        """Fail the current attempt of jobs whose lease ran out; returns how many went back to PENDING.
+
+        Like any failed attempt, a job is only requeued while it has attempts left, so a
+        story that keeps crashing its worker ends up FAILED instead of cycling forever.
+        """
+        requeued = 0
+        cutoff = time.time() - lease_seconds
+        with self._transaction() as conn:
+            rows = conn.execute(
+                "SELECT * FROM tts_jobs WHERE status = ? AND COALESCE(heartbeat_at, updated_at) < ?",
+                (ProcessingStatus.PROCESSING.value, cutoff),
+            ).fetchall()
+            for row in rows:
+                job = TTSJob.from_row(row)
+                error = f"Worker {job.worker} stopped renewing its lease"
+                if self._fail_attempt(conn, job, error) == ProcessingStatus.PENDING:
+                    requeued += 1
+        return requeued
+
+    @staticmethod
+    def _has_pending(conn: sqlite3.Connection, story_id: str) -> bool:
+        row = conn.execute(
+            "SELECT 1 FROM tts_jobs WHERE story_id = ? AND status = ?",
+            (story_id, ProcessingStatus.PENDING.value),
+        ).fetchone()
+        return row is not None
+
+    def get(self, job_id: str) -> Optional[TTSJob]:
+        with contextlib.closing(self._connect()) as conn:
+            row = conn.execute("SELECT * FROM tts_jobs WHERE id = ?", (job_id,)).fetchone()
+        return TTSJob.from_row(row) if row is not None else None
+
+    def latest_for_story(self, story_id: str) -> Optional[TTSJob]:
+        with contextlib.closing(self._connect()) as conn:
+            row = conn.execute(
+                "SELECT * FROM tts_jobs WHERE story_id = ? ORDER BY created_at DESC LIMIT 1",
+                (story_id,),
+            ).fetchone()
+        return TTSJob.from_row(row) if row is not None else None
+
+    def depth(self) -> int:
+        """Number of jobs waiting to be claimed."""
+        with contextlib.closing(self._connect()) as conn:
+            row = conn.execute(
+                "SELECT COUNT(*) FROM tts_jobs WHERE status = ?",
+                (ProcessingStatus.PENDING.value,),
+            ).fetchone()
+        return int(row[0])
+
+    async def wait(self, job_id: str, poll_interval: float = 1.0, timeout: Optional[float] = None) -> TTSJob:
+        """Wait until a job reaches COMPLETED or FAILED, polling the database off the event loop."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            job = await run_in_threadpool(self.get, job_id)
+            if job is None:
+                raise KeyError(job_id)
+            if job.is_finished:
+                return job
+            if deadline is not None and time.monotonic() >= deadline:
+                raise TimeoutError(f"TTS job {job_id} did not finish in {timeout}s")
+            await asyncio.sleep(poll_interval)
+
+
+def _update_story_audio(supabase: Any, story_id: str, values: dict[str, Any]) -> None:
+    try:
+        supabase.table("stories").update(values).eq("id", story_id).execute()
+    except Exception as exc:  # pragma: no cover - logging only
+        logger.warning("Failed to update audio status for story %s: %s", story_id, exc)
+
+
+def _service_client() -> Any:
+    from supabase import create_client
+
+    settings = get_settings()
+    return create_client(str(settings.supabase_url), settings.supabase_service_role_key)
+
+
+# Step Upload - 8: Worker job generating story audio files
+async def run_story_audio_job(queue: TTSJobQueue, job: TTSJob, supabase: Any = None) -> TTSJob:
+    """Render one claimed job and mirror its outcome into the stories table."""
+    from .story_audio import publish_story_audio
+    from .tts import tts_service
+
+    if supabase is None:
+        supabase = _service_client()
+
+    try:
+        # Adaptive requests are resolved here so the tier reflects the backlog at render time
+        queue_depth = await run_in_threadpool(queue.depth)
+        quality = tts_service.resolve_quality(job.quality, queue_depth=queue_depth)
+        await run_in_threadpool(queue.set_audio_quality, job.id, quality)
+        await run_in_threadpool(
+            _update_story_audio,
+            supabase,
+            job.story_id,
+            {"audio_status": ProcessingStatus.PROCESSING.value, "audio_quality": quality},
+        )
+        logger.info(
+            "Starting audio generation for story %s (job %s, attempt %s, quality %s)",
+            job.story_id,
+            job.id,
+            job.attempts,
+            quality,
+        )
+
+        def _on_playlist(playlist_url: str) -> None:
+            # Listeners can start playback from here on, long before the full file is uploaded
+            queue.set_playlist_url(job.id, playlist_url)
+            _update_story_audio(supabase, job.story_id, {"audio_playlist_url": playlist_url})
+
+        audio_url = await publish_story_audio(supabase, job.content, quality=quality, on_playlist=_on_playlist)
+    except Exception as exc:
+        logger.error("Failed to generate audio for story %s: %s", job.story_id, exc)
+        finished = await run_in_threadpool(queue.fail, job.id, str(exc), job.worker)
+    else:
+        finished = await run_in_threadpool(queue.complete, job.id, audio_url, job.worker)
+
+    if finished is None:
+        # The lease expired while rendering; whoever holds the job now reports its outcome
+        logger.warning("Job %s is no longer held by %s, dropping its outcome", job.id, job.worker)
+        return await run_in_threadpool(queue.get, job.id)
+
+    values = {"audio_status": finished.status.value}
+    if finished.status == ProcessingStatus.COMPLETED:
+        values["audio_url"] = finished.audio_url
+        logger.info("Successfully generated audio for story %s", job.story_id)
+    # Once a newer job for the story is queued, that job reports the story's status
+    if not await run_in_threadpool(queue.is_superseded, finished):
+        await run_in_threadpool(_update_story_audio, supabase, finished.story_id, values)
+    return finished
+
+
+def _renew_lease(queue: TTSJobQueue, job_id: str, worker: str, done: threading.Event, interval: float) -> None:
+    while not done.wait(interval):
+        with contextlib.suppress(sqlite3.Error):
+            queue.heartbeat(job_id, worker)
+
+
+def _worker_main(
+    db_path: str,
+    max_attempts: int,
+    worker: str,
+    stop_event: Any,
+    poll_interval: float,
+    lease_seconds: float,
+) -> None:
+    """Entry point of a TTS worker process."""
+    from .tts import vietvoice_registry
+
+    queue = TTSJobQueue(db_path, max_attempts=max_attempts)
+    with contextlib.suppress(RuntimeError):
+        vietvoice_registry.get()
+
+    while not stop_event.is_set():
+        job = queue.claim(worker)
+        if job is None:
+            stop_event.wait(poll_interval)
+            continue
+        done = threading.Event()
+        heartbeat = threading.Thread(
+            target=_renew_lease,
+            args=(queue, job.id, worker, done, lease_seconds / 3),
+            name=f"{worker}-lease",
+            daemon=True,
+        )
+        heartbeat.start()
+        try:
+            asyncio.run(run_story_audio_job(queue, job))
+        except Exception as exc:  # pragma: no cover - defensive
+            logger.exception("TTS worker %s crashed on job %s", worker, job.id)
+            queue.fail(job.id, str(exc), worker)
+        finally:
+            done.set()
+            heartbeat.join()
+
+
+class TTSWorkerPool:
+    """Fixed-size, supervised pool of processes draining the TTS job queue.
+
+    A supervisor thread restarts workers that die, counting the job a dead worker held
+    as a failed attempt, and fails the current attempt of jobs whose lease expired
+    (their worker belonged to a process that is gone). Worker names include the parent
+    pid, so pools of several web processes sharing one queue never touch each other's jobs.
+    """
+
+    # Longest wait before restarting a worker that keeps dying right after it starts
+    MAX_RESTART_DELAY = 60.0
+    # A worker that lived this long before dying is restarted without delay
+    HEALTHY_UPTIME = 60.0
+
+    def __init__(
+        self,
+        queue: TTSJobQueue,
+        workers: int,
+        poll_interval: float = 1.0,
+        lease_seconds: float = 60.0,
+    ) -> None:
+        self._queue = queue
+        self._workers = workers
+        self._poll_interval = poll_interval
+        self._lease_seconds = lease_seconds
+        self._context = multiprocessing.get_context("spawn")
+        self._stop_event = None
+        self._processes: list[Any] = []
+        self._started_at: list[float] = []
+        self._restart_at: list[float] = []
+        self._quick_deaths: list[int] = []
+        self._supervisor: Optional[threading.Thread] = None
+        self._stopping = threading.Event()
+        self._restarts = 0
+
+    @property
+    def size(self) -> int:
+        return self._workers
+
+    @property
+    def restarts(self) -> int:
+        return self._restarts
+
+    def _worker_name(self, index: int) -> str:
+        return f"tts-worker-{os.getpid()}-{index}"
+
+    def _spawn(self, index: int) -> None:
+        process = self._context.Process(
+            target=_worker_main,
+            args=(
+                self._queue.db_path,
+                self._queue.max_attempts,
+                self._worker_name(index),
+                self._stop_event,
+                self._poll_interval,
+                self._lease_seconds,
+            ),
+            name=self._worker_name(index),
+            daemon=True,
+        )
+        process.start()
+        self._processes[index] = process
+        self._started_at[index] = time.monotonic()
+
+    def start(self) -> None:
+        if self._processes:
+            return
+        self._stopping.clear()
+        self._stop_event = self._context.Event()
+        self._processes = [None] * self._workers
+        self._started_at = [0.0] * self._workers
+        self._restart_at = [0.0] * self._workers
+        self._quick_deaths = [0] * self._workers
+        for index in range(self._workers):
+            self._spawn(index)
+        self._supervisor = threading.Thread(target=self._supervise, name="tts-worker-supervisor", daemon=True)
+        self._supervisor.start()
+
+    def _supervise(self) -> None:
+        while not self._stopping.wait(max(self._poll_interval, 0.1)):
+            try:
+                self.check()
+            except Exception:  # pragma: no cover - keep supervising
+                logger.exception("TTS worker supervision failed")
+
+    def check(self) -> None:
+        """One supervisor round: restart dead workers and requeue jobs whose lease expired."""
+        now = time.monotonic()
+        for index, process in enumerate(self._processes):
+            if self._stopping.is_set():
+                return
+            if process is not None:
+                if process.is_alive():
+                    continue
+                # The worker just died: its job counts as a failed attempt
+                worker = self._worker_name(index)
+                released = self._queue.release_worker(worker, f"Worker {worker} exited with code {process.exitcode}")
+                logger.warning(
+                    "TTS worker %s exited with code %s, released %s job(s)", worker, process.exitcode, released
+                )
+                # Back off exponentially while a worker keeps dying soon after it starts
+                if now - self._started_at[index] < self.HEALTHY_UPTIME:
+                    self._quick_deaths[index] += 1
+                else:
+                    self._quick_deaths[index] = 0
+                self._restart_at[index] = now + min(2 ** self._quick_deaths[index] - 1, self.MAX_RESTART_DELAY)
+                self._processes[index] = None
+            if now >= self._restart_at[index]:
+                self._spawn(index)
+                self._restarts += 1
+
+        requeued = self._queue.requeue_stale(self._lease_seconds)
+        if requeued:
+            logger.info("Requeued %s TTS jobs with an expired lease", requeued)
+
+    def stop(self, timeout: float = 10.0) -> None:
+        self._stopping.set()
+        if self._supervisor is not None:
+            self._supervisor.join(timeout)
+            self._supervisor = None
+        if self._stop_event is not None:
+            self._stop_event.set()
+        for process in self._processes:
+            if process is None:
+                continue
+            process.join(timeout)
+            if process.is_alive():
+                process.terminate()
+        self._processes = []
+
+
+class InProcessTTSConsumer:
+    """Drains the TTS job queue on the API process's event loop when no worker processes run.
+
+    Renders one job at a time with the API process's own engine, keeping the job's lease
+    alive like a worker does and requeueing expired leases while idle.
+    """
+
+    def __init__(self, queue: TTSJobQueue, poll_interval: float = 1.0, lease_seconds: float = 60.0) -> None:
+        self._queue = queue
+        self._poll_interval = poll_interval
+        self._lease_seconds = lease_seconds
+        self._worker = f"tts-inprocess-{os.getpid()}"
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def worker(self) -> str:
+        return self._worker
+
+    def start(self) -> None:
+        """Start consuming; must be called from the running event loop."""
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._consume(), name=self._worker)
+
+    async def _consume(self) -> None:
+        supabase = None
+        while True:
+            job = await run_in_threadpool(self._queue.claim, self._worker)
+            if job is None:
+                requeued = await run_in_threadpool(self._queue.requeue_stale, self._lease_seconds)
+                if requeued:
+                    logger.info("Requeued %s TTS jobs with an expired lease", requeued)
+                await asyncio.sleep(self._poll_interval)
+                continue
+            done = threading.Event()
+            heartbeat = threading.Thread(
+                target=_renew_lease,
+                args=(self._queue, job.id, self._worker, done, self._lease_seconds / 3),
+                name=f"{self._worker}-lease",
+                daemon=True,
+            )
+            heartbeat.start()
+            try:
+                if supabase is None:
+                    supabase = await run_in_threadpool(_service_client)
+                await run_story_audio_job(self._queue, job, supabase=supabase)
+            except Exception as exc:
+                logger.exception("In-process TTS consumer failed on job %s", job.id)
+                await run_in_threadpool(self._queue.fail, job.id, str(exc), self._worker)
+            finally:
+                done.set()
+                await run_in_threadpool(heartbeat.join)
+
+    def stop(self) -> None:
+        # A job cancelled mid-render keeps its lease until it expires and is then retried
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+
+@lru_cache()
+def get_tts_job_queue() -> TTSJobQueue:
+    settings = get_settings()
+    return TTSJobQueue(settings.tts_job_db_path, max_attempts=settings.tts_job_max_attempts)
+
+
+_worker_pool: Optional[TTSWorkerPool] = None
+_consumer: Optional[InProcessTTSConsumer] = None
+
+
+def on_startup() -> None:
+    """Start the TTS worker processes, or drain the queue in-process with ``TTS_WORKERS=0``."""
+    global _worker_pool, _consumer
+    settings = get_settings()
+    if _worker_pool is not None or _consumer is not None:
+        return
+    if settings.tts_workers <= 0:
+        _consumer = InProcessTTSConsumer(get_tts_job_queue(), lease_seconds=settings.tts_job_lease_seconds)
+        _consumer.start()
+        return
+    _worker_pool = TTSWorkerPool(get_tts_job_queue(), settings.tts_workers, lease_seconds=settings.tts_job_lease_seconds)
+    _worker_pool.start()
+
+
+def on_shutdown() -> None:
+    global _worker_pool, _consumer
+    if _worker_pool is not None:
+        _worker_pool.stop()
+        _worker_pool = None
+    if _consumer is not None:
+        _consumer.stop()
+        _consumer = None
@@ -0,0 +1,281 @@
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import logging
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import replace
+from multiprocessing import shared_memory
+from typing import Any, Callable, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Per-process state of a pool worker, set by _init_worker
+_worker_registry: Optional[Any] = None
+_worker_index: Optional[int] = None
+_worker_cores: Optional[list[int]] = None
+_startup_barrier: Optional[Any] = None
+
+
+def parse_core_sets(spec: str) -> list[list[int]]:
+    """Parse ``"0-3;4-7"`` (or ``"0,1;2,3"``) into one CPU list per worker."""
+    core_sets = []
+    for group in spec.split(";"):
+        cores: list[int] = []
+        for part in group.split(","):
+            part = part.strip()
+            if not part:
+                continue
+            if "-" in part:
+                first, last = part.split("-", 1)
+                cores.extend(range(int(first), int(last) + 1))
+            else:
+                cores.append(int(part))
+        if cores:
+            core_sets.append(cores)
+    return core_sets
+
+
+def partition_cores(workers: int, cores: Optional[list[int]] = None) -> list[list[int]]:
+    """Split the usable CPUs into ``workers`` contiguous, non-overlapping subsets.
+
+    With fewer CPUs than workers the subsets wrap around and share cores.
+    """
+    if cores is None:
+        if hasattr(os, "sched_getaffinity"):
+            cores = sorted(os.sched_getaffinity(0))
+        else:
+            cores = list(range(os.cpu_count() or 1))
+    if workers <= 0:
+        return []
+    if len(cores) < workers:
+        return [[cores[index % len(cores)]] for index in range(workers)]
+    size, extra = divmod(len(cores), workers)
+    subsets = []
+    start = 0
+    for index in range(workers):
+        end = start + size + (1 if index < extra else 0)
+        subsets.append(cores[start:end])
+        start = end
+    return subsets
+
+
+def _init_worker(counter: Any, barrier: Any, core_sets: list[list[int]], prefer_gpu: bool) -> None:
+    """Pin the worker to its core subset and load the engine before the first task."""
+    global _worker_registry, _worker_index, _worker_cores, _startup_barrier
+
+    _startup_barrier = barrier
+    with counter.get_lock():
+        _worker_index = counter.value
+        counter.value += 1
+
+    cores = core_sets[_worker_index % len(core_sets)] if core_sets else None
+    if cores and hasattr(os, "sched_setaffinity"):
+        try:
+            os.sched_setaffinity(0, cores)
+            _worker_cores = cores
+        except OSError as exc:
+            logger.warning("Could not pin TTS worker %s to cores %s: %s", _worker_index, cores, exc)
+
+    from .tts import VietVoiceEngineRegistry, _vietvoice_config
+
+    def _config() -> Any:
+        config = replace(_vietvoice_config(), use_gpu=prefer_gpu)
+        if _worker_cores:
+            # One intra-op thread per pinned core, no oversubscription across workers or session sets
+            config = replace(config, intra_op_num_threads=max(1, len(_worker_cores) // config.parallel_sessions))
+        return config
+
+    _worker_registry = VietVoiceEngineRegistry(_config)
+    with contextlib.suppress(RuntimeError):
+        _worker_registry.get()
+
+
+def _worker_status() -> dict[str, Any]:
+    status = _worker_registry.status() if _worker_registry is not None else {"state": "cold"}
+    return {"index": _worker_index, "pid": os.getpid(), "cores": _worker_cores, **status}
+
+
+def _worker_started(timeout: Optional[float]) -> dict[str, Any]:
+    # Holding the task until every worker is here makes each startup task land on a different process
+    _startup_barrier.wait(timeout)
+    return _worker_status()
+
+
+def _worker_cache_key_fields(text: str, quality: str) -> tuple[str, dict[str, Any]]:
+    from .tts import _vietvoice_key_fields
+
+    return _vietvoice_key_fields(_worker_registry.get(), text, quality)
+
+
+def _worker_synthesize(text: str, gender: str, area: str, emotion: str, quality: str) -> tuple[str, int, int]:
+    """Synthesize in the worker and leave the int16 PCM in a shared memory block.
+
+    Returns the block name, the number of samples and the sample rate. The caller
+    owns the block from then on and must unlink it (see ``_take_pcm``).
+    """
+    from .tts import _to_pcm16
+
+    api = _worker_registry.get()
+    wave, _ = api.synthesize(text, gender=gender, area=area, emotion=emotion, quality=quality)
+    pcm = _to_pcm16(wave)
+
+    block = shared_memory.SharedMemory(create=True, size=max(pcm.nbytes, 1))
+    try:
+        np.ndarray(pcm.shape, dtype=np.int16, buffer=block.buf)[:] = pcm
+    finally:
+        block.close()
+    return block.name, pcm.size, api.config.sample_rate
+
+
+def _take_pcm(name: str, samples: int) -> bytes:
+    """Copy PCM out of a worker's shared memory block and release the block."""
+    block = shared_memory.SharedMemory(name=name)
+    try:
+        return bytes(block.buf[: samples * 2])
+    finally:
+        block.close()
+        block.unlink()
+
+
+def _release_pcm(result: tuple[str, int, int]) -> None:
+    """Unlink the shared memory block of a render nobody will take."""
+    name, _, _ = result
+    with contextlib.suppress(FileNotFoundError):
+        block = shared_memory.SharedMemory(name=name)
+        block.close()
+        block.unlink()
+
+
+def _release_result(future: Any, release: Callable[[Any], None]) -> None:
+    if future.done() and not future.cancelled() and future.exception() is None:
+        release(future.result())
+
+
+class VietVoiceProcessPool:
+    """Pre-warmed VietVoice engines in separate processes, each pinned to a core subset.
+
+    Keeps ONNX Runtime, numpy and audio work off the event loop's process and lets
+    several renders run on independent sessions at once. Audio comes back through
+    ``multiprocessing.shared_memory`` instead of being pickled or written to disk.
+    """
+
+    def __init__(self, workers: int, core_sets: Optional[list[list[int]]] = None, prefer_gpu: bool = True) -> None:
+        self._workers = workers
+        self._core_sets = core_sets if core_sets is not None else partition_cores(workers)
+        self._prefer_gpu = prefer_gpu
+        self._context = multiprocessing.get_context("spawn")
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._workers_status: list[dict[str, Any]] = []
+        self._start_seconds: Optional[float] = None
+        self._restart_lock = threading.Lock()
+        self._closed = False
+
+    @property
+    def size(self) -> int:
+        return self._workers
+
+    @property
+    def is_running(self) -> bool:
+        return self._executor is not None
+
+    def start(self, timeout: Optional[float] = None) -> None:
+        """Spawn the workers and wait until every one has loaded its engine."""
+        if self._executor is not None:
+            return
+        started = time.perf_counter()
+        self._executor = ProcessPoolExecutor(
+            max_workers=self._workers,
+            mp_context=self._context,
+            initializer=_init_worker,
+            initargs=(
+                self._context.Value("i", 0),
+                self._context.Barrier(self._workers),
+                self._core_sets,
+                self._prefer_gpu,
+            ),
+        )
+        # Each pending task forces one more process to spawn, so this warms all of them
+        futures = [self._executor.submit(_worker_started, timeout) for _ in range(self._workers)]
+        self._workers_status = [future.result(timeout) for future in futures]
+        self._start_seconds = time.perf_counter() - started
+        logger.info("Started %s VietVoice workers in %.2fs", self._workers, self._start_seconds)
+
+    def status(self) -> dict[str, Any]:
+        return {
+            "workers": self._workers,
+            "running": self.is_running,
+            "startSeconds": self._start_seconds,
+            "processes": self._workers_status,
+        }
+
+    def _restart(self, broken: ProcessPoolExecutor) -> None:
+        with self._restart_lock:
+            if self._executor is not broken:
+                return  # Another request already replaced it
+            self._executor = None
+            broken.shutdown(wait=False, cancel_futures=True)
+        # Spawning and warming the workers takes a while, so it must not hold up the failed request
+        threading.Thread(target=self._start_replacement, name="vietvoice-pool-restart", daemon=True).start()
+
+    def _start_replacement(self) -> None:
+        if self._closed:
+            return
+        try:
+            self.start()
+        except Exception:
+            logger.exception("Could not restart the VietVoice process pool")
+
+    async def _run(self, fn: Any, *args: Any, release: Optional[Callable[[Any], None]] = None) -> Any:
+        """Run ``fn`` on a worker. ``release`` frees the result if the caller is cancelled before taking it."""
+        executor = self._executor
+        if executor is None:
+            raise RuntimeError("VietVoice process pool is not running")
+        future: Future = executor.submit(fn, *args)
+        wrapped = asyncio.wrap_future(future)
+        if release is not None:
+
+            def _on_done(done: asyncio.Future) -> None:
+                # The worker may still be running; release its result once it has one
+                if done.cancelled():
+                    future.add_done_callback(lambda finished: _release_result(finished, release))
+
+            wrapped.add_done_callback(_on_done)
+        try:
+            return await wrapped
+        except asyncio.CancelledError:
+            if release is not None and not wrapped.cancelled():
+                # Cancelled after the result arrived but before this task resumed
+                _release_result(wrapped, release)
+            raise
+        except BrokenProcessPool as exc:
+            # A worker died (e.g. OOM-killed): fail this request and bring up a fresh pool
+            logger.error("VietVoice worker process died, restarting the pool: %s", exc)
+            self._restart(executor)
+            raise RuntimeError(f"VietVoice worker process died: {exc}") from exc
+
+    async def cache_key_fields(self, text: str, quality: str) -> tuple[str, dict[str, Any]]:
+        return await self._run(_worker_cache_key_fields, text, quality)
+
+    async def synthesize_pcm(
+        self, text: str, gender: str, area: str, emotion: str, quality: str
+    ) -> tuple[bytes, int]:
+        """Return (int16 mono PCM bytes, sample rate) rendered by a pool worker."""
+        name, samples, sample_rate = await self._run(
+            _worker_synthesize, text, gender, area, emotion, quality, release=_release_pcm
+        )
+        return _take_pcm(name, samples), sample_rate
+
+    def shutdown(self) -> None:
+        self._closed = True
+        executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+        self._workers_status = []
@@ -56,6 +56,34 @@ if BaseSettings is not None and Field is not None and field_validator is not Non
 
         ocr_service_enabled: bool = Field(True, env="OCR_SERVICE")
         tts_service_enabled: bool = Field(True, env="TTS_SERVICE")
+        tts_cache_dir: str = Field("~/.cache/httm/tts-audio", env="TTS_CACHE_DIR")
+        tts_cache_max_mb: int = Field(2048, env="TTS_CACHE_MAX_MB")
+        tts_audio_format: str = Field("opus", env="TTS_AUDIO_FORMAT")
+        tts_audio_bitrate_kbps: int = Field(48, env="TTS_AUDIO_BITRATE_KBPS")
+        tts_hls_segment_seconds: float = Field(0.0, env="TTS_HLS_SEGMENT_SECONDS")
+        tts_chunk_cache_dir: str = Field("~/.cache/httm/tts-chunks", env="TTS_CHUNK_CACHE_DIR")
+        tts_chunk_cache_max_mb: int = Field(1024, env="TTS_CHUNK_CACHE_MAX_MB")
+        tts_job_db_path: str = Field("~/.cache/httm/tts-jobs.sqlite3", env="TTS_JOB_DB_PATH")
+        tts_workers: int = Field(1, env="TTS_WORKERS")
+        tts_job_max_attempts: int = Field(3, env="TTS_JOB_MAX_ATTEMPTS")
+        tts_job_lease_seconds: float = Field(60.0, env="TTS_JOB_LEASE_SECONDS")
+        tts_generate_wait_seconds: float = Field(120.0, env="TTS_GENERATE_WAIT_SECONDS")
+        tts_process_workers: int = Field(0, env="TTS_PROCESS_WORKERS")
+        tts_process_cores: str = Field("", env="TTS_PROCESS_CORES")
+        tts_session_profile: str = Field("shared_host", env="TTS_SESSION_PROFILE")
+        tts_parallel_sessions: int = Field(1, env="TTS_PARALLEL_SESSIONS")
+        tts_pipelined: bool = Field(False, env="TTS_PIPELINED")
+        tts_batch_window_ms: float = Field(0.0, env="TTS_BATCH_WINDOW_MS")
+        tts_batch_max_size: int = Field(8, env="TTS_BATCH_MAX_SIZE")
+        tts_batch_max_chars: int = Field(300, env="TTS_BATCH_MAX_CHARS")
+        tts_chunk_buckets: int = Field(0, env="TTS_CHUNK_BUCKETS")
+        tts_duration_model: bool = Field(False, env="TTS_DURATION_MODEL")
+        tts_precision: str = Field("fp32", env="TTS_PRECISION")
+        tts_cache_optimized_models: bool = Field(True, env="TTS_CACHE_OPTIMIZED_MODELS")
+        tts_io_binding: bool = Field(True, env="TTS_IO_BINDING")
+        tts_default_quality: str = Field("high", env="TTS_DEFAULT_QUALITY")
+        tts_adaptive_standard_depth: int = Field(4, env="TTS_ADAPTIVE_STANDARD_DEPTH")
+        tts_adaptive_draft_depth: int = Field(10, env="TTS_ADAPTIVE_DRAFT_DEPTH")
 
         supabase_url: AnyHttpUrl = Field("http://localhost:54321", env="SUPABASE_URL")
         supabase_service_role_key: str = Field("local-service-role", env="SUPABASE_SERVICE_ROLE_KEY")
@@ -80,6 +108,34 @@ else:
 
         ocr_service_enabled: bool = field(default_factory=lambda: _env_bool("OCR_SERVICE", True))
         tts_service_enabled: bool = field(default_factory=lambda: _env_bool("TTS_SERVICE", True))
+        tts_cache_dir: str = field(default_factory=lambda: os.getenv("TTS_CACHE_DIR", "~/.cache/httm/tts-audio"))
+        tts_cache_max_mb: int = field(default_factory=lambda: int(os.getenv("TTS_CACHE_MAX_MB", "2048")))
+        tts_audio_format: str = field(default_factory=lambda: os.getenv("TTS_AUDIO_FORMAT", "opus"))
+        tts_audio_bitrate_kbps: int = field(default_factory=lambda: int(os.getenv("TTS_AUDIO_BITRATE_KBPS", "48")))
+        tts_hls_segment_seconds: float = field(default_factory=lambda: float(os.getenv("TTS_HLS_SEGMENT_SECONDS", "0")))
+        tts_chunk_cache_dir: str = field(default_factory=lambda: os.getenv("TTS_CHUNK_CACHE_DIR", "~/.cache/httm/tts-chunks"))
+        tts_chunk_cache_max_mb: int = field(default_factory=lambda: int(os.getenv("TTS_CHUNK_CACHE_MAX_MB", "1024")))
+        tts_job_db_path: str = field(default_factory=lambda: os.getenv("TTS_JOB_DB_PATH", "~/.cache/httm/tts-jobs.sqlite3"))
+        tts_workers: int = field(default_factory=lambda: int(os.getenv("TTS_WORKERS", "1")))
+        tts_job_max_attempts: int = field(default_factory=lambda: int(os.getenv("TTS_JOB_MAX_ATTEMPTS", "3")))
+        tts_job_lease_seconds: float = field(default_factory=lambda: float(os.getenv("TTS_JOB_LEASE_SECONDS", "60")))
+        tts_generate_wait_seconds: float = field(default_factory=lambda: float(os.getenv("TTS_GENERATE_WAIT_SECONDS", "120")))
+        tts_process_workers: int = field(default_factory=lambda: int(os.getenv("TTS_PROCESS_WORKERS", "0")))
+        tts_process_cores: str = field(default_factory=lambda: os.getenv("TTS_PROCESS_CORES", ""))
+        tts_session_profile: str = field(default_factory=lambda: os.getenv("TTS_SESSION_PROFILE", "shared_host"))
+        tts_parallel_sessions: int = field(default_factory=lambda: int(os.getenv("TTS_PARALLEL_SESSIONS", "1")))
+        tts_pipelined: bool = field(default_factory=lambda: _env_bool("TTS_PIPELINED", False))
+        tts_batch_window_ms: float = field(default_factory=lambda: float(os.getenv("TTS_BATCH_WINDOW_MS", "0")))
+        tts_batch_max_size: int = field(default_factory=lambda: int(os.getenv("TTS_BATCH_MAX_SIZE", "8")))
+        tts_batch_max_chars: int = field(default_factory=lambda: int(os.getenv("TTS_BATCH_MAX_CHARS", "300")))
+        tts_chunk_buckets: int = field(default_factory=lambda: int(os.getenv("TTS_CHUNK_BUCKETS", "0")))
+        tts_duration_model: bool = field(default_factory=lambda: _env_bool("TTS_DURATION_MODEL", False))
+        tts_precision: str = field(default_factory=lambda: os.getenv("TTS_PRECISION", "fp32"))
+        tts_cache_optimized_models: bool = field(default_factory=lambda: _env_bool("TTS_CACHE_OPTIMIZED_MODELS", True))
+        tts_io_binding: bool = field(default_factory=lambda: _env_bool("TTS_IO_BINDING", True))
+        tts_default_quality: str = field(default_factory=lambda: os.getenv("TTS_DEFAULT_QUALITY", "high"))
+        tts_adaptive_standard_depth: int = field(default_factory=lambda: int(os.getenv("TTS_ADAPTIVE_STANDARD_DEPTH", "4")))
+        tts_adaptive_draft_depth: int = field(default_factory=lambda: int(os.getenv("TTS_ADAPTIVE_DRAFT_DEPTH", "10")))
 
         supabase_url: AnyHttpUrl = field(default_factory=lambda: os.getenv("SUPABASE_URL", "http://localhost:54321"))
         supabase_service_role_key: str = field(default_factory=lambda: os.getenv("SUPABASE_SERVICE_ROLE_KEY", "local-service-role"))
@@ -0,0 +1,83 @@
+import pytest
+import supabase as supabase_module
+from fastapi.testclient import TestClient
+
+from src.main import app
+from src.services import audio_encoding, story_audio, tts_jobs
+from src.services.tts_jobs import TTSJobQueue
+
+
+class FakeQuery:
+    def __init__(self, client, data=None):
+        self.client = client
+        self.data = data
+
+    def select(self, *_args):
+        return FakeQuery(self.client, [self.client.story])
+
+    def update(self, values):
+        self.client.updates.append(values)
+        return self
+
+    def eq(self, *_args):
+        return self
+
+    def execute(self):
+        return self
+
+
+class FakeBucket:
+    def __init__(self, names):
+        self.names = names
+
+    def list(self, prefix, options):
+        return [{"name": name} for name in self.names]
+
+    def get_public_url(self, path):
+        return f"https://storage/{path}"
+
+
+class FakeSupabase:
+    def __init__(self, stored):
+        self.story = {"id": "story-1", "content": "Xin chào", "author_id": "user-1"}
+        self.updates = []
+        self.storage = self
+        self.bucket = FakeBucket(stored)
+
+    def table(self, _name):
+        return FakeQuery(self)
+
+    def from_(self, _name):
+        return self.bucket
+
+
+class FakeTTS:
+    async def resolve_request_quality(self, quality):
+        return quality or "high"
+
+    async def cache_key(self, text, quality=None):
+        return f"key-{quality}"
+
+
+@pytest.fixture
+def queue(tmp_path, monkeypatch):
+    import src.services.tts as tts_module
+
+    queue = TTSJobQueue(str(tmp_path / "jobs.sqlite3"))
+    monkeypatch.setattr(tts_jobs, "get_tts_job_queue", lambda: queue)
+    monkeypatch.setattr(tts_module, "tts_service", FakeTTS())
+    monkeypatch.setattr(story_audio, "storage_audio_format", lambda: (audio_encoding.get_audio_format("wav"), 48))
+    return queue
+
+
+def test_generate_audio_returns_stored_audio_without_queueing(queue, monkeypatch):
+    client = FakeSupabase(["key-standard.wav"])
+    monkeypatch.setattr(supabase_module, "create_client", lambda *_args: client)
+
+    response = TestClient(app).post("/api/stories/story-1/generate-audio", json={"quality": "standard"})
+
+    assert response.status_code == 200
+    assert response.json()["audioUrl"] == "https://storage/cache/key-standard.wav"
+    assert queue.latest_for_story("story-1") is None
+    assert client.updates[-1]["audio_status"] == "COMPLETED"
+    assert client.updates[-1]["audio_url"] == "https://storage/cache/key-standard.wav"
@@ -0,0 +1,105 @@
+import os
+import time
+
+from src.services.audio_cache import (
+    DiskAudioCache,
+    cache_object_path,
+    find_cached_object_url,
+    make_cache_key,
+)
+
+
+def test_cache_key_depends_on_text_and_voice():
+    base = make_cache_key("Xin chào.", gender="female", speed=1.0)
+
+    assert base == make_cache_key("Xin chào.", speed=1.0, gender="female")
+    assert base != make_cache_key("Xin chào!", gender="female", speed=1.0)
+    assert base != make_cache_key("Xin chào.", gender="male", speed=1.0)
+
+
+def test_disk_cache_roundtrip(tmp_path):
+    cache = DiskAudioCache(tmp_path, max_bytes=1024)
+
+    assert cache.get("ab" * 32) is None
+    cache.put("ab" * 32, b"RIFF-data")
+
+    assert cache.get("ab" * 32) == b"RIFF-data"
+
+
+def test_disk_cache_evicts_least_recently_used(tmp_path):
+    cache = DiskAudioCache(tmp_path, max_bytes=25)
+    keys = ["aa" * 32, "bb" * 32, "cc" * 32]
+
+    cache.put(keys[0], b"0" * 10)
+    cache.put(keys[1], b"1" * 10)
+    old = time.time() - 100
+    for key in keys[:2]:
+        os.utime(cache._path(key), (old, old))
+    cache.get(keys[0])  # refresh recency of the first entry
+
+    cache.put(keys[2], b"2" * 10)
+
+    assert cache.get(keys[0]) is not None
+    assert cache.get(keys[1]) is None
+    assert cache.get(keys[2]) is not None
+
+
+def test_disabled_cache_stores_nothing(tmp_path):
+    cache = DiskAudioCache(tmp_path, max_bytes=0)
+    cache.put("dd" * 32, b"data")
+
+    assert cache.get("dd" * 32) is None
+
+
+def test_disk_cache_scans_directory_only_to_evict(tmp_path, monkeypatch):
+    cache = DiskAudioCache(tmp_path, max_bytes=25)
+    scans = []
+    scan = cache._scan
+    monkeypatch.setattr(cache, "_scan", lambda: scans.append(1) or scan())
+
+    cache.put("aa" * 32, b"0" * 10)
+    cache.put("bb" * 32, b"1" * 10)
+    cache.put("aa" * 32, b"2" * 10)  # replacing an entry does not grow the cache
+    assert len(scans) == 1
+
+    cache.put("cc" * 32, b"3" * 10)
+    assert len(scans) == 2
+    assert sum(1 for _ in tmp_path.glob("*/*.bin")) == 2
+
+
+def test_failed_write_leaves_no_temp_file(tmp_path, monkeypatch):
+    cache = DiskAudioCache(tmp_path, max_bytes=1024)
+
+    def fail_replace(src, dst):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(os, "replace", fail_replace)
+    cache.put("ee" * 32, b"data")
+
+    assert cache.get("ee" * 32) is None
+    assert list(tmp_path.glob("*/*.tmp")) == []
+
+
+class FakeBucket:
+    def __init__(self, names):
+        self.names = names
+
+    def list(self, path, options):
+        assert path == "cache"
+        return [{"name": name} for name in self.names if options["search"] in name]
+
+    def get_public_url(self, path):
+        return f"https://cdn.local/{path}"
+
+
+class FakeClient:
+    def __init__(self, bucket):
+        self.storage = type("Storage", (), {"from_": lambda _self, name: bucket})()
+
+
+def test_find_cached_object_url():
+    key = "ee" * 32
+    client = FakeClient(FakeBucket([f"{key}.wav"]))
+
+    assert find_cached_object_url(client, key) == f"https://cdn.local/{cache_object_path(key)}"
+    assert find_cached_object_url(client, "ff" * 32) is None
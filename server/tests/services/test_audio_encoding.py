@@ -0,0 +1,116 @@
+import io
+import wave
+
+import numpy as np
+import pytest
+
+from src.services import audio_encoding, story_audio
+from src.services.tts import _encode_wav
+
+requires_ffmpeg = pytest.mark.skipif(not audio_encoding.ffmpeg_available(), reason="ffmpeg not installed")
+
+
+def _tone(seconds: float = 1.0, sample_rate: int = 24000) -> bytes:
+    t = np.arange(int(seconds * sample_rate)) / sample_rate
+    return (np.sin(2 * np.pi * 220 * t) * 12000).astype("<i2").tobytes()
+
+
+def test_get_audio_format_rejects_unknown_format():
+    assert audio_encoding.get_audio_format("OPUS").content_type == "audio/ogg"
+    with pytest.raises(ValueError):
+        audio_encoding.get_audio_format("flac")
+
+
+def test_encoded_object_key_keeps_wav_key():
+    wav = audio_encoding.get_audio_format("wav")
+    opus = audio_encoding.get_audio_format("opus")
+
+    assert story_audio.encoded_object_key("abc", wav, 48) == "abc"
+    assert story_audio.encoded_object_key("abc", opus, 48) == "abc-opus48k"
+
+
+@requires_ffmpeg
+@pytest.mark.parametrize("name", ["opus", "mp3", "aac"])
+def test_encode_wav_bytes_compresses(name):
+    wav = _encode_wav(_tone(2.0), 24000)
+
+    encoded = audio_encoding.encode_wav_bytes(wav, audio_encoding.get_audio_format(name), 48)
+
+    assert 0 < len(encoded) < len(wav) / 4
+
+
+@requires_ffmpeg
+def test_streaming_encoder_matches_segment_input():
+    fmt = audio_encoding.get_audio_format("opus")
+    pcm = _tone(3.0)
+    segments = [pcm[i:i + 24000] for i in range(0, len(pcm), 24000)]
+
+    encoded = b"".join(audio_encoding.encode_pcm_stream(segments, fmt, 24000, 48))
+
+    assert encoded[:4] == b"OggS"
+
+
+class _FakeBucket:
+    def __init__(self) -> None:
+        self.uploads: list[tuple[str, bytes, dict]] = []
+
+    def list(self, prefix, options):
+        return []
+
+    def upload(self, path, data, options):
+        self.uploads.append((path, data, options))
+
+    def get_public_url(self, path):
+        return f"https://storage/{path}"
+
+
+class _FakeSupabase:
+    def __init__(self) -> None:
+        self.bucket = _FakeBucket()
+        self.storage = self
+
+    def from_(self, name):
+        return self.bucket
+
+
+class _FakeTTS:
+    async def cache_key(self, text, quality=None):
+        return "key"
+
+    async def synthesize_bytes(self, text, cache_key=None, quality=None):
+        return _encode_wav(_tone(0.5), 24000), 0.5
+
+
+@pytest.mark.anyio
+async def test_publish_story_audio_sets_format_content_type(monkeypatch):
+    import src.services.tts as tts_module
+
+    monkeypatch.setattr(tts_module, "tts_service", _FakeTTS())
+    monkeypatch.setattr(story_audio, "storage_audio_format", lambda: (audio_encoding.get_audio_format("wav"), 48))
+    supabase = _FakeSupabase()
+
+    url = await story_audio.publish_story_audio(supabase, "Xin chào")
+
+    path, data, options = supabase.bucket.uploads[0]
+    assert url == "https://storage/cache/key.wav"
+    assert path == "cache/key.wav"
+    assert options["content-type"] == "audio/wav"
+    with wave.open(io.BytesIO(data), "rb") as wav_file:
+        assert wav_file.getframerate() == 24000
+
+
+@requires_ffmpeg
+@pytest.mark.anyio
+async def test_publish_story_audio_uploads_encoded_audio(monkeypatch):
+    import src.services.tts as tts_module
+
+    monkeypatch.setattr(tts_module, "tts_service", _FakeTTS())
+    monkeypatch.setattr(story_audio, "storage_audio_format", lambda: (audio_encoding.get_audio_format("opus"), 48))
+    supabase = _FakeSupabase()
+
+    await story_audio.publish_story_audio(supabase, "Xin chào")
+
+    path, data, options = supabase.bucket.uploads[0]
+    assert path == "cache/key-opus48k.ogg"
+    assert options["content-type"] == "audio/ogg"
+    assert data[:4] == b"OggS"
@@ -0,0 +1,80 @@
+import numpy as np
+import pytest
+
+from src.services import audio_encoding, hls, story_audio
+
+requires_ffmpeg = pytest.mark.skipif(not audio_encoding.ffmpeg_available(), reason="ffmpeg not installed")
+
+
+def _tone(seconds: float, sample_rate: int = 16000) -> bytes:
+    t = np.arange(int(seconds * sample_rate)) / sample_rate
+    return (np.sin(2 * np.pi * 220 * t) * 12000).astype("<i2").tobytes()
+
+
+class FakeBucket:
+    def __init__(self):
+        self.objects = {}
+
+    def upload(self, path, data, options):
+        self.objects[path] = (data, options)
+
+    def get_public_url(self, path):
+        return f"https://cdn.local/{path}"
+
+
+class FakeStorage:
+    def __init__(self):
+        self.bucket = FakeBucket()
+
+    def from_(self, _name):
+        return self.bucket
+
+
+class FakeClient:
+    def __init__(self):
+        self.storage = FakeStorage()
+
+
+def test_group_segments_cuts_at_chunk_boundaries():
+    chunks = [_tone(2.0), _tone(3.0), _tone(4.0), b"", _tone(9.0), _tone(1.0)]
+
+    segments = list(hls.group_segments(chunks, 16000, 6.0))
+
+    seconds = [len(segment) / 2 / 16000 for segment in segments]
+    assert seconds == [5.0, 4.0, 9.0, 1.0]
+    assert b"".join(segments) == b"".join(chunks)
+
+
+def test_playlist_render():
+    playlist = hls.HLSPlaylist(target_duration=6.0)
+    playlist.add("key/seg00000.ts", 5.0)
+    playlist.add("key/seg00001.ts", 6.5)
+
+    live = playlist.render()
+    assert "#EXT-X-TARGETDURATION:7" in live
+    assert "#EXT-X-PLAYLIST-TYPE:EVENT" in live
+    assert "#EXT-X-ENDLIST" not in live
+    assert live.splitlines()[-2:] == ["#EXTINF:6.500,", "key/seg00001.ts"]
+    assert playlist.render(ended=True).endswith("#EXT-X-ENDLIST\n")
+    assert playlist.duration == pytest.approx(11.5)
+
+
+@requires_ffmpeg
+def test_publish_segments_uploads_playlist_before_the_last_segment():
+    client = FakeClient()
+    published = []
+
+    def chunks():
+        yield _tone(3.0)
+        # The playlist is live before synthesis of the rest has even started
+        assert published == ["https://cdn.local/cache/key.m3u8"]
+        yield _tone(3.0)
+
+    pcm = story_audio._publish_segments(client, chunks(), 16000, "key", 2.0, 48, published.append)
+
+    objects = client.storage.bucket.objects
+    assert len(pcm) == 2 * 3 * 16000 * 2
+    assert objects["cache/key/seg00001.ts"][1]["content-type"] == "video/mp2t"
+    assert objects["cache/key/seg00000.ts"][0][:1] == b"\x47"  # MPEG-TS sync byte
+    playlist = objects["cache/key.m3u8"][0].decode()
+    assert "key/seg00000.ts" in playlist and playlist.endswith("#EXT-X-ENDLIST\n")
@@ -0,0 +1,70 @@
+import asyncio
+
+import pytest
+
+from src.services.tts_batcher import TTSMicroBatcher
+
+
+class RecordingRunner:
+    def __init__(self, fail: bool = False) -> None:
+        self.calls: list[tuple[list[str], str]] = []
+        self.fail = fail
+
+    def __call__(self, texts: list[str], quality: str) -> tuple[list[bytes], int]:
+        self.calls.append((list(texts), quality))
+        if self.fail:
+            raise RuntimeError("engine down")
+        return [f"{quality}:{text}".encode() for text in texts], 24000
+
+
+@pytest.mark.anyio
+async def test_requests_within_window_share_one_batch():
+    runner = RecordingRunner()
+    batcher = TTSMicroBatcher(runner, window_seconds=0.05, max_batch=8, max_chars=100)
+
+    results = await asyncio.gather(*(batcher.submit(text, "draft") for text in ["a", "b", "c"]))
+
+    assert runner.calls == [(["a", "b", "c"], "draft")]
+    assert results == [(b"draft:a", 24000), (b"draft:b", 24000), (b"draft:c", 24000)]
+    status = batcher.status()
+    assert status["batches"] == 1
+    assert status["meanBatch"] == 3
+    assert status["waiting"] == 0
+
+
+@pytest.mark.anyio
+async def test_full_batch_runs_without_waiting_for_window():
+    runner = RecordingRunner()
+    batcher = TTSMicroBatcher(runner, window_seconds=30, max_batch=2, max_chars=100)
+
+    results = await asyncio.wait_for(asyncio.gather(batcher.submit("a", "high"), batcher.submit("b", "high")), 5)
+
+    assert [pcm for pcm, _ in results] == [b"high:a", b"high:b"]
+    assert runner.calls == [(["a", "b"], "high")]
+
+
+@pytest.mark.anyio
+async def test_quality_tiers_are_batched_separately():
+    runner = RecordingRunner()
+    batcher = TTSMicroBatcher(runner, window_seconds=0.05, max_batch=8, max_chars=100)
+
+    await asyncio.gather(batcher.submit("a", "draft"), batcher.submit("b", "high"), batcher.submit("c", "draft"))
+
+    assert sorted(runner.calls) == [(["a", "c"], "draft"), (["b"], "high")]
+
+
+@pytest.mark.anyio
+async def test_batch_failure_reaches_every_caller():
+    batcher = TTSMicroBatcher(RecordingRunner(fail=True), window_seconds=0.01, max_batch=8, max_chars=100)
+
+    results = await asyncio.gather(batcher.submit("a", "draft"), batcher.submit("b", "draft"), return_exceptions=True)
+
+    assert all(isinstance(result, RuntimeError) for result in results)
+    assert batcher.status()["batches"] == 0
+
+
+def test_only_short_texts_are_accepted():
+    batcher = TTSMicroBatcher(RecordingRunner(), window_seconds=0.01, max_batch=8, max_chars=5)
+
+    assert batcher.accepts("hello")
+    assert not batcher.accepts("hello world")
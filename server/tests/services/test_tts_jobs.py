@@ -0,0 +1,299 @@
+import sqlite3
+from types import SimpleNamespace
+
+import pytest
+
+from src.entities import ProcessingStatus
+from src.services import tts_jobs
+from src.services.tts_jobs import PRIORITY_HIGH, PRIORITY_LOW, TTSJobQueue
+
+
+@pytest.fixture
+def queue(tmp_path):
+    return TTSJobQueue(str(tmp_path / "jobs.sqlite3"), max_attempts=2)
+
+
+def test_enqueue_deduplicates_pending_story(queue):
+    first = queue.enqueue("story-1", "old content", priority=PRIORITY_LOW)
+    second = queue.enqueue("story-1", "new content", priority=PRIORITY_HIGH)
+
+    assert first.id == second.id
+    assert second.content == "new content"
+    assert second.priority == PRIORITY_HIGH
+    assert queue.depth() == 1
+
+
+def test_claim_orders_by_priority_then_age(queue):
+    low = queue.enqueue("story-low", "a", priority=PRIORITY_LOW)
+    high = queue.enqueue("story-high", "b", priority=PRIORITY_HIGH)
+
+    assert queue.claim("w0").id == high.id
+    claimed = queue.claim("w0")
+    assert claimed.id == low.id
+    assert claimed.status == ProcessingStatus.PROCESSING
+    assert queue.claim("w0") is None
+
+
+def test_resubmitting_running_story_queues_new_content(queue):
+    job = queue.enqueue("story-1", "v1")
+    queue.claim("w0")
+
+    assert queue.enqueue("story-1", "v1").id == job.id
+    assert queue.enqueue("story-1", "v2").id != job.id
+
+
+def test_running_story_requeued_at_a_different_quality(queue):
+    job = queue.enqueue("story-1", "v1", quality="draft")
+    queue.claim("w0")
+
+    assert queue.enqueue("story-1", "v1", quality="draft").id == job.id
+    final = queue.enqueue("story-1", "v1", quality="high")
+    assert final.id != job.id
+    assert final.quality == "high"
+
+
+def test_queue_adds_quality_columns_to_existing_database(tmp_path):
+    db_path = tmp_path / "jobs.sqlite3"
+    with sqlite3.connect(db_path) as conn:
+        conn.execute(
+            "CREATE TABLE tts_jobs (id TEXT PRIMARY KEY, story_id TEXT NOT NULL, author_id TEXT, "
+            "content TEXT NOT NULL, priority INTEGER NOT NULL DEFAULT 0, status TEXT NOT NULL, "
+            "attempts INTEGER NOT NULL DEFAULT 0, max_attempts INTEGER NOT NULL DEFAULT 3, error TEXT, "
+            "audio_url TEXT, worker TEXT, created_at REAL NOT NULL, updated_at REAL NOT NULL)"
+        )
+
+    job = TTSJobQueue(str(db_path)).enqueue("story-1", "text", quality="adaptive")
+    assert job.quality == "adaptive"
+    assert job.audio_quality is None
+
+
+def test_failed_jobs_retry_until_attempts_exhausted(queue):
+    job = queue.enqueue("story-1", "text")
+
+    queue.claim("w0")
+    assert queue.fail(job.id, "boom").status == ProcessingStatus.PENDING
+
+    queue.claim("w0")
+    failed = queue.fail(job.id, "boom again")
+    assert failed.status == ProcessingStatus.FAILED
+    assert failed.error == "boom again"
+
+
+def _expire_lease(queue, job_id, seconds=120):
+    with sqlite3.connect(queue.db_path) as conn:
+        conn.execute("UPDATE tts_jobs SET heartbeat_at = heartbeat_at - ? WHERE id = ?", (seconds, job_id))
+
+
+def test_requeue_stale_only_takes_jobs_with_expired_lease(queue, tmp_path):
+    job = queue.enqueue("story-1", "text")
+    queue.claim("w0")
+
+    reopened = TTSJobQueue(str(tmp_path / "jobs.sqlite3"))
+    assert reopened.requeue_stale(lease_seconds=60) == 0
+    assert reopened.get(job.id).status == ProcessingStatus.PROCESSING
+
+    _expire_lease(queue, job.id)
+    assert reopened.requeue_stale(lease_seconds=60) == 1
+    assert reopened.get(job.id).status == ProcessingStatus.PENDING
+
+
+def test_heartbeat_renews_lease(queue):
+    job = queue.enqueue("story-1", "text")
+    queue.claim("w0")
+    _expire_lease(queue, job.id)
+
+    queue.heartbeat(job.id, "w0")
+
+    assert queue.requeue_stale(lease_seconds=60) == 0
+
+
+def test_expired_leases_count_as_attempts(queue):
+    job = queue.enqueue("story-1", "text")
+
+    queue.claim("w0")
+    _expire_lease(queue, job.id)
+    assert queue.requeue_stale(lease_seconds=60) == 1
+
+    queue.claim("w0")
+    _expire_lease(queue, job.id)
+    assert queue.requeue_stale(lease_seconds=60) == 0
+    assert queue.get(job.id).status == ProcessingStatus.FAILED
+
+
+def test_release_worker_fails_only_that_workers_job(queue):
+    first = queue.enqueue("story-1", "a")
+    second = queue.enqueue("story-2", "b")
+    queue.claim("w0")
+    queue.claim("w1")
+
+    assert queue.release_worker("w0", "exited") == 1
+
+    assert queue.get(first.id).status == ProcessingStatus.PENDING
+    assert queue.get(first.id).error == "exited"
+    assert queue.get(second.id).status == ProcessingStatus.PROCESSING
+
+
+def test_worker_that_lost_its_lease_cannot_finish_the_job(queue):
+    job = queue.enqueue("story-1", "text")
+    queue.claim("w0")
+    _expire_lease(queue, job.id)
+    queue.requeue_stale(lease_seconds=60)
+    queue.claim("w1")
+
+    assert queue.complete(job.id, "https://cdn.local/stale.wav", "w0") is None
+    assert queue.fail(job.id, "stale failure", "w0") is None
+    current = queue.get(job.id)
+    assert current.status == ProcessingStatus.PROCESSING
+    assert current.worker == "w1"
+
+    assert queue.complete(job.id, "https://cdn.local/audio.wav", "w1").status == ProcessingStatus.COMPLETED
+
+
+def test_is_superseded_by_a_newer_job_for_the_story(queue):
+    job = queue.enqueue("story-1", "v1")
+    queue.claim("w0")
+    queue.enqueue("story-2", "other")
+    assert not queue.is_superseded(job)
+
+    queue.enqueue("story-1", "v2")
+    assert queue.is_superseded(job)
+
+
+class FakeProcess:
+    def __init__(self, alive=True, exitcode=None):
+        self.alive = alive
+        self.exitcode = exitcode
+
+    def is_alive(self):
+        return self.alive
+
+    def join(self, timeout=None):
+        pass
+
+
+def test_pool_restarts_dead_workers_and_releases_their_job(queue, monkeypatch):
+    pool = tts_jobs.TTSWorkerPool(queue, workers=2, lease_seconds=60)
+    spawned = []
+
+    def fake_spawn(index):
+        spawned.append(index)
+        pool._processes[index] = FakeProcess()
+        pool._started_at[index] = 0.0  # long ago, so the worker counts as healthy
+
+    monkeypatch.setattr(pool, "_spawn", fake_spawn)
+    pool._processes = [FakeProcess(), FakeProcess(alive=False, exitcode=-9)]
+    pool._started_at = [0.0, 0.0]
+    pool._restart_at = [0.0, 0.0]
+    pool._quick_deaths = [0, 0]
+    job = queue.enqueue("story-1", "text")
+    queue.claim(pool._worker_name(1))
+
+    pool.check()
+
+    assert spawned == [1]
+    assert pool.restarts == 1
+    assert queue.get(job.id).status == ProcessingStatus.PENDING
+
+
+class FakeTable:
+    def __init__(self, updates):
+        self.updates = updates
+
+    def update(self, values):
+        self.updates.append(values)
+        return self
+
+    def eq(self, *_args):
+        return self
+
+    def execute(self):
+        return None
+
+
+class FakeClient:
+    def __init__(self):
+        self.updates = []
+
+    def table(self, _name):
+        return FakeTable(self.updates)
+
+
+@pytest.mark.anyio
+async def test_run_story_audio_job_marks_completion(queue, monkeypatch):
+    job = queue.enqueue("story-1", "text")
+    job = queue.claim("w0")
+    client = FakeClient()
+    updates = client.updates
+
+    async def fake_publish(_supabase, content, quality=None, on_playlist=None):
+        assert content == "text"
+        assert quality == "high"
+        on_playlist("https://cdn.local/audio.m3u8")
+        return "https://cdn.local/audio.wav"
+
+    import src.services.story_audio as story_audio
+
+    monkeypatch.setattr(story_audio, "publish_story_audio", fake_publish)
+
+    result = await tts_jobs.run_story_audio_job(queue, job, supabase=client)
+
+    assert result.status == ProcessingStatus.COMPLETED
+    assert result.audio_url == "https://cdn.local/audio.wav"
+    assert result.audio_quality == "high"
+    assert result.playlist_url == "https://cdn.local/audio.m3u8"
+    assert updates[0]["audio_quality"] == "high"
+    assert {"audio_playlist_url": "https://cdn.local/audio.m3u8"} in updates
+    assert updates[-1]["audio_status"] == "COMPLETED"
+
+
+@pytest.mark.anyio
+async def test_wait_gives_up_after_timeout(queue):
+    job = queue.enqueue("story-1", "text")
+
+    with pytest.raises(TimeoutError):
+        await queue.wait(job.id, poll_interval=0.01, timeout=0.05)
+
+
+@pytest.mark.anyio
+async def test_jobs_render_in_process_without_workers(queue, monkeypatch):
+    async def fake_publish(_supabase, content, quality=None, on_playlist=None):
+        return f"https://cdn.local/{content}.wav"
+
+    import src.services.story_audio as story_audio
+
+    monkeypatch.setattr(story_audio, "publish_story_audio", fake_publish)
+    monkeypatch.setattr(tts_jobs, "get_settings", lambda: SimpleNamespace(tts_workers=0, tts_job_lease_seconds=60))
+    monkeypatch.setattr(tts_jobs, "get_tts_job_queue", lambda: queue)
+    monkeypatch.setattr(tts_jobs, "_service_client", FakeClient)
+    job = queue.enqueue("story-1", "text")
+
+    tts_jobs.on_startup()
+    try:
+        finished = await queue.wait(job.id, poll_interval=0.01, timeout=5)
+    finally:
+        tts_jobs.on_shutdown()
+
+    assert finished.status == ProcessingStatus.COMPLETED
+    assert finished.audio_url == "https://cdn.local/text.wav"
+    assert finished.worker.startswith("tts-inprocess-")
+
+
+@pytest.mark.anyio
+async def test_superseded_failure_leaves_the_story_status_to_the_newer_job(queue, monkeypatch):
+    queue.enqueue("story-1", "v1")
+    job = queue.claim("w0")
+    newer = queue.enqueue("story-1", "v2")
+    client = FakeClient()
+
+    async def failing_publish(*_args, **_kwargs):
+        raise RuntimeError("engine down")
+
+    import src.services.story_audio as story_audio
+
+    monkeypatch.setattr(story_audio, "publish_story_audio", failing_publish)
+
+    result = await tts_jobs.run_story_audio_job(queue, job, supabase=client)
+
+    assert result.status == ProcessingStatus.FAILED
+    assert queue.get(newer.id).status == ProcessingStatus.PENDING
+    assert all(update.get("audio_status") != "FAILED" for update in client.updates)
@@ -0,0 +1,117 @@
+import asyncio
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import numpy as np
+import pytest
+
+from src.services import tts_pool
+
+
+class FakeConfig:
+    sample_rate = 24000
+
+
+class FakeApi:
+    config = FakeConfig()
+
+    def synthesize(self, text, **kwargs):
+        return np.array([0, 1000, -1000, 32767], dtype=np.int16), 0.1
+
+
+class FakeRegistry:
+    def get(self):
+        return FakeApi()
+
+
+def test_parse_core_sets():
+    assert tts_pool.parse_core_sets("0-3;4,6") == [[0, 1, 2, 3], [4, 6]]
+    assert tts_pool.parse_core_sets(" ; ") == []
+
+
+@pytest.mark.parametrize(
+    ("workers", "cores", "expected"),
+    [
+        (2, [0, 1, 2, 3], [[0, 1], [2, 3]]),
+        (3, [0, 1, 2, 3, 4], [[0, 1], [2, 3], [4]]),
+        (3, [0, 1], [[0], [1], [0]]),
+        (0, [0, 1], []),
+    ],
+)
+def test_partition_cores(workers, cores, expected):
+    assert tts_pool.partition_cores(workers, cores) == expected
+
+
+def test_worker_returns_pcm_through_shared_memory(monkeypatch):
+    monkeypatch.setattr(tts_pool, "_worker_registry", FakeRegistry())
+
+    name, samples, sample_rate = tts_pool._worker_synthesize("xin chào", "female", "central", "neutral", "high")
+    pcm = tts_pool._take_pcm(name, samples)
+
+    assert sample_rate == 24000
+    assert np.frombuffer(pcm, dtype=np.int16).tolist() == [0, 1000, -1000, 32767]
+    with pytest.raises(FileNotFoundError):
+        tts_pool.shared_memory.SharedMemory(name=name)
+
+
+@pytest.mark.anyio
+async def test_cancelled_request_releases_its_shared_memory(monkeypatch):
+    monkeypatch.setattr(tts_pool, "_worker_registry", FakeRegistry())
+    rendering, finish = threading.Event(), threading.Event()
+    names = []
+
+    def slow_synthesize(*args):
+        rendering.set()
+        finish.wait(5)
+        result = worker_synthesize(*args)
+        names.append(result[0])
+        return result
+
+    worker_synthesize = tts_pool._worker_synthesize
+    monkeypatch.setattr(tts_pool, "_worker_synthesize", slow_synthesize)
+    pool = tts_pool.VietVoiceProcessPool(1, core_sets=[])
+    pool._executor = ThreadPoolExecutor(max_workers=1)
+
+    request = asyncio.create_task(pool.synthesize_pcm("xin chào", "female", "central", "neutral", "high"))
+    await asyncio.to_thread(rendering.wait, 5)
+    request.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await request
+    finish.set()
+    pool.shutdown()
+
+    assert len(names) == 1
+    with pytest.raises(FileNotFoundError):
+        tts_pool.shared_memory.SharedMemory(name=names[0])
+
+
+class BrokenExecutor:
+    def submit(self, fn, *args):
+        future = Future()
+        future.set_exception(BrokenProcessPool("worker died"))
+        return future
+
+    def shutdown(self, wait=True, cancel_futures=False):
+        pass
+
+
+@pytest.mark.anyio
+async def test_dead_worker_fails_the_request_without_waiting_for_the_restart(monkeypatch):
+    restarting, finish = threading.Event(), threading.Event()
+
+    def slow_start(self, timeout=None):
+        restarting.set()
+        finish.wait(5)
+        self._executor = ThreadPoolExecutor(max_workers=1)
+
+    monkeypatch.setattr(tts_pool.VietVoiceProcessPool, "start", slow_start)
+    pool = tts_pool.VietVoiceProcessPool(1, core_sets=[])
+    pool._executor = BrokenExecutor()
+
+    with pytest.raises(RuntimeError):
+        await asyncio.wait_for(pool.cache_key_fields("xin chào", "high"), 1)
+
+    assert await asyncio.to_thread(restarting.wait, 5)
+    assert not pool.is_running
+    finish.set()
@@ -0,0 +1,147 @@
+import io
+import threading
+import wave
+
+import numpy as np
+import pytest
+
+from src.services import tts as tts_module
+
+
+class FakeApi:
+    def __init__(self) -> None:
+        self.cleaned = False
+
+    def cleanup(self) -> None:
+        self.cleaned = True
+
+
+@pytest.fixture
+def fake_vietvoice(monkeypatch):
+    created: list[FakeApi] = []
+
+    def _create(config=None):
+        api = FakeApi()
+        created.append(api)
+        return api
+
+    monkeypatch.setattr(tts_module, "VIETVOICE_AVAILABLE", True)
+    monkeypatch.setattr(tts_module, "create_vietvoice_api", _create)
+    return created
+
+
+def test_registry_loads_engine_once(fake_vietvoice):
+    registry = tts_module.VietVoiceEngineRegistry()
+    assert registry.status()["state"] == "cold"
+
+    first = registry.get()
+    second = registry.get()
+
+    assert first is second
+    assert len(fake_vietvoice) == 1
+    status = registry.status()
+    assert status["state"] == "warm"
+    assert status["loadSeconds"] is not None
+
+
+def test_registry_shutdown_releases_engine(fake_vietvoice):
+    registry = tts_module.VietVoiceEngineRegistry()
+    api = registry.get()
+
+    registry.shutdown()
+
+    assert api.cleaned
+    assert not registry.is_warm
+
+
+def test_registry_status_reports_pipeline_stats(fake_vietvoice):
+    class FakeStats:
+        runs = 2
+
+        def as_dict(self):
+            return {"runs": self.runs, "stages": {"transformer": {"utilisation": 0.9}}}
+
+    registry = tts_module.VietVoiceEngineRegistry()
+    assert registry.status()["pipeline"] is None
+
+    api = registry.get()
+    api._engine = type("FakeEngine", (), {"pipeline_stats": FakeStats()})()
+
+    assert registry.status()["pipeline"]["stages"]["transformer"]["utilisation"] == 0.9
+
+
+def test_registry_unavailable_raises(monkeypatch):
+    monkeypatch.setattr(tts_module, "VIETVOICE_AVAILABLE", False)
+    registry = tts_module.VietVoiceEngineRegistry()
+
+    with pytest.raises(RuntimeError):
+        registry.get()
+
+
+def test_streaming_wav_header_is_valid_pcm_header():
+    header = tts_module._streaming_wav_header(24000)
+
+    assert len(header) == 44
+    assert header[:4] == b"RIFF"
+    assert header[8:16] == b"WAVEfmt "
+    assert int.from_bytes(header[24:28], "little") == 24000
+    assert int.from_bytes(header[34:36], "little") == 16
+
+
+def test_encode_wav_round_trips_pcm():
+    pcm = np.array([0, 1000, -1000, 32767], dtype="<i2").tobytes()
+
+    data = tts_module._encode_wav(pcm, 24000)
+
+    with wave.open(io.BytesIO(data), "rb") as wav_file:
+        assert wav_file.getframerate() == 24000
+        assert wav_file.getsampwidth() == 2
+        assert wav_file.readframes(4) == pcm
+    assert tts_module._wav_duration(data) == pytest.approx(4 / 24000)
+
+
+def test_float_waves_are_scaled_to_pcm16():
+    pcm = tts_module._to_pcm16(np.array([[0.0, 0.5, -2.0]], dtype=np.float32))
+
+    assert pcm.dtype == np.int16
+    assert pcm.tolist() == [0, 16383, -32767]
+
+
+@pytest.mark.parametrize(
+    ("requested", "depth", "expected"),
+    [
+        (None, 50, "high"),
+        ("draft", 0, "draft"),
+        ("adaptive", 0, "high"),
+        ("adaptive", 4, "standard"),
+        ("adaptive", 10, "draft"),
+    ],
+)
+def test_choose_quality_tier(requested, depth, expected):
+    assert tts_module.choose_quality_tier(requested, depth, default="high", standard_depth=4, draft_depth=10) == expected
+
+
+def test_choose_quality_tier_rejects_unknown_tier():
+    with pytest.raises(ValueError):
+        tts_module.choose_quality_tier("ultra", 0)
+
+
+@pytest.mark.anyio
+async def test_adaptive_requests_read_the_queue_depth_off_the_event_loop(monkeypatch):
+    from src.services import tts_jobs
+
+    loop_thread = threading.get_ident()
+    depth_threads = []
+
+    class FakeQueue:
+        def depth(self):
+            depth_threads.append(threading.get_ident())
+            return 4
+
+    monkeypatch.setattr(tts_jobs, "get_tts_job_queue", lambda: FakeQueue())
+    service = tts_module.TTSService(use_vietvoice=False)
+
+    assert await service.resolve_request_quality("adaptive") == "standard"
+    assert await service.resolve_request_quality("draft") == "draft"
+    assert len(depth_threads) == 1
+    assert depth_threads[0] != loop_thread